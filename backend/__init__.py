@@ -1,6 +1,6 @@
 from dotenv import load_dotenv
 load_dotenv()
-from flask import Flask, jsonify
+from flask import Flask, jsonify, request
 from flask_sqlalchemy import SQLAlchemy
 from flask_marshmallow import Marshmallow
 from flask_restful import Api, Resource
@@ -8,8 +8,9 @@ from flask_jwt_extended import JWTManager
 from flask_cors import CORS
 from flask_migrate import Migrate
 from backend.config import Config
+from backend.utils.db_routing import RoutingSession
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 ma = Marshmallow()
 jwt = JWTManager()
 migrate = Migrate()
@@ -18,6 +19,9 @@ def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
 
+    from backend.utils.log import configure_logging
+    configure_logging(app)
+
     CORS(app, resources={
         r"/api/*": {
             "origins": "*",
@@ -26,6 +30,9 @@ def create_app():
         }
     })
 
+    from backend.utils.db_pool import init_db_pool
+    init_db_pool(app)
+
     db.init_app(app)
     ma.init_app(app)
     jwt.init_app(app)
@@ -33,18 +40,23 @@ def create_app():
 
     from backend.models import (
         User, Vendor, Role, Requirement, VendorCategory,
-        PurchaseOrder, OrderAssignment, Document, Quote
+        PurchaseOrder, OrderAssignment, Document, Quote, ManagerStat, SearchOutbox, SyncTombstone, EmailJob
     )
 
     from backend.resources.auth import Login, Register
     from backend.resources.dashboard import Dashboard
-    from backend.resources.document import DocumentResource
-    from backend.resources.order import OrderResource, OrderAssignmentResource, OrderVendorResource
-    from backend.resources.quote import QuoteResource
+    from backend.resources.document import DocumentResource, DocumentExportResource
+    from backend.resources.events import EventStreamResource, EventStreamTokenResource
+    from backend.resources.order import (
+        OrderResource, OrderBulkResource, OrderExportResource, OrderAssignmentResource, OrderAssignmentBulkResource,
+        OrderVendorResource
+    )
+    from backend.resources.quote import QuoteResource, QuoteDecisionResource, QuoteExportResource
     from backend.resources.search import SearchResource
+    from backend.resources.sync import SyncResource
     from backend.resources.user import UserResource, CheckUserRole
-    from backend.resources.vendor import VendorResource
-    from backend.resources.requirement import RequirementResource
+    from backend.resources.vendor import VendorResource, VendorImportResource
+    from backend.resources.requirement import RequirementResource, RequirementImportResource
     from backend.resources.vendor_category import VendorCategoryResource
     from backend.resources.role import RoleResource
 
@@ -54,14 +66,25 @@ def create_app():
     api.add_resource(Register, "/api/register")
     api.add_resource(Dashboard, "/api/dashboard")
     api.add_resource(DocumentResource, "/api/documents", "/api/documents/<int:id>")
+    api.add_resource(DocumentExportResource, "/api/documents/export")
+    api.add_resource(EventStreamResource, "/api/events")
+    api.add_resource(EventStreamTokenResource, "/api/events/token")
     api.add_resource(OrderResource, "/api/orders", "/api/orders/<int:id>")
+    api.add_resource(OrderBulkResource, "/api/orders/bulk")
+    api.add_resource(OrderExportResource, "/api/orders/export")
     api.add_resource(OrderAssignmentResource, "/api/order-assignments", "/api/order-assignments/<int:assignment_id>")
+    api.add_resource(OrderAssignmentBulkResource, "/api/order-assignments/bulk")
     api.add_resource(OrderVendorResource, "/api/vendor-orders")
     api.add_resource(QuoteResource, "/api/quotes", "/api/quotes/<int:id>")
+    api.add_resource(QuoteDecisionResource, "/api/quotes/decisions")
+    api.add_resource(QuoteExportResource, "/api/quotes/export")
     api.add_resource(SearchResource, "/api/search")
+    api.add_resource(SyncResource, "/api/sync")
     api.add_resource(UserResource, "/api/users", "/api/users/<int:id>")
     api.add_resource(VendorResource, "/api/vendors", "/api/vendors/<int:id>")
+    api.add_resource(VendorImportResource, "/api/vendors/import")
     api.add_resource(RequirementResource, "/api/requirements", "/api/requirements/<int:id>")
+    api.add_resource(RequirementImportResource, "/api/requirements/import")
     api.add_resource(VendorCategoryResource, "/api/vendor-categories", "/api/vendor-categories/<int:id>")
     api.add_resource(RoleResource, "/api/roles")
     api.add_resource(CheckUserRole, "/api/check-user-role/<int:user_id>")
@@ -93,7 +116,7 @@ def create_app():
             try:
                 from backend.db_seed import seed_all
                 
-                print("Starting database seeding...")
+                app.logger.info("Starting database seeding")
                 
                 seed_all()
                 
@@ -107,13 +130,51 @@ def create_app():
                 }, 200
             except Exception as e:
                 db.session.rollback()
-                print(f"Error during seeding: {str(e)}")
+                app.logger.exception("Error during seeding")
                 return {
                     "message": f"Error during seeding: {str(e)}"
                 }, 500
 
     api.add_resource(SeedDB, "/api/seed-db")
 
+    from backend.utils.db_routing import init_replica_routing
+    init_replica_routing(app)
+
+    from backend.services.events import init_events
+    init_events(app)
+    # Registers the listener that queues notification emails for status events
+    from backend.services import email_jobs  # noqa: F401
+
+    if app.config.get('SQL_METRICS_ENABLED', False):
+        from backend.utils.sql_metrics import init_sql_metrics
+        init_sql_metrics(app)
+
+    from backend.cli import dashboard_cli, email_cli, import_cli, search_cli, sync_cli
+    app.cli.add_command(dashboard_cli)
+    app.cli.add_command(search_cli)
+    app.cli.add_command(import_cli)
+    app.cli.add_command(sync_cli)
+    app.cli.add_command(email_cli)
+
+    @jwt.additional_claims_loader
+    def add_identity_claims(identity):
+        if not app.config.get('JWT_IDENTITY_CLAIMS', False):
+            return {}
+        from backend.utils.principal import identity_claims
+        return identity_claims(identity)
+
+    @jwt.token_verification_loader
+    def stream_token_scope(jwt_header, jwt_payload):
+        # Stream tokens travel in URLs, so they open /api/events and nothing else
+        return jwt_payload.get('scope') is None or request.endpoint == 'eventstreamresource'
+
+    @jwt.token_verification_failed_loader
+    def token_scope_callback(jwt_header, jwt_payload):
+        return jsonify({
+            'message': 'Token is not valid for this endpoint',
+            'error': 'invalid_token'
+        }), 401
+
     @jwt.expired_token_loader
     def expired_token_callback(jwt_header, jwt_payload):
         return jsonify({
@@ -0,0 +1,137 @@
+"""Before/after timings for GET /api/dashboard.
+
+    python -m backend.benchmarks.dashboard --orders 20000 --repeat 20
+
+Seeds a throwaway database (SQLite in a temp file unless DATABASE_URL is
+set), adds ``--orders`` purchase orders for the seeded manager and vendor,
+each with a quote and a staff assignment, then reports the median latency
+and statement count per role. "before" replays the queries the dashboard
+ran prior to the aggregate/LIMIT rewrite; "after" is the live endpoint,
+with and without DASHBOARD_COUNTERS_ENABLED for managers.
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+STATUSES = ['pending', 'ordered', 'delivered', 'completed', 'cancelled']
+
+
+def _populate(orders):
+    from backend import db
+    from backend.models import OrderAssignment, PurchaseOrder, Quote, User, Vendor
+
+    manager = User.query.filter_by(email='manager@example.com').first()
+    staff = User.query.filter_by(email='staff@example.com').first()
+    vendor = Vendor.query.filter_by(email='vendor@example.com').first()
+    start = PurchaseOrder.query.count()
+
+    order_ids = range(start + 1, start + orders + 1)
+    db.session.execute(PurchaseOrder.__table__.insert(), [
+        {'id': id, 'order_number': f'PO-BENCH-{id}', 'status': STATUSES[id % len(STATUSES)],
+         'manager_id': manager.id, 'vendor_id': vendor.id}
+        for id in order_ids
+    ])
+    db.session.execute(Quote.__table__.insert(), [
+        {'order_id': id, 'vendor_id': vendor.id, 'price': 100, 'status': 'pending' if id % 3 else 'accepted'}
+        for id in order_ids
+    ])
+    db.session.execute(OrderAssignment.__table__.insert(), [
+        {'order_id': id, 'staff_id': staff.id, 'status': 'assigned'} for id in order_ids
+    ])
+    db.session.commit()
+
+
+def _before(role, principal):
+    """The pre-rewrite dashboard reads: full lists counted in Python."""
+    from backend.models import OrderAssignment, PurchaseOrder, Quote
+
+    if role == 'staff':
+        assignments = OrderAssignment.query.filter_by(staff_id=principal.id)\
+            .order_by(OrderAssignment.assigned_at.desc()).all()
+        return len(assignments), sum(1 for a in assignments if a.order.status not in ['completed', 'cancelled'])
+    if role == 'vendor':
+        orders = PurchaseOrder.query.filter_by(vendor_id=principal.vendor_id)\
+            .order_by(PurchaseOrder.created_at.desc()).all()
+        quotes = Quote.query.filter_by(vendor_id=principal.vendor_id)\
+            .order_by(Quote.created_at.desc()).all()
+        return len(orders), sum(1 for q in quotes if q.status == 'pending'), orders[:5], quotes[:5]
+    return None
+
+
+def _measure(app, fn, repeat):
+    from backend import db
+    from backend.utils.query_counter import count_queries
+
+    timings, queries = [], 0
+    for _ in range(repeat):
+        with app.app_context():
+            with count_queries() as counter:
+                started = time.perf_counter()
+                fn()
+                timings.append((time.perf_counter() - started) * 1000)
+            queries = counter.count
+            db.session.remove()
+    return statistics.median(timings), queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--orders', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    from backend import create_app, db
+    from backend.config import Config
+    from backend.db_seed import seed_all
+    from backend.models.manager_stat import rebuild_manager_stats
+    from backend.utils.principal import load_principal
+    from backend.models import User
+
+    # backend.config is already imported by the time this runs, so point Config at the scratch database directly
+    path = None
+    if not os.getenv('DATABASE_URL'):
+        fd, path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        Config.SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+
+    app = create_app()
+    app.config['TESTING'] = True
+    try:
+        with app.app_context():
+            db.create_all()
+            seed_all()
+            _populate(args.orders)
+            rebuild_manager_stats()
+
+        client = app.test_client()
+        print(f"{args.orders} orders, median of {args.repeat} runs")
+        print(f"{'role':<10}{'variant':<12}{'ms':>10}{'queries':>10}")
+        for role in ('manager', 'staff', 'vendor'):
+            email = f'{role}@example.com'
+            token = client.post('/api/login', json={'email': email, 'password': 'password123'}).get_json()['token']
+            headers = {'Authorization': f'Bearer {token}'}
+            with app.app_context():
+                principal = load_principal(User.query.filter_by(email=email).first().id)
+
+            variants = []
+            if role != 'manager':
+                variants.append(('before', lambda: _before(role, principal)))
+            for counters in ((False, True) if role == 'manager' else (False,)):
+                def after(counters=counters):
+                    app.config['DASHBOARD_COUNTERS_ENABLED'] = counters
+                    response = client.get('/api/dashboard', headers=headers)
+                    assert response.status_code == 200, response.get_json()
+                variants.append(('counters' if counters else 'after', after))
+
+            for name, fn in variants:
+                ms, queries = _measure(app, fn, args.repeat)
+                print(f"{role:<10}{name:<12}{ms:>10.2f}{queries:>10}")
+    finally:
+        if path:
+            os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
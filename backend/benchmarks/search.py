@@ -0,0 +1,152 @@
+"""Search latency for the ILIKE and pg_trgm backends.
+
+    DATABASE_URL=postgresql://.../scratch python -m backend.benchmarks.search --rows 1000000
+
+Adds ``--rows`` records spread over vendors, orders, quotes and
+requirements, then times each query in ``--query`` through
+DatabaseSearchBackend and, on PostgreSQL, TrigramSearchBackend, printing
+the median latency and the plan of the first trigram query. On PostgreSQL
+the pg_trgm indexes from migration 7b2e4f1c9a63 are created if missing.
+Point DATABASE_URL at a scratch database: rows are added, never removed.
+Without DATABASE_URL a temporary SQLite file is used and only the ILIKE
+backend runs.
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+WORDS = [
+    'steel', 'copper', 'bolt', 'valve', 'pump', 'cable', 'paint', 'resin', 'gasket', 'filter',
+    'bearing', 'sensor', 'relay', 'hinge', 'panel', 'timber', 'glass', 'foam', 'tape', 'clamp'
+]
+BATCH_SIZE = 5000
+
+
+def _text(rng, words=4):
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+
+def _insert(table, rows):
+    from backend import db
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == BATCH_SIZE:
+            db.session.execute(table.insert(), batch)
+            batch = []
+    if batch:
+        db.session.execute(table.insert(), batch)
+    db.session.commit()
+
+
+def _populate(rows):
+    from backend import db
+    from backend.models import PurchaseOrder, Quote, Requirement, User, Vendor
+
+    rng = random.Random(42)
+    manager = User.query.filter_by(email='manager@example.com').first()
+    run = int(time.time())
+    share = rows // 4
+
+    first_vendor = (db.session.query(db.func.max(Vendor.id)).scalar() or 0) + 1
+    _insert(Vendor.__table__, ({
+        'id': first_vendor + i, 'name': f'{_text(rng, 2).title()} {i}', 'email': f'bench-{run}-{i}@example.com',
+        'company_name': f'{_text(rng, 2).title()} Ltd', 'contact_person': _text(rng, 2).title(), 'is_verified': True
+    } for i in range(share)))
+
+    first_order = (db.session.query(db.func.max(PurchaseOrder.id)).scalar() or 0) + 1
+    _insert(PurchaseOrder.__table__, ({
+        'id': first_order + i, 'order_number': f'PO-{run}-{i:07d}', 'status': 'pending',
+        'manager_id': manager.id, 'vendor_id': first_vendor + i % share
+    } for i in range(share)))
+
+    _insert(Quote.__table__, ({
+        'order_id': first_order + i, 'vendor_id': first_vendor + i % share, 'price': 100,
+        'status': 'pending', 'notes': _text(rng, 8)
+    } for i in range(share)))
+
+    _insert(Requirement.__table__, ({
+        'item_name': _text(rng, 2), 'quantity': 1, 'specifications': _text(rng, 12), 'manager_id': manager.id
+    } for i in range(rows - 3 * share)))
+
+
+def _ensure_trigram_indexes():
+    from backend import db
+    from backend.services.search_service import TRIGRAM_SKIP_FIELDS, searchable_models
+
+    db.session.execute(db.text('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+    for model in searchable_models().values():
+        table = model.__tablename__
+        for field in model.__searchable__:
+            if field not in TRIGRAM_SKIP_FIELDS:
+                db.session.execute(db.text(
+                    f'CREATE INDEX IF NOT EXISTS ix_{table}_{field}_trgm ON {table} USING gin ({field} gin_trgm_ops)'
+                ))
+        db.session.execute(db.text(f'ANALYZE {table}'))
+    db.session.commit()
+
+
+def _time(backend, query, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        total, _results = backend.search(query, limit=20)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--query', action='append', help='may be repeated (default: a few sample terms)')
+    args = parser.parse_args()
+    queries = args.query or ['valve', 'gasket filter', 'PO-', 'ltd']
+
+    from backend import create_app, db
+    from backend.config import Config
+    from backend.db_seed import seed_all
+    from backend.services.search_service import database_search_backend, trigram_search_backend
+
+    path = None
+    if not os.getenv('DATABASE_URL'):
+        fd, path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        Config.SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+
+    app = create_app()
+    try:
+        with app.app_context():
+            db.create_all()
+            seed_all()
+            started = time.perf_counter()
+            _populate(args.rows)
+            print(f"Inserted {args.rows} rows in {time.perf_counter() - started:.1f}s")
+
+            backends = [('ilike', database_search_backend)]
+            if db.engine.dialect.name == 'postgresql':
+                _ensure_trigram_indexes()
+                backends.append(('trigram', trigram_search_backend))
+
+            print(f"{'query':<16}{'backend':<10}{'ms':>10}{'total':>10}")
+            for query in queries:
+                for name, backend in backends:
+                    ms, total = _time(backend, query, args.repeat)
+                    print(f"{query:<16}{name:<10}{ms:>10.2f}{total:>10}")
+
+            if len(backends) > 1:
+                plan_query = trigram_search_backend._queries(queries[0])['requirement'].limit(20)
+                compiled = plan_query.statement.compile(db.engine, compile_kwargs={'literal_binds': True})
+                print(f"\nEXPLAIN ANALYZE for requirement search '{queries[0]}':")
+                for (line,) in db.session.execute(db.text(f'EXPLAIN ANALYZE {compiled}')):
+                    print(f"  {line}")
+    finally:
+        if path:
+            os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+import click
+from flask.cli import AppGroup
+
+dashboard_cli = AppGroup('dashboard', help='Dashboard maintenance commands.')
+
+
+@dashboard_cli.command('rebuild-counters')
+def rebuild_counters():
+    """Recompute the materialized manager dashboard counters."""
+    from backend.models.manager_stat import rebuild_manager_stats
+
+    rows = rebuild_manager_stats()
+    click.echo(f"Rebuilt {rows} manager counters")
+
+
+search_cli = AppGroup('search', help='Search index maintenance commands.')
+
+
+@search_cli.command('drain-outbox')
+@click.option('--once', is_flag=True, help='Exit once no changes are due instead of polling.')
+@click.option('--batch-size', type=int, default=None, help='Changes sent per index call.')
+@click.option('--fake-index', is_flag=True, help='Send changes to an in-memory index instead of Algolia.')
+def drain_outbox(once, batch_size, fake_index):
+    """Push queued search_outbox changes to the search index."""
+    from backend.services.algolia_service import InMemorySearchIndex
+    from backend.services.search_outbox import OutboxWorker, get_outbox_index
+
+    index = InMemorySearchIndex() if fake_index else get_outbox_index()
+    worker = OutboxWorker(index, batch_size=batch_size)
+
+    if once:
+        stats = worker.drain()
+        click.echo(
+            f"Saved {stats['saved']}, deleted {stats['deleted']}, "
+            f"retrying {stats['retried']}, failed {stats['failed']}"
+        )
+        return
+
+    click.echo("Draining search outbox, press Ctrl+C to stop")
+    try:
+        worker.run()
+    except KeyboardInterrupt:
+        pass
+
+
+@search_cli.command('reindex')
+@click.option('--type', 'types', multiple=True, type=click.Choice(['vendor', 'order', 'quote', 'requirement']),
+              help='Only reindex this type; repeat for several. Defaults to all.')
+@click.option('--batch-size', type=int, default=1000, show_default=True, help='Records per save_objects call.')
+@click.option('--workers', type=int, default=4, show_default=True, help='Threads pushing batches concurrently.')
+@click.option('--after-id', type=int, default=None, help='Start after this id instead of the checkpoint (single --type only).')
+@click.option('--checkpoint', 'checkpoint_path', type=click.Path(dir_okay=False), default=None,
+              help='File recording progress; rerun with the same file to resume.')
+@click.option('--fake-index', is_flag=True, help='Push to an in-memory index instead of Algolia.')
+def reindex_search(types, batch_size, workers, after_id, checkpoint_path, fake_index):
+    """Rebuild the search index from the database."""
+    import time
+    from backend.services.algolia_service import InMemorySearchIndex
+    from backend.services.search_outbox import get_outbox_index
+    from backend.services.search_reindex import reindex
+
+    if after_id is not None and len(types) != 1:
+        raise click.UsageError('--after-id needs exactly one --type')
+
+    index = InMemorySearchIndex() if fake_index else get_outbox_index()
+    started = time.monotonic()
+    last_report = [started]
+    type_elapsed = {}
+
+    def progress(type_name, count, last_id, elapsed):
+        type_elapsed[type_name] = elapsed
+        now = time.monotonic()
+        if now - last_report[0] >= 5:
+            last_report[0] = now
+            click.echo(f"{type_name}: {count} records, checkpoint id {last_id}, {count / elapsed if elapsed else 0:.0f} records/s")
+
+    sent = reindex(
+        index, types=list(types) or None, batch_size=batch_size, workers=workers,
+        after_id=after_id, checkpoint_path=checkpoint_path, progress=progress
+    )
+
+    elapsed = time.monotonic() - started
+    total = sum(sent.values())
+    for type_name, count in sent.items():
+        seconds = type_elapsed.get(type_name, 0)
+        click.echo(f"{type_name}: {count} records in {seconds:.1f}s ({count / seconds if seconds else 0:.0f} records/s)")
+    click.echo(f"Reindexed {total} records in {elapsed:.1f}s ({total / elapsed if elapsed else 0:.0f} records/s)")
+
+
+import_cli = AppGroup('import', help='Bulk CSV import commands.')
+
+
+def _echo_report(report):
+    summary = report.to_dict()
+    prefix = 'Would import' if summary['dry_run'] else 'Imported'
+    click.echo(f"{prefix} {summary['imported']} of {summary['rows']} rows, {summary['failed']} failed")
+    for error in summary['errors']:
+        click.echo(f"  row {error['row']}: {error['message']}")
+    if summary['errors_truncated']:
+        click.echo(f"  ... {summary['failed'] - len(summary['errors'])} more errors not shown")
+
+
+@import_cli.command('vendors')
+@click.argument('csv_file', type=click.File('r', encoding='utf-8-sig'))
+@click.option('--dry-run', is_flag=True, help='Validate without writing anything.')
+@click.option('--chunk-size', type=int, default=None, help='Rows validated and committed per batch.')
+def import_vendors_command(csv_file, dry_run, chunk_size):
+    """Import vendors from a CSV file with name and email columns."""
+    from backend.services.csv_import import CSVImportError, import_vendors
+
+    try:
+        report = import_vendors(csv_file, dry_run=dry_run, chunk_size=chunk_size)
+    except CSVImportError as e:
+        raise click.ClickException(str(e))
+    _echo_report(report)
+
+
+@import_cli.command('requirements')
+@click.argument('csv_file', type=click.File('r', encoding='utf-8-sig'))
+@click.option('--manager-email', required=True, help='Manager who will own the requirements.')
+@click.option('--dry-run', is_flag=True, help='Validate without writing anything.')
+@click.option('--chunk-size', type=int, default=None, help='Rows validated and committed per batch.')
+def import_requirements_command(csv_file, manager_email, dry_run, chunk_size):
+    """Import requirements from a CSV file with item_name and quantity columns."""
+    from backend.models.user import User
+    from backend.services.csv_import import CSVImportError, import_requirements
+
+    manager = User.query.filter_by(email=manager_email).first()
+    if not manager or manager.role.name != 'manager':
+        raise click.ClickException(f'No manager with email {manager_email}')
+
+    try:
+        report = import_requirements(csv_file, manager.id, dry_run=dry_run, chunk_size=chunk_size)
+    except CSVImportError as e:
+        raise click.ClickException(str(e))
+    _echo_report(report)
+
+
+sync_cli = AppGroup('sync', help='Incremental sync maintenance commands.')
+
+
+@sync_cli.command('prune-tombstones')
+@click.option('--days', type=int, default=None, help='Keep this many days of deletes. Defaults to SYNC_TOMBSTONE_RETENTION_DAYS.')
+def prune_tombstones_command(days):
+    """Delete sync tombstones older than the retention window."""
+    from flask import current_app
+    from backend.models.sync_tombstone import prune_tombstones
+
+    if days is None:
+        days = current_app.config.get('SYNC_TOMBSTONE_RETENTION_DAYS', 30)
+    removed = prune_tombstones(days)
+    click.echo(f"Removed {removed} tombstones older than {days} days")
+
+
+email_cli = AppGroup('email', help='Notification email commands.')
+
+
+@email_cli.command('send-queued')
+@click.option('--once', is_flag=True, help='Exit once no jobs are due instead of polling.')
+@click.option('--batch-size', type=int, default=None, help='Jobs claimed per pass.')
+@click.option('--threads', type=int, default=None, help='Emails sent concurrently.')
+@click.option('--fake-mail', is_flag=True, help='Collect emails in memory instead of sending them through SendGrid.')
+def send_queued_emails(once, batch_size, threads, fake_mail):
+    """Send queued email_job notifications."""
+    from backend.services.email_jobs import EmailWorker, InMemoryMailSink, get_mailer
+
+    mailer = InMemoryMailSink() if fake_mail else get_mailer()
+    worker = EmailWorker(mailer, batch_size=batch_size, threads=threads)
+
+    if once:
+        stats = worker.drain()
+        click.echo(
+            f"Sent {stats['sent']} jobs in {stats['emails']} emails, "
+            f"retrying {stats['retried']}, failed {stats['failed']}"
+        )
+        return
+
+    click.echo("Sending queued emails, press Ctrl+C to stop")
+    try:
+        worker.run()
+    except KeyboardInterrupt:
+        pass
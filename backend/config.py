@@ -6,13 +6,120 @@ load_dotenv()
 class Config:
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'sqlite:///vendorsync.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Raw create_engine arguments; these override the DB_* pool settings below
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+
+    # Per-process pool; each gunicorn worker opens up to DB_POOL_SIZE + DB_MAX_OVERFLOW connections
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '5'))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '10'))
+    # Seconds to wait for a free connection before failing the request
+    DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '30'))
+    # Replace connections older than this many seconds; keep below server/proxy idle timeouts
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '1800'))
+    # Test connections with a cheap ping on checkout so stale ones are replaced transparently
+    DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'True').lower() == 'true'
+    # PostgreSQL statement_timeout in milliseconds; 0 leaves the server default
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', '0'))
+    # Connecting through PgBouncer in transaction mode: no startup options or server-side prepared statements
+    DB_PGBOUNCER = os.getenv('DB_PGBOUNCER', 'False').lower() == 'true'
+
+    # Comma-separated read replica URLs; GET handlers of resources with read_replica = True read from them
+    DB_REPLICA_URLS = [url.strip() for url in os.getenv('DB_REPLICA_URLS', '').split(',') if url.strip()]
+    # Seconds after a user's write during which their reads stay on the primary
+    DB_REPLICA_READ_YOUR_WRITES_SECONDS = float(os.getenv('DB_REPLICA_READ_YOUR_WRITES_SECONDS', '5'))
+    # Comma-separated endpoint names to force onto (or keep off) the replicas, overriding the resource setting
+    DB_REPLICA_ENDPOINTS = [name.strip() for name in os.getenv('DB_REPLICA_ENDPOINTS', '').split(',') if name.strip()]
+    DB_REPLICA_EXCLUDE = [name.strip() for name in os.getenv('DB_REPLICA_EXCLUDE', '').split(',') if name.strip()]
+
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'your-super-secret-jwt-key-here')
     JWT_ACCESS_TOKEN_EXPIRES = 3600
+
+    # Seconds a resolved request principal (user, role, vendor) may be reused; 0 disables
+    PRINCIPAL_CACHE_TTL = int(os.getenv('PRINCIPAL_CACHE_TTL', '0'))
+
+    # Embed role/vendor_id/is_active claims in access tokens and authorize from them
+    JWT_IDENTITY_CLAIMS = os.getenv('JWT_IDENTITY_CLAIMS', 'False').lower() == 'true'
+    # Seconds identity claims are trusted without a lookup; older claims are checked against user.token_version,
+    # at most once per this many seconds per user and worker
+    JWT_CLAIMS_MAX_AGE = int(os.getenv('JWT_CLAIMS_MAX_AGE', '60'))
+
+    # Serve manager dashboard counts from the manager_stat table kept up to date on writes
+    DASHBOARD_COUNTERS_ENABLED = os.getenv('DASHBOARD_COUNTERS_ENABLED', 'False').lower() == 'true'
+
+    # Cache role, category and manager vendor list responses; invalidated when those rows are committed
+    RESPONSE_CACHE_ENABLED = os.getenv('RESPONSE_CACHE_ENABLED', 'False').lower() == 'true'
+    # 'local' (per-process LRU) or 'redis' (shared by all workers, needs RESPONSE_CACHE_URL)
+    RESPONSE_CACHE_BACKEND = os.getenv('RESPONSE_CACHE_BACKEND', 'local')
+    RESPONSE_CACHE_URL = os.getenv('RESPONSE_CACHE_URL', 'redis://localhost:6379/0')
+    RESPONSE_CACHE_TTL = int(os.getenv('RESPONSE_CACHE_TTL', '300'))
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', '1024'))
+
+    # Send an ETag with order and quote lists (one count/max(updated_at) query per request) and answer If-None-Match with 304
+    COLLECTION_ETAGS_ENABLED = os.getenv('COLLECTION_ETAGS_ENABLED', 'True').lower() == 'true'
+
+    # /api/sync returns at most this many changes per type per call (capped at 1000)
+    SYNC_PAGE_SIZE = int(os.getenv('SYNC_PAGE_SIZE', '500'))
+    # Caught-up sync tokens resume this far in the past, so rows from transactions that commit late are not skipped.
+    # PostgreSQL stamps rows with the transaction start time: keep this above the longest write transaction
+    # (at least DB_STATEMENT_TIMEOUT_MS for single-statement writes)
+    SYNC_OVERLAP_SECONDS = int(os.getenv('SYNC_OVERLAP_SECONDS', '5'))
+    # Deletes are remembered this long; older sync tokens get a 410 and must start over
+    SYNC_TOMBSTONE_RETENTION_DAYS = int(os.getenv('SYNC_TOMBSTONE_RETENTION_DAYS', '30'))
+
+    # /api/events broker: 'memory' (per-process, streams only see their own worker's writes) or 'redis' (shared)
+    EVENTS_BROKER = os.getenv('EVENTS_BROKER', 'memory')
+    EVENTS_REDIS_URL = os.getenv('EVENTS_REDIS_URL', 'redis://localhost:6379/0')
+    # Events kept for Last-Event-ID resume; a client further behind gets a 'resync' event
+    EVENTS_BACKLOG = int(os.getenv('EVENTS_BACKLOG', '1000'))
+    EVENTS_KEEPALIVE_SECONDS = int(os.getenv('EVENTS_KEEPALIVE_SECONDS', '15'))
+    # Streams are closed after this long so they do not pin worker threads; EventSource reconnects by itself.
+    # Keep this below the gunicorn --timeout in the Procfile
+    EVENTS_MAX_STREAM_SECONDS = int(os.getenv('EVENTS_MAX_STREAM_SECONDS', '90'))
+    # Lifetime of the ?jwt= stream tokens from POST /api/events/token (URLs end up in access logs)
+    EVENTS_TOKEN_EXPIRES = int(os.getenv('EVENTS_TOKEN_EXPIRES', '60'))
+    EVENTS_RETRY_MS = int(os.getenv('EVENTS_RETRY_MS', '3000'))
+
+    # Largest batch accepted by the bulk create/update endpoints
+    BULK_MAX_ITEMS = int(os.getenv('BULK_MAX_ITEMS', '500'))
+    # Rows fetched per server-side cursor batch and written per chunk by the export endpoints
+    EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', '1000'))
+    # CSV imports validate and commit this many rows at a time, reporting at most IMPORT_MAX_ERRORS row errors
+    IMPORT_CHUNK_SIZE = int(os.getenv('IMPORT_CHUNK_SIZE', '1000'))
+    IMPORT_MAX_ERRORS = int(os.getenv('IMPORT_MAX_ERRORS', '1000'))
+
+    # Logging goes through a background QueueListener; 'json' emits one JSON object per line
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+    LOG_FORMAT = os.getenv('LOG_FORMAT', 'text')
+    # Fraction of DEBUG payload dumps (e.g. dashboard responses) actually logged
+    LOG_PAYLOAD_SAMPLE_RATE = float(os.getenv('LOG_PAYLOAD_SAMPLE_RATE', '0.01'))
+    LOG_REQUEST_ID_HEADER = os.getenv('LOG_REQUEST_ID_HEADER', 'X-Request-ID')
+
+    # Per-endpoint query count/DB time profiling, served in Prometheus format at /api/_metrics
+    SQL_METRICS_ENABLED = os.getenv('SQL_METRICS_ENABLED', 'False').lower() == 'true'
+    # Bearer token required to read /api/_metrics; must be set when SQL_METRICS_ENABLED is on
+    SQL_METRICS_TOKEN = os.getenv('SQL_METRICS_TOKEN', '')
+    SQL_METRICS_SLOW_STATEMENTS = int(os.getenv('SQL_METRICS_SLOW_STATEMENTS', '5'))
+    # Flag a request as N+1 when one statement runs more than this many times
+    SQL_METRICS_N_PLUS_ONE_THRESHOLD = int(os.getenv('SQL_METRICS_N_PLUS_ONE_THRESHOLD', '10'))
     
     # Algolia Configuration
     ALGOLIA_ENABLED = os.getenv('ALGOLIA_ENABLED', 'False').lower() == 'true'
     ALGOLIA_APP_ID = os.getenv('ALGOLIA_APP_ID', '')
     ALGOLIA_API_KEY = os.getenv('ALGOLIA_API_KEY', '')
+    # Index changes are queued in search_outbox and sent by `flask search drain-outbox`
+    SEARCH_OUTBOX_BATCH_SIZE = int(os.getenv('SEARCH_OUTBOX_BATCH_SIZE', '500'))
+    SEARCH_OUTBOX_MAX_ATTEMPTS = int(os.getenv('SEARCH_OUTBOX_MAX_ATTEMPTS', '10'))
+    # Retry delay in seconds, doubled per failed attempt up to SEARCH_OUTBOX_BACKOFF_MAX
+    SEARCH_OUTBOX_BACKOFF = float(os.getenv('SEARCH_OUTBOX_BACKOFF', '2'))
+    SEARCH_OUTBOX_BACKOFF_MAX = float(os.getenv('SEARCH_OUTBOX_BACKOFF_MAX', '300'))
+    SEARCH_OUTBOX_POLL_INTERVAL = float(os.getenv('SEARCH_OUTBOX_POLL_INTERVAL', '1'))
+    
+    # Search backend for /api/search: 'database' (ILIKE) or 'local' (in-process inverted index)
+    SEARCH_BACKEND = os.getenv('SEARCH_BACKEND', 'database')
+    # Seconds before the local index is rebuilt to pick up writes from other workers; 0 never
+    SEARCH_INDEX_MAX_AGE = int(os.getenv('SEARCH_INDEX_MAX_AGE', '300'))
+    # On PostgreSQL, search the free-text __searchable__ columns through the pg_trgm GIN indexes
+    SEARCH_TRIGRAM_ENABLED = os.getenv('SEARCH_TRIGRAM_ENABLED', 'True').lower() == 'true'
     
     # Cloudinary Configuration
     CLOUDINARY_CLOUD_NAME = os.getenv('CLOUDINARY_CLOUD_NAME', '')
@@ -20,4 +127,16 @@ class Config:
     CLOUDINARY_API_SECRET = os.getenv('CLOUDINARY_API_SECRET', '')
     
     # SendGrid Configuration
-    SENDGRID_API_KEY = os.getenv('SENDGRID_API_KEY', '')
\ No newline at end of file
+    SENDGRID_API_KEY = os.getenv('SENDGRID_API_KEY', '')
+    # Queue order status and quote acceptance emails in email_job; sent by `flask email send-queued`
+    EMAIL_NOTIFICATIONS_ENABLED = os.getenv('EMAIL_NOTIFICATIONS_ENABLED', 'False').lower() == 'true'
+    EMAIL_JOB_BATCH_SIZE = int(os.getenv('EMAIL_JOB_BATCH_SIZE', '100'))
+    # Concurrent SendGrid calls per worker process
+    EMAIL_JOB_THREADS = int(os.getenv('EMAIL_JOB_THREADS', '4'))
+    EMAIL_JOB_MAX_ATTEMPTS = int(os.getenv('EMAIL_JOB_MAX_ATTEMPTS', '8'))
+    # Retry delay in seconds, doubled per failed attempt up to EMAIL_JOB_BACKOFF_MAX
+    EMAIL_JOB_BACKOFF = float(os.getenv('EMAIL_JOB_BACKOFF', '30'))
+    EMAIL_JOB_BACKOFF_MAX = float(os.getenv('EMAIL_JOB_BACKOFF_MAX', '3600'))
+    EMAIL_JOB_POLL_INTERVAL = float(os.getenv('EMAIL_JOB_POLL_INTERVAL', '2'))
+    # Jobs still marked 'sending' after this many seconds belong to a dead worker and are claimed again
+    EMAIL_JOB_LOCK_TIMEOUT = int(os.getenv('EMAIL_JOB_LOCK_TIMEOUT', '300'))
\ No newline at end of file
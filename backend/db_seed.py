@@ -8,6 +8,10 @@ from backend.models.requirement import Requirement
 from backend.models.quote import Quote
 from backend.models.order_assignment import OrderAssignment
 from datetime import datetime, timedelta
+import logging
+
+# Named explicitly so running this file as a script still logs through the backend handlers
+logger = logging.getLogger('backend.db_seed')
 
 def seed_roles():
     roles = ['manager', 'staff', 'vendor']
@@ -15,9 +19,9 @@ def seed_roles():
         if not Role.query.filter_by(name=role_name).first():
             role = Role(name=role_name)
             db.session.add(role)
-            print(f"✓ Created role: {role_name}")
+            logger.debug("Created role: %s", role_name)
     db.session.commit()
-    print("✓ Roles seeded successfully")
+    logger.info("Roles seeded successfully")
 
 def seed_users():
     manager_role = Role.query.filter_by(name='manager').first()
@@ -35,7 +39,7 @@ def seed_users():
         )
         manager.set_password('password123')
         db.session.add(manager)
-        print("✓ Created manager user: manager@example.com")
+        logger.debug("Created manager user: manager@example.com")
 
     staff_users = [
         {'email': 'staff@example.com', 'first_name': 'Jane', 'last_name': 'Staff', 'phone': '0700000002'},
@@ -54,7 +58,7 @@ def seed_users():
             )
             staff.set_password('password123')
             db.session.add(staff)
-            print(f"✓ Created staff user: {staff_data['email']}")
+            logger.debug("Created staff user: %s", staff_data['email'])
 
     vendor_users = [
         {'email': 'vendor@example.com', 'first_name': 'Sarah', 'last_name': 'Vendor', 'phone': '0700000004'},
@@ -73,10 +77,10 @@ def seed_users():
             )
             vendor_user.set_password('password123')
             db.session.add(vendor_user)
-            print(f"✓ Created vendor user: {vendor_data['email']}")
+            logger.debug("Created vendor user: %s", vendor_data['email'])
 
     db.session.commit()
-    print("✓ Users seeded successfully")
+    logger.info("Users seeded successfully")
 
 def seed_vendor_categories():
     categories = [
@@ -92,10 +96,10 @@ def seed_vendor_categories():
         if not VendorCategory.query.filter_by(name=cat_name).first():
             category = VendorCategory(name=cat_name)
             db.session.add(category)
-            print(f"✓ Created category: {cat_name}")
+            logger.debug("Created category: %s", cat_name)
     
     db.session.commit()
-    print("✓ Vendor categories seeded successfully")
+    logger.info("Vendor categories seeded successfully")
 
 def seed_vendors():
     steel_category = VendorCategory.query.filter_by(name='Steel & Metal').first()
@@ -140,10 +144,10 @@ def seed_vendors():
             vendor = Vendor(**vendor_data)
             db.session.add(vendor)
             status = "verified" if vendor_data['is_verified'] else "unverified"
-            print(f"✓ Created {status} vendor: {vendor_data['name']}")
+            logger.debug("Created %s vendor: %s", status, vendor_data['name'])
 
     db.session.commit()
-    print("✓ Vendors seeded successfully")
+    logger.info("Vendors seeded successfully")
 
 def seed_data():
     manager = User.query.filter_by(email='manager@example.com').first()
@@ -153,7 +157,7 @@ def seed_data():
     vendor2 = Vendor.query.filter_by(email='vendor2@example.com').first()
 
     if not (manager and staff1 and vendor1):
-        print("⚠ Required users not found. Skipping data seeding.")
+        logger.warning("Required users not found. Skipping data seeding.")
         return
 
     requirements_data = [
@@ -181,7 +185,7 @@ def seed_data():
         if not Requirement.query.filter_by(item_name=req_data['item_name']).first():
             req = Requirement(**req_data)
             db.session.add(req)
-            print(f"✓ Created requirement: {req_data['item_name']}")
+            logger.debug("Created requirement: %s", req_data['item_name'])
 
     db.session.commit()
 
@@ -215,7 +219,7 @@ def seed_data():
             order = PurchaseOrder(**order_data)
             db.session.add(order)
             created_orders.append(order)
-            print(f"✓ Created order: {order_data['order_number']}")
+            logger.debug("Created order: %s", order_data['order_number'])
 
     db.session.commit()
 
@@ -260,7 +264,7 @@ def seed_data():
                 if not existing:
                     quote = Quote(**quote_data)
                     db.session.add(quote)
-                    print(f"✓ Created quote for order {quote_data['order_id']}")
+                    logger.debug("Created quote for order %s", quote_data['order_id'])
 
         db.session.commit()
 
@@ -276,7 +280,7 @@ def seed_data():
                 assigned_at=datetime.now() - timedelta(days=2)
             )
             db.session.add(assignment1)
-            print(f"✓ Assigned order {po2.order_number} to {staff1.first_name}")
+            logger.debug("Assigned order %s to %s", po2.order_number, staff1.first_name)
 
         if po3 and staff2 and not OrderAssignment.query.filter_by(order_id=po3.id, staff_id=staff2.id).first():
             assignment2 = OrderAssignment(
@@ -286,16 +290,14 @@ def seed_data():
                 assigned_at=datetime.now() - timedelta(days=9)
             )
             db.session.add(assignment2)
-            print(f"✓ Assigned order {po3.order_number} to {staff2.first_name}")
+            logger.debug("Assigned order %s to %s", po3.order_number, staff2.first_name)
 
         db.session.commit()
 
-    print("✓ All data seeded successfully")
+    logger.info("All data seeded successfully")
 
 def seed_all():
-    print("\n" + "="*50)
-    print("🌱 Starting database seeding...")
-    print("="*50 + "\n")
+    logger.info("Starting database seeding")
     
     try:
         seed_roles()
@@ -304,16 +306,13 @@ def seed_all():
         seed_vendors()
         seed_data()
         
-        print("\n" + "="*50)
-        print("✅ Database seeding completed successfully!")
-        print("="*50)
-        print("\nDefault login credentials:")
-        print("  Manager: manager@example.com / password123")
-        print("  Staff: staff@example.com / password123")
-        print("  Vendor: vendor@example.com / password123")
-        print("="*50 + "\n")
+        logger.info("Database seeding completed successfully")
+        logger.info(
+            "Default login credentials: manager@example.com, staff@example.com, "
+            "vendor@example.com (password123)"
+        )
     except Exception as e:
-        print(f"\n❌ Error during seeding: {str(e)}")
+        logger.exception("Error during seeding")
         db.session.rollback()
         raise
 
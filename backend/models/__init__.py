@@ -7,5 +7,9 @@ from backend.models.purchase_order import PurchaseOrder
 from backend.models.order_assignment import OrderAssignment
 from backend.models.document import Document
 from backend.models.quote import Quote
+from backend.models.manager_stat import ManagerStat
+from backend.models.search_outbox import SearchOutbox
+from backend.models.sync_tombstone import SyncTombstone
+from backend.models.email_job import EmailJob
 
-__all__ = ["User", "Vendor", "Role", "Requirement", "VendorCategory", "PurchaseOrder", "OrderAssignment", "Document", "Quote"]
+__all__ = ["User", "Vendor", "Role", "Requirement", "VendorCategory", "PurchaseOrder", "OrderAssignment", "Document", "Quote", "ManagerStat", "SearchOutbox", "SyncTombstone", "EmailJob"]
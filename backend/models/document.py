@@ -1,4 +1,5 @@
 from backend import db
+from sqlalchemy import Index
 
 class Document(db.Model):
     __tablename__ = 'document'
@@ -9,6 +10,11 @@ class Document(db.Model):
     file_type = db.Column(db.String(50), nullable=False)
     uploaded_by = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     created_at = db.Column(db.DateTime, server_default=db.func.now())
+    updated_at = db.Column(db.DateTime, server_default=db.func.now(), onupdate=db.func.now())
+
+    __table_args__ = (
+        Index('ix_document_order_created', 'order_id', 'created_at', 'id'),
+    )
 
     order = db.relationship('PurchaseOrder', back_populates='documents')
 
@@ -19,5 +25,6 @@ class Document(db.Model):
             'file_url': self.file_url,
             'file_type': self.file_type,
             'uploaded_by': self.uploaded_by,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
\ No newline at end of file
@@ -0,0 +1,43 @@
+import json
+from datetime import datetime
+from backend import db
+from sqlalchemy import Index
+
+class EmailJob(db.Model):
+    """Notification email waiting to be sent, written in the same transaction as the change it reports.
+
+    Rows are claimed by ``backend.services.email_jobs.EmailWorker`` and
+    deleted once the mail provider accepts them. ``status`` is 'pending',
+    'sending' while a worker holds the row, or 'failed' after the last
+    attempt.
+    """
+    __tablename__ = 'email_job'
+
+    id = db.Column(db.Integer, primary_key=True)
+    recipient = db.Column(db.String(255), nullable=False)
+    template = db.Column(db.String(50), nullable=False)
+    context = db.Column(db.Text)
+    status = db.Column(db.String(20), nullable=False, default='pending')
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.Text)
+    claim_token = db.Column(db.String(32), index=True)
+    locked_at = db.Column(db.DateTime)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index('ix_email_job_status_next_attempt', 'status', 'next_attempt_at'),
+    )
+
+    def __repr__(self):
+        return f"<EmailJob {self.template} to {self.recipient} {self.status} attempts={self.attempts}>"
+
+
+def enqueue_emails(connection, jobs):
+    """Queue ``(recipient, template, context)`` jobs with one executemany on ``connection``."""
+    rows = [
+        {'recipient': recipient, 'template': template, 'context': json.dumps(context, default=str)}
+        for recipient, template, context in jobs
+    ]
+    if rows:
+        connection.execute(EmailJob.__table__.insert(), rows)
@@ -0,0 +1,190 @@
+from backend import db
+from flask import current_app
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.dialects import postgresql, sqlite
+from backend.models.purchase_order import PurchaseOrder
+from backend.models.quote import Quote
+from backend.models.requirement import Requirement
+
+class ManagerStat(db.Model):
+    """Materialized per-manager dashboard counter.
+
+    Keys are ``orders``, ``orders:<status>``, ``requirements`` and
+    ``quotes:pending``; values are maintained from write events when
+    DASHBOARD_COUNTERS_ENABLED is set.
+    """
+    __tablename__ = 'manager_stat'
+
+    manager_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    key = db.Column(db.String(64), primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0)
+
+    @classmethod
+    def counts_for(cls, manager_id):
+        rows = db.session.query(cls.key, cls.value).filter(cls.manager_id == manager_id).all()
+        return {key: value for key, value in rows}
+
+    def __repr__(self):
+        return f"<ManagerStat manager_id={self.manager_id} {self.key}={self.value}>"
+
+
+def apply_stat_deltas(connection, deltas):
+    """Add ``{(manager_id, key): delta}`` to the counters in one statement per key."""
+    table = ManagerStat.__table__
+    dialect = connection.dialect.name
+
+    for (manager_id, key), delta in deltas.items():
+        if not delta or manager_id is None:
+            continue
+
+        if dialect in ('postgresql', 'sqlite'):
+            insert = (postgresql if dialect == 'postgresql' else sqlite).insert(table)
+            connection.execute(
+                insert.values(manager_id=manager_id, key=key, value=delta).on_conflict_do_update(
+                    index_elements=[table.c.manager_id, table.c.key],
+                    set_={'value': table.c.value + delta}
+                )
+            )
+            continue
+
+        result = connection.execute(
+            table.update()
+            .where(table.c.manager_id == manager_id, table.c.key == key)
+            .values(value=table.c.value + delta)
+        )
+        if result.rowcount == 0:
+            connection.execute(table.insert().values(manager_id=manager_id, key=key, value=delta))
+
+
+def rebuild_manager_stats():
+    """Recompute every counter from the source tables."""
+    table = ManagerStat.__table__
+    db.session.execute(table.delete())
+
+    rows = []
+    for manager_id, status, count in db.session.query(
+        PurchaseOrder.manager_id, PurchaseOrder.status, func.count(PurchaseOrder.id)
+    ).group_by(PurchaseOrder.manager_id, PurchaseOrder.status):
+        rows.append({'manager_id': manager_id, 'key': f'orders:{status}', 'value': count})
+
+    for manager_id, count in db.session.query(
+        PurchaseOrder.manager_id, func.count(PurchaseOrder.id)
+    ).group_by(PurchaseOrder.manager_id):
+        rows.append({'manager_id': manager_id, 'key': 'orders', 'value': count})
+
+    for manager_id, count in db.session.query(
+        Requirement.manager_id, func.count(Requirement.id)
+    ).group_by(Requirement.manager_id):
+        rows.append({'manager_id': manager_id, 'key': 'requirements', 'value': count})
+
+    for manager_id, count in db.session.query(
+        PurchaseOrder.manager_id, func.count(Quote.id)
+    ).join(Quote.order).filter(Quote.status == 'pending').group_by(PurchaseOrder.manager_id):
+        rows.append({'manager_id': manager_id, 'key': 'quotes:pending', 'value': count})
+
+    if rows:
+        db.session.execute(table.insert(), rows)
+    db.session.commit()
+    return len(rows)
+
+# Counter maintenance callbacks
+
+def _counters_enabled():
+    return current_app.config.get('DASHBOARD_COUNTERS_ENABLED', False)
+
+def _previous(target, attr):
+    history = inspect(target).attrs[attr].history
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(target, attr)
+
+def _add(deltas, key, delta):
+    deltas[key] = deltas.get(key, 0) + delta
+
+def _order_manager_id(connection, order_id):
+    return connection.execute(
+        select(PurchaseOrder.manager_id).where(PurchaseOrder.id == order_id)
+    ).scalar()
+
+@event.listens_for(PurchaseOrder, 'after_insert')
+def count_new_purchase_order(mapper, connection, target):
+    if _counters_enabled():
+        apply_stat_deltas(connection, {
+            (target.manager_id, 'orders'): 1,
+            (target.manager_id, f'orders:{target.status}'): 1
+        })
+
+@event.listens_for(PurchaseOrder, 'after_update')
+def count_updated_purchase_order(mapper, connection, target):
+    if not _counters_enabled():
+        return
+    old_manager, old_status = _previous(target, 'manager_id'), _previous(target, 'status')
+    if (old_manager, old_status) == (target.manager_id, target.status):
+        return
+    deltas = {}
+    for key, delta in (((old_manager, f'orders:{old_status}'), -1),
+                       ((target.manager_id, f'orders:{target.status}'), 1),
+                       ((old_manager, 'orders'), -1),
+                       ((target.manager_id, 'orders'), 1)):
+        _add(deltas, key, delta)
+    if old_manager != target.manager_id:
+        # The order's pending quotes now count towards the new manager
+        pending = connection.execute(
+            select(func.count(Quote.id)).where(Quote.order_id == target.id, Quote.status == 'pending')
+        ).scalar()
+        _add(deltas, (old_manager, 'quotes:pending'), -pending)
+        _add(deltas, (target.manager_id, 'quotes:pending'), pending)
+    apply_stat_deltas(connection, deltas)
+
+@event.listens_for(PurchaseOrder, 'after_delete')
+def count_deleted_purchase_order(mapper, connection, target):
+    if _counters_enabled():
+        apply_stat_deltas(connection, {
+            (target.manager_id, 'orders'): -1,
+            (target.manager_id, f'orders:{_previous(target, "status")}'): -1
+        })
+
+@event.listens_for(Requirement, 'after_insert')
+def count_new_requirement(mapper, connection, target):
+    if _counters_enabled():
+        apply_stat_deltas(connection, {(target.manager_id, 'requirements'): 1})
+
+@event.listens_for(Requirement, 'after_update')
+def count_updated_requirement(mapper, connection, target):
+    if not _counters_enabled():
+        return
+    old_manager = _previous(target, 'manager_id')
+    if old_manager != target.manager_id:
+        apply_stat_deltas(connection, {(old_manager, 'requirements'): -1, (target.manager_id, 'requirements'): 1})
+
+@event.listens_for(Requirement, 'after_delete')
+def count_deleted_requirement(mapper, connection, target):
+    if _counters_enabled():
+        apply_stat_deltas(connection, {(target.manager_id, 'requirements'): -1})
+
+@event.listens_for(Quote, 'after_insert')
+def count_new_quote(mapper, connection, target):
+    if _counters_enabled() and target.status == 'pending':
+        apply_stat_deltas(connection, {(_order_manager_id(connection, target.order_id), 'quotes:pending'): 1})
+
+@event.listens_for(Quote, 'after_update')
+def count_updated_quote(mapper, connection, target):
+    if not _counters_enabled():
+        return
+    was_pending = _previous(target, 'status') == 'pending'
+    is_pending = target.status == 'pending'
+    old_order_id = _previous(target, 'order_id')
+    if was_pending == is_pending and (not is_pending or old_order_id == target.order_id):
+        return
+    # Moving a pending quote to another order can move it to another manager
+    deltas = {}
+    if was_pending:
+        _add(deltas, (_order_manager_id(connection, old_order_id), 'quotes:pending'), -1)
+    if is_pending:
+        _add(deltas, (_order_manager_id(connection, target.order_id), 'quotes:pending'), 1)
+    apply_stat_deltas(connection, deltas)
+
+@event.listens_for(Quote, 'after_delete')
+def count_deleted_quote(mapper, connection, target):
+    if _counters_enabled() and _previous(target, 'status') == 'pending':
+        apply_stat_deltas(connection, {(_order_manager_id(connection, _previous(target, 'order_id')), 'quotes:pending'): -1})
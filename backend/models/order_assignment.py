@@ -1,4 +1,5 @@
 from backend import db
+from sqlalchemy import Index, UniqueConstraint
 
 class OrderAssignment(db.Model):
     __tablename__ = 'order_assignment'
@@ -8,6 +9,12 @@ class OrderAssignment(db.Model):
     staff_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     assigned_at = db.Column(db.DateTime, server_default=db.func.now())
     status = db.Column(db.String(50), default='assigned')
+    updated_at = db.Column(db.DateTime, server_default=db.func.now(), onupdate=db.func.now())
+
+    __table_args__ = (
+        UniqueConstraint('order_id', 'staff_id', name='uq_order_assignment_order_staff'),
+        Index('ix_order_assignment_staff_assigned', 'staff_id', 'assigned_at', 'id'),
+    )
 
     # Deferred imports
     staff = db.relationship(
@@ -1,6 +1,10 @@
 from backend import db
+from backend.models.search_outbox import enqueue_search_save, enqueue_search_delete
 from flask import current_app
-from sqlalchemy import event
+from sqlalchemy import Index, event
+
+# Orders in these states no longer count as active work
+CLOSED_ORDER_STATUSES = ['completed', 'cancelled']
 
 class PurchaseOrder(db.Model):
     __tablename__ = 'purchase_order'
@@ -13,6 +17,15 @@ class PurchaseOrder(db.Model):
     created_at = db.Column(db.DateTime, server_default=db.func.now())
     updated_at = db.Column(db.DateTime, server_default=db.func.now(), onupdate=db.func.now())
 
+    __table_args__ = (
+        Index('ix_purchase_order_manager_created', 'manager_id', 'created_at', 'id'),
+        Index('ix_purchase_order_manager_status', 'manager_id', 'status'),
+        Index('ix_purchase_order_vendor_created', 'vendor_id', 'created_at', 'id'),
+        Index('ix_purchase_order_vendor_status', 'vendor_id', 'status'),
+        Index('ix_purchase_order_manager_updated', 'manager_id', 'updated_at', 'id'),
+        Index('ix_purchase_order_vendor_updated', 'vendor_id', 'updated_at', 'id'),
+    )
+
     # Deferred import to avoid circular dependency
     manager = db.relationship(
         lambda: __import__('backend.models.user', fromlist=['User']).User,
@@ -58,23 +71,26 @@ class PurchaseOrder(db.Model):
     def __repr__(self):
         return f"<PurchaseOrder {self.order_number}>"
 
-# Algolia Indexing Callbacks
+# Search Indexing Callbacks
 
-def _get_algolia_service():
-    from backend.services.algolia_service import algolia_service
-    return algolia_service
+def _get_search_service():
+    from backend.services import search_service
+    return search_service
 
 @event.listens_for(PurchaseOrder, 'after_insert')
-def new_purchase_order_to_algolia(mapper, connection, target):
+def new_purchase_order_to_search_index(mapper, connection, target):
     if current_app.config.get('ALGOLIA_ENABLED', False):
-        _get_algolia_service().add_record(target.to_dict())
+        enqueue_search_save(connection, 'order', target.to_dict())
+    _get_search_service().queue_index(target)
 
 @event.listens_for(PurchaseOrder, 'after_update')
-def update_purchase_order_in_algolia(mapper, connection, target):
+def update_purchase_order_in_search_index(mapper, connection, target):
     if current_app.config.get('ALGOLIA_ENABLED', False):
-        _get_algolia_service().update_record(target.to_dict())
+        enqueue_search_save(connection, 'order', target.to_dict())
+    _get_search_service().queue_index(target)
 
 @event.listens_for(PurchaseOrder, 'after_delete')
-def delete_purchase_order_from_algolia(mapper, connection, target):
+def delete_purchase_order_from_search_index(mapper, connection, target):
     if current_app.config.get('ALGOLIA_ENABLED', False):
-        _get_algolia_service().delete_record(target.id)
+        enqueue_search_delete(connection, 'order', target.id)
+    _get_search_service().queue_remove(target)
@@ -1,6 +1,7 @@
 from backend import db
+from backend.models.search_outbox import enqueue_search_save, enqueue_search_delete
 from flask import current_app
-from sqlalchemy import event
+from sqlalchemy import Index, UniqueConstraint, event
 
 class Quote(db.Model):
     __tablename__ = 'quote'
@@ -14,12 +15,20 @@ class Quote(db.Model):
     created_at = db.Column(db.DateTime, server_default=db.func.now())
     updated_at = db.Column(db.DateTime, server_default=db.func.now(), onupdate=db.func.now())
 
+    __table_args__ = (
+        UniqueConstraint('order_id', 'vendor_id', name='uq_quote_order_vendor'),
+        Index('ix_quote_vendor_created', 'vendor_id', 'created_at', 'id'),
+        Index('ix_quote_vendor_status', 'vendor_id', 'status'),
+        Index('ix_quote_vendor_updated', 'vendor_id', 'updated_at', 'id'),
+    )
+
     vendor = db.relationship('Vendor', back_populates='quotes')
     order = db.relationship('PurchaseOrder', back_populates='quotes')
 
     __searchable__ = ['notes', 'status']
 
-    def to_dict(self):
+    def search_record(self):
+        """Column values only, so indexing a quote inside a flush never loads its vendor or order."""
         return {
             'objectID': self.id,
             'id': self.id,
@@ -29,31 +38,38 @@ class Quote(db.Model):
             'status': self.status,
             'notes': self.notes,
             'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'vendor_name': self.vendor.name if self.vendor else None,
-            'order_status': self.order.status if self.order else None
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
 
+    def to_dict(self):
+        data = self.search_record()
+        data['vendor_name'] = self.vendor.name if self.vendor else None
+        data['order_status'] = self.order.status if self.order else None
+        return data
+
     def __repr__(self):
         return f'<Quote {self.id} - ${self.price} - {self.status}>'
 
-# Algolia Indexing Callbacks
+# Search Indexing Callbacks
 
-def _get_algolia_service():
-    from backend.services.algolia_service import algolia_service
-    return algolia_service
+def _get_search_service():
+    from backend.services import search_service
+    return search_service
 
 @event.listens_for(Quote, 'after_insert')
-def new_quote_to_algolia(mapper, connection, target):
+def new_quote_to_search_index(mapper, connection, target):
     if current_app.config.get('ALGOLIA_ENABLED', False):
-        _get_algolia_service().add_record(target.to_dict())
+        enqueue_search_save(connection, 'quote', target.search_record())
+    _get_search_service().queue_index(target)
 
 @event.listens_for(Quote, 'after_update')
-def update_quote_in_algolia(mapper, connection, target):
+def update_quote_in_search_index(mapper, connection, target):
     if current_app.config.get('ALGOLIA_ENABLED', False):
-        _get_algolia_service().update_record(target.to_dict())
+        enqueue_search_save(connection, 'quote', target.search_record())
+    _get_search_service().queue_index(target)
 
 @event.listens_for(Quote, 'after_delete')
-def delete_quote_from_algolia(mapper, connection, target):
+def delete_quote_from_search_index(mapper, connection, target):
     if current_app.config.get('ALGOLIA_ENABLED', False):
-        _get_algolia_service().delete_record(target.id)
\ No newline at end of file
+        enqueue_search_delete(connection, 'quote', target.id)
+    _get_search_service().queue_remove(target)
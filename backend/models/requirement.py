@@ -1,6 +1,7 @@
 from backend import db
+from backend.models.search_outbox import enqueue_search_save, enqueue_search_delete
 from flask import current_app
-from sqlalchemy import event
+from sqlalchemy import Index, event
 
 class Requirement(db.Model):
     __tablename__ = 'requirement'
@@ -12,6 +13,10 @@ class Requirement(db.Model):
     manager_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     created_at = db.Column(db.DateTime, server_default=db.func.now())
 
+    __table_args__ = (
+        Index('ix_requirement_manager_created', 'manager_id', 'created_at', 'id'),
+    )
+
     manager = db.relationship('User', back_populates='requirements')
 
     __searchable__ = ['item_name', 'specifications']
@@ -30,23 +35,26 @@ class Requirement(db.Model):
     def __repr__(self):
         return f"<Requirement {self.item_name}>"
 
-# Algolia Indexing Callbacks
+# Search Indexing Callbacks
 
-def _get_algolia_service():
-    from backend.services.algolia_service import algolia_service
-    return algolia_service
+def _get_search_service():
+    from backend.services import search_service
+    return search_service
 
 @event.listens_for(Requirement, 'after_insert')
-def new_requirement_to_algolia(mapper, connection, target):
+def new_requirement_to_search_index(mapper, connection, target):
     if current_app.config.get('ALGOLIA_ENABLED', False):
-        _get_algolia_service().add_record(target.to_dict())
+        enqueue_search_save(connection, 'requirement', target.to_dict())
+    _get_search_service().queue_index(target)
 
 @event.listens_for(Requirement, 'after_update')
-def update_requirement_in_algolia(mapper, connection, target):
+def update_requirement_in_search_index(mapper, connection, target):
     if current_app.config.get('ALGOLIA_ENABLED', False):
-        _get_algolia_service().update_record(target.to_dict())
+        enqueue_search_save(connection, 'requirement', target.to_dict())
+    _get_search_service().queue_index(target)
 
 @event.listens_for(Requirement, 'after_delete')
-def delete_requirement_from_algolia(mapper, connection, target):
+def delete_requirement_from_search_index(mapper, connection, target):
     if current_app.config.get('ALGOLIA_ENABLED', False):
-        _get_algolia_service().delete_record(target.id)
\ No newline at end of file
+        enqueue_search_delete(connection, 'requirement', target.id)
+    _get_search_service().queue_remove(target)
@@ -0,0 +1,55 @@
+import json
+from datetime import datetime
+from backend import db
+
+class SearchOutbox(db.Model):
+    """Pending Algolia index change, written in the same transaction as the row it describes.
+
+    Rows are drained by ``backend.services.search_outbox.OutboxWorker`` and
+    deleted once the index has accepted them.
+    """
+    __tablename__ = 'search_outbox'
+
+    id = db.Column(db.Integer, primary_key=True)
+    object_id = db.Column(db.String(64), nullable=False)
+    action = db.Column(db.String(10), nullable=False)
+    payload = db.Column(db.Text)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.Text)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<SearchOutbox {self.action} {self.object_id} attempts={self.attempts}>"
+
+
+def search_object_id(search_type, object_id):
+    # Every model shares one index, so ids are namespaced by type
+    return f"{search_type}_{object_id}"
+
+
+def search_record(search_type, record):
+    return dict(record, objectID=search_object_id(search_type, record['id']), type=search_type)
+
+
+def enqueue_search_save(connection, search_type, record):
+    """Queue ``record`` for ``save_objects`` on the flush's own connection."""
+    enqueue_search_saves(connection, search_type, [record])
+
+
+def enqueue_search_saves(connection, search_type, records):
+    """Queue many records with one executemany, for rows written in bulk."""
+    rows = []
+    for record in records:
+        record = search_record(search_type, record)
+        rows.append({'object_id': record['objectID'], 'action': 'save', 'payload': json.dumps(record, default=str)})
+    if rows:
+        connection.execute(SearchOutbox.__table__.insert(), rows)
+
+
+def enqueue_search_delete(connection, search_type, object_id):
+    """Queue an index delete on the flush's own connection."""
+    connection.execute(SearchOutbox.__table__.insert().values(
+        object_id=search_object_id(search_type, object_id),
+        action='delete'
+    ))
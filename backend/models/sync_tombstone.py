@@ -0,0 +1,96 @@
+from datetime import timedelta
+from backend import db
+from backend.models.purchase_order import PurchaseOrder
+from backend.models.quote import Quote
+from backend.models.document import Document
+from backend.models.order_assignment import OrderAssignment
+from sqlalchemy import Index, event, select
+
+class SyncTombstone(db.Model):
+    """A deleted order, quote, document or assignment, kept so /api/sync can report it.
+
+    The owning manager, vendor and staff member are copied from the row
+    and its order at delete time, since neither exists to join against
+    afterwards. Rows older than SYNC_TOMBSTONE_RETENTION_DAYS are pruned by
+    ``flask sync prune-tombstones``.
+    """
+    __tablename__ = 'sync_tombstone'
+
+    id = db.Column(db.Integer, primary_key=True)
+    object_type = db.Column(db.String(20), nullable=False)
+    object_id = db.Column(db.Integer, nullable=False)
+    order_id = db.Column(db.Integer)
+    manager_id = db.Column(db.Integer)
+    vendor_id = db.Column(db.Integer)
+    staff_id = db.Column(db.Integer)
+    # Same clock as the updated_at columns the sync cursors compare against
+    deleted_at = db.Column(db.DateTime, nullable=False, server_default=db.func.now(), index=True)
+
+    __table_args__ = (
+        Index('ix_sync_tombstone_manager_deleted', 'manager_id', 'deleted_at', 'id'),
+        Index('ix_sync_tombstone_vendor_deleted', 'vendor_id', 'deleted_at', 'id'),
+        Index('ix_sync_tombstone_staff_deleted', 'staff_id', 'deleted_at', 'id'),
+        Index('ix_sync_tombstone_order', 'order_id'),
+    )
+
+    def __repr__(self):
+        return f"<SyncTombstone {self.object_type} {self.object_id}>"
+
+
+def record_tombstone(connection, object_type, object_id, **owners):
+    """Insert a tombstone on the flush's own connection, so it commits with the delete."""
+    connection.execute(SyncTombstone.__table__.insert().values(
+        object_type=object_type, object_id=object_id, **owners
+    ))
+
+
+def _order_owners(connection, target):
+    """``(manager_id, vendor_id)`` of the order ``target`` belongs to."""
+    # Children of a deleted order are flushed before it, so the order row is still there
+    order = target.__dict__.get('order')
+    if order is not None:
+        return order.manager_id, order.vendor_id
+    row = connection.execute(
+        select(PurchaseOrder.manager_id, PurchaseOrder.vendor_id).where(PurchaseOrder.id == target.order_id)
+    ).first()
+    return (row.manager_id, row.vendor_id) if row else (None, None)
+
+
+@event.listens_for(PurchaseOrder, 'after_delete')
+def tombstone_purchase_order(mapper, connection, target):
+    record_tombstone(connection, 'order', target.id, order_id=target.id,
+                     manager_id=target.manager_id, vendor_id=target.vendor_id)
+
+
+@event.listens_for(Quote, 'after_delete')
+def tombstone_quote(mapper, connection, target):
+    manager_id, _ = _order_owners(connection, target)
+    record_tombstone(connection, 'quote', target.id, order_id=target.order_id,
+                     manager_id=manager_id, vendor_id=target.vendor_id)
+
+
+@event.listens_for(Document, 'after_delete')
+def tombstone_document(mapper, connection, target):
+    manager_id, vendor_id = _order_owners(connection, target)
+    record_tombstone(connection, 'document', target.id, order_id=target.order_id,
+                     manager_id=manager_id, vendor_id=vendor_id)
+
+
+@event.listens_for(OrderAssignment, 'after_delete')
+def tombstone_order_assignment(mapper, connection, target):
+    # Vendors never see assignments, so their tombstones carry no vendor
+    manager_id, _ = _order_owners(connection, target)
+    record_tombstone(connection, 'assignment', target.id, order_id=target.order_id,
+                     manager_id=manager_id, staff_id=target.staff_id)
+
+
+def prune_tombstones(retention_days):
+    """Delete tombstones older than ``retention_days``; returns how many were removed.
+
+    Sync tokens older than the retention window get a 410 and start over,
+    so nothing still needs these rows.
+    """
+    cutoff = db.session.query(db.func.now()).scalar() - timedelta(days=retention_days)
+    removed = SyncTombstone.query.filter(SyncTombstone.deleted_at < cutoff).delete(synchronize_session=False)
+    db.session.commit()
+    return removed
@@ -12,6 +12,8 @@ class User(db.Model):
     phone = db.Column(db.String(20))
     role_id = db.Column(db.Integer, db.ForeignKey('role.id'), nullable=False)
     is_active = db.Column(db.Boolean, default=True)
+    # Bumped whenever role, active flag or vendor link change; tokens carrying an older value are re-checked
+    token_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     created_at = db.Column(db.DateTime, server_default=db.func.now())
     updated_at = db.Column(db.DateTime, server_default=db.func.now(), onupdate=db.func.now())
 
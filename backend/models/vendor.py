@@ -1,4 +1,5 @@
 from backend import db
+from backend.models.search_outbox import enqueue_search_save, enqueue_search_delete
 from sqlalchemy import UniqueConstraint, event
 from flask import current_app
 
@@ -43,23 +44,26 @@ class Vendor(db.Model):
     def __repr__(self):
         return f"<Vendor {self.name}>"
 
-# Algolia Indexing Callbacks
+# Search Indexing Callbacks
 
-def _get_algolia_service():
-    from backend.services.algolia_service import algolia_service
-    return algolia_service
+def _get_search_service():
+    from backend.services import search_service
+    return search_service
 
 @event.listens_for(Vendor, 'after_insert')
-def new_vendor_to_algolia(mapper, connection, target):
+def new_vendor_to_search_index(mapper, connection, target):
     if current_app.config.get('ALGOLIA_ENABLED', False):
-        _get_algolia_service().add_record(target.to_dict())
+        enqueue_search_save(connection, 'vendor', target.to_dict())
+    _get_search_service().queue_index(target)
 
 @event.listens_for(Vendor, 'after_update')
-def update_vendor_in_algolia(mapper, connection, target):
+def update_vendor_in_search_index(mapper, connection, target):
     if current_app.config.get('ALGOLIA_ENABLED', False):
-        _get_algolia_service().update_record(target.to_dict())
+        enqueue_search_save(connection, 'vendor', target.to_dict())
+    _get_search_service().queue_index(target)
 
 @event.listens_for(Vendor, 'after_delete')
-def delete_vendor_from_algolia(mapper, connection, target):
+def delete_vendor_from_search_index(mapper, connection, target):
     if current_app.config.get('ALGOLIA_ENABLED', False):
-        _get_algolia_service().delete_record(target.id)
\ No newline at end of file
+        enqueue_search_delete(connection, 'vendor', target.id)
+    _get_search_service().queue_remove(target)
@@ -1,68 +1,103 @@
+import logging
 from flask_restful import Resource
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from backend.models.user import User
-from backend.models.purchase_order import PurchaseOrder
+from flask_jwt_extended import jwt_required
+from backend.models.purchase_order import CLOSED_ORDER_STATUSES, PurchaseOrder
 from backend.models.order_assignment import OrderAssignment
 from backend.models.quote import Quote
 from backend.models.requirement import Requirement
 from backend.models.vendor import Vendor
-from sqlalchemy import func
+from backend.models.manager_stat import ManagerStat
+from backend.utils.log import log_payload
+from backend.utils.principal import get_current_principal
+from backend import db
+from flask import current_app
+from sqlalchemy import case, func, literal, null, select, union_all
+from sqlalchemy.orm import joinedload
+
+RECENT_ITEMS_LIMIT = 5
+
+logger = logging.getLogger(__name__)
 
 class Dashboard(Resource):
+    read_replica = True
+
     @jwt_required()
     def get(self):
-        user_id = get_jwt_identity()
-        print(f"Dashboard resource hit! User ID: {user_id}")
-        
-        user = User.query.get(user_id)
-        
-        if not user:
+        principal = get_current_principal()
+        if not principal:
             return {'message': 'User not found'}, 404
 
-        print(f"User role name: {user.role.name}")
-        print(f"User role ID: {user.role_id}")
+        logger.debug("Dashboard requested by user %s (%s)", principal.id, principal.role)
 
         try:
-            if user.role.name == 'manager':
-                return self._get_manager_dashboard(user)
-            elif user.role.name == 'staff':
-                return self._get_staff_dashboard(user)
-            elif user.role.name == 'vendor':
-                return self._get_vendor_dashboard(user)
+            if principal.role == 'manager':
+                return self._get_manager_dashboard(principal)
+            elif principal.role == 'staff':
+                return self._get_staff_dashboard(principal)
+            elif principal.role == 'vendor':
+                return self._get_vendor_dashboard(principal)
             else:
                 return {'message': 'Invalid role'}, 400
 
         except Exception as e:
-            print(f"Dashboard error: {str(e)}")
+            logger.exception("Dashboard error for user %s", principal.id)
             return {'message': f'Server error: {str(e)}'}, 500
 
-    def _get_manager_dashboard(self, user):
-        total_orders = PurchaseOrder.query.filter_by(manager_id=user.id).count()
-        pending_orders = PurchaseOrder.query.filter_by(manager_id=user.id, status='pending').count()
-        completed_orders = PurchaseOrder.query.filter_by(manager_id=user.id, status='completed').count()
-        
-        total_requirements = Requirement.query.filter_by(manager_id=user.id).count()
-        pending_quotes = Quote.query.join(PurchaseOrder).filter(
-            PurchaseOrder.manager_id == user.id,
+    def _get_manager_counts(self, manager_id):
+        if current_app.config.get('DASHBOARD_COUNTERS_ENABLED', False):
+            return ManagerStat.counts_for(manager_id)
+
+        # Status breakdown, requirement and pending quote counts in one round-trip
+        order_counts = select(
+            literal('orders'), PurchaseOrder.status, func.count(PurchaseOrder.id)
+        ).where(PurchaseOrder.manager_id == manager_id).group_by(PurchaseOrder.status)
+
+        requirement_count = select(
+            literal('requirements'), null(), func.count(Requirement.id)
+        ).where(Requirement.manager_id == manager_id)
+
+        pending_quote_count = select(
+            literal('quotes'), literal('pending'), func.count(Quote.id)
+        ).join(PurchaseOrder, Quote.order_id == PurchaseOrder.id).where(
+            PurchaseOrder.manager_id == manager_id,
             Quote.status == 'pending'
-        ).count()
+        )
+
+        counts = {}
+        rows = db.session.execute(union_all(order_counts, requirement_count, pending_quote_count))
+        for kind, status, count in rows:
+            if kind == 'orders':
+                counts['orders'] = counts.get('orders', 0) + count
+                counts[f'orders:{status}'] = count
+            elif kind == 'quotes':
+                counts['quotes:pending'] = count
+            else:
+                counts[kind] = count
+        return counts
+
+    def _get_manager_dashboard(self, principal):
+        counts = self._get_manager_counts(principal.id)
 
-        recent_orders = PurchaseOrder.query.filter_by(manager_id=user.id)\
-            .order_by(PurchaseOrder.created_at.desc()).limit(5).all()
+        recent_orders = PurchaseOrder.query.filter_by(manager_id=principal.id)\
+            .order_by(PurchaseOrder.created_at.desc()).limit(RECENT_ITEMS_LIMIT).all()
 
         pending_quotes_list = Quote.query.join(PurchaseOrder).filter(
-            PurchaseOrder.manager_id == user.id,
+            PurchaseOrder.manager_id == principal.id,
             Quote.status == 'pending'
-        ).order_by(Quote.created_at.desc()).limit(5).all()
+        ).order_by(Quote.created_at.desc()).limit(RECENT_ITEMS_LIMIT).all()
 
         data = {
             'role': 'manager',
             'statistics': {
-                'total_orders': total_orders,
-                'pending_orders': pending_orders,
-                'completed_orders': completed_orders,
-                'total_requirements': total_requirements,
-                'pending_quotes': pending_quotes
+                'total_orders': counts.get('orders', 0),
+                'pending_orders': counts.get('orders:pending', 0),
+                'completed_orders': counts.get('orders:completed', 0),
+                'total_requirements': counts.get('requirements', 0),
+                'pending_quotes': counts.get('quotes:pending', 0),
+                'orders_by_status': {
+                    key.split(':', 1)[1]: value for key, value in counts.items()
+                    if key.startswith('orders:') and value
+                }
             },
             'recent_orders': [{
                 'id': order.id,
@@ -80,15 +115,22 @@ class Dashboard(Resource):
             } for quote in pending_quotes_list]
         }
 
-        print(f"Manager dashboard data: {data}")
+        log_payload(logger, "Manager dashboard data", data)
         return data, 200
 
-    def _get_staff_dashboard(self, user):
-        assignments = OrderAssignment.query.filter_by(staff_id=user.id)\
-            .order_by(OrderAssignment.assigned_at.desc()).all()
+    def _get_staff_dashboard(self, principal):
+        total_assignments, active_assignments = db.session.query(
+            func.count(OrderAssignment.id),
+            func.coalesce(func.sum(case(
+                (PurchaseOrder.status.notin_(CLOSED_ORDER_STATUSES), 1), else_=0
+            )), 0)
+        ).join(PurchaseOrder, OrderAssignment.order_id == PurchaseOrder.id).filter(
+            OrderAssignment.staff_id == principal.id
+        ).one()
 
-        total_assignments = len(assignments)
-        active_assignments = sum(1 for a in assignments if a.order.status not in ['completed', 'cancelled'])
+        assignments = OrderAssignment.query.filter_by(staff_id=principal.id)\
+            .options(joinedload(OrderAssignment.order))\
+            .order_by(OrderAssignment.assigned_at.desc()).limit(RECENT_ITEMS_LIMIT).all()
 
         data = {
             'role': 'staff',
@@ -106,11 +148,11 @@ class Dashboard(Resource):
             } for assignment in assignments]
         }
 
-        print(f"Staff dashboard data: {data}")
+        log_payload(logger, "Staff dashboard data", data)
         return data, 200
 
-    def _get_vendor_dashboard(self, user):
-        vendor = Vendor.query.filter_by(email=user.email).first()
+    def _get_vendor_dashboard(self, principal):
+        vendor = Vendor.query.get(principal.vendor_id) if principal.vendor_id else None
         
         if not vendor:
             return {
@@ -127,14 +169,28 @@ class Dashboard(Resource):
                 'quotes': []
             }, 200
 
+        # Order total and quote status breakdown in one round-trip
+        order_count = select(
+            literal('orders'), null(), func.count(PurchaseOrder.id)
+        ).where(PurchaseOrder.vendor_id == vendor.id)
+
+        quote_counts = select(
+            literal('quotes'), Quote.status, func.count(Quote.id)
+        ).where(Quote.vendor_id == vendor.id).group_by(Quote.status)
+
+        total_orders = 0
+        quotes_by_status = {}
+        for kind, status, count in db.session.execute(union_all(order_count, quote_counts)):
+            if kind == 'orders':
+                total_orders = count
+            else:
+                quotes_by_status[status] = count
+
         orders = PurchaseOrder.query.filter_by(vendor_id=vendor.id)\
-            .order_by(PurchaseOrder.created_at.desc()).all()
+            .order_by(PurchaseOrder.created_at.desc()).limit(RECENT_ITEMS_LIMIT).all()
 
         quotes = Quote.query.filter_by(vendor_id=vendor.id)\
-            .order_by(Quote.created_at.desc()).all()
-
-        pending_quotes_count = sum(1 for q in quotes if q.status == 'pending')
-        accepted_quotes_count = sum(1 for q in quotes if q.status == 'accepted')
+            .order_by(Quote.created_at.desc()).limit(RECENT_ITEMS_LIMIT).all()
 
         data = {
             'role': 'vendor',
@@ -146,25 +202,25 @@ class Dashboard(Resource):
             },
             'statistics': {
                 'is_verified': vendor.is_verified,
-                'total_orders': len(orders),
-                'total_quotes': len(quotes),
-                'pending_quotes': pending_quotes_count,
-                'accepted_quotes': accepted_quotes_count
+                'total_orders': total_orders,
+                'total_quotes': sum(quotes_by_status.values()),
+                'pending_quotes': quotes_by_status.get('pending', 0),
+                'accepted_quotes': quotes_by_status.get('accepted', 0)
             },
             'orders': [{
                 'id': order.id,
                 'order_number': order.order_number,
                 'status': order.status,
                 'created_at': order.created_at.isoformat() if order.created_at else None
-            } for order in orders[:5]],
+            } for order in orders],
             'quotes': [{
                 'id': quote.id,
                 'order_id': quote.order_id,
                 'price': float(quote.price) if quote.price else 0,
                 'status': quote.status,
                 'created_at': quote.created_at.isoformat() if quote.created_at else None
-            } for quote in quotes[:5]]
+            } for quote in quotes]
         }
 
-        print(f"Vendor dashboard data: {data}")
+        log_payload(logger, "Vendor dashboard data", data)
         return data, 200
\ No newline at end of file
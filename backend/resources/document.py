@@ -1,15 +1,36 @@
 from flask_restful import Resource, reqparse
-from flask_jwt_extended import jwt_required, get_jwt_identity
 from backend.models.document import Document
-from backend.models.user import User
-from backend.models.vendor import Vendor
 from backend.models.purchase_order import PurchaseOrder
 from backend.models.order_assignment import OrderAssignment
+from backend.utils.decorators import role_required
+from backend.utils.export import add_export_arguments, export_response
+from backend.utils.pagination import add_keyset_arguments, keyset_paginate, wants_keyset
+from backend.utils.principal import get_current_principal
 from backend import db
 from werkzeug.datastructures import FileStorage
 
+DOCUMENT_EXPORT_FIELDS = ['id', 'order_id', 'file_url', 'file_type', 'uploaded_by', 'created_at']
+
+def _scoped_documents(principal):
+    """Documents ``principal`` may list, or None when there are none to see."""
+    if principal.role == 'manager':
+        return Document.query.join(PurchaseOrder).filter(
+            PurchaseOrder.manager_id == principal.id
+        )
+    if principal.role == 'vendor' and principal.vendor_id:
+        return Document.query.join(PurchaseOrder).filter(
+            PurchaseOrder.vendor_id == principal.vendor_id
+        )
+    if principal.role == 'staff':
+        return Document.query.join(PurchaseOrder).join(OrderAssignment).filter(
+            OrderAssignment.staff_id == principal.id
+        )
+    return None
+
 class DocumentResource(Resource):
-    @jwt_required()
+    read_replica = True
+
+    @role_required('manager', 'staff', 'vendor')
     def post(self):
         parser = reqparse.RequestParser()
         parser.add_argument('order_id', type=int, required=True, help='Order ID is required')
@@ -17,23 +38,20 @@ class DocumentResource(Resource):
         parser.add_argument('file_type', type=str, required=True, help='File type is required')
         args = parser.parse_args()
 
-        user = User.query.get(get_jwt_identity())
-        if not user:
-            return {'message': 'User not found'}, 404
+        principal = get_current_principal()
 
         order = PurchaseOrder.query.get(args['order_id'])
         if not order:
             return {'message': 'Order not found'}, 404
 
-        if user.role.name == 'vendor':
-            vendor = Vendor.query.filter_by(email=user.email).first()
-            if not vendor or order.vendor_id != vendor.id:
+        if principal.role == 'vendor':
+            if not principal.vendor_id or order.vendor_id != principal.vendor_id:
                 return {'message': 'Access denied. You can only upload documents to your orders.'}, 403
-        elif user.role.name == 'staff':
-            if not any(assignment.staff_id == user.id for assignment in order.assignments):
+        elif principal.role == 'staff':
+            if not any(assignment.staff_id == principal.id for assignment in order.assignments):
                 return {'message': 'Access denied. You can only upload documents to assigned orders.'}, 403
-        elif user.role.name == 'manager':
-            if order.manager_id != user.id:
+        elif principal.role == 'manager':
+            if order.manager_id != principal.id:
                 return {'message': 'Access denied. You can only upload documents to your orders.'}, 403
         else:
             return {'message': 'Access denied'}, 403
@@ -55,7 +73,7 @@ class DocumentResource(Resource):
             order_id=args['order_id'],
             file_url=uploaded_file_url,
             file_type=args['file_type'],
-            uploaded_by=user.id
+            uploaded_by=principal.id
         )
 
         try:
@@ -69,11 +87,9 @@ class DocumentResource(Resource):
             db.session.rollback()
             return {'message': f'Failed to upload document: {str(e)}'}, 500
 
-    @jwt_required()
+    @role_required('manager', 'staff', 'vendor')
     def get(self, id=None):
-        user = User.query.get(get_jwt_identity())
-        if not user:
-            return {'message': 'User not found'}, 404
+        principal = get_current_principal()
 
         if id:
             document = Document.query.get(id)
@@ -82,15 +98,14 @@ class DocumentResource(Resource):
             
             order = document.order
             
-            if user.role.name == 'vendor':
-                vendor = Vendor.query.filter_by(email=user.email).first()
-                if not vendor or order.vendor_id != vendor.id:
+            if principal.role == 'vendor':
+                if not principal.vendor_id or order.vendor_id != principal.vendor_id:
                     return {'message': 'Access denied'}, 403
-            elif user.role.name == 'staff':
-                if not any(a.staff_id == user.id for a in order.assignments):
+            elif principal.role == 'staff':
+                if not any(a.staff_id == principal.id for a in order.assignments):
                     return {'message': 'Access denied'}, 403
-            elif user.role.name == 'manager':
-                if order.manager_id != user.id:
+            elif principal.role == 'manager':
+                if order.manager_id != principal.id:
                     return {'message': 'Access denied'}, 403
             
             return document.to_dict(), 200
@@ -100,32 +115,40 @@ class DocumentResource(Resource):
         parser.add_argument('file_type', type=str, location='args')
         parser.add_argument('page', type=int, default=1, location='args')
         parser.add_argument('per_page', type=int, default=10, location='args')
+        add_keyset_arguments(parser)
         args = parser.parse_args()
 
-        if user.role.name == 'manager':
-            query = Document.query.join(PurchaseOrder).filter(
-                PurchaseOrder.manager_id == user.id
-            )
-        elif user.role.name == 'vendor':
-            vendor = Vendor.query.filter_by(email=user.email).first()
-            if not vendor:
-                return {'documents': [], 'total': 0}, 200
-            query = Document.query.join(PurchaseOrder).filter(
-                PurchaseOrder.vendor_id == vendor.id
-            )
-        elif user.role.name == 'staff':
-            query = Document.query.join(PurchaseOrder).join(OrderAssignment).filter(
-                OrderAssignment.staff_id == user.id
-            )
-        else:
+        if principal.role not in ('manager', 'staff', 'vendor'):
             return {'message': 'Access denied'}, 403
 
+        query = _scoped_documents(principal)
+        if query is None:
+            return {'documents': [], 'total': 0}, 200
+
         if args['order_id']:
             query = query.filter(Document.order_id == args['order_id'])
         
         if args['file_type']:
             query = query.filter(Document.file_type == args['file_type'])
 
+        if wants_keyset(args):
+            try:
+                page = keyset_paginate(
+                    query, Document.created_at, Document.id,
+                    cursor=args['cursor'], limit=args['limit'], include_total=args['include_total']
+                )
+            except ValueError:
+                return {'message': 'Invalid cursor'}, 400
+
+            response = {
+                'documents': [doc.to_dict() for doc in page.items],
+                'next_cursor': page.next_cursor,
+                'has_next': page.has_next
+            }
+            if page.total is not None:
+                response['total_documents'] = page.total
+            return response, 200
+
         pagination = query.order_by(Document.created_at.desc()).paginate(
             page=args['page'],
             per_page=args['per_page'],
@@ -141,11 +164,9 @@ class DocumentResource(Resource):
             'has_prev': pagination.has_prev
         }, 200
 
-    @jwt_required()
+    @role_required()
     def delete(self, id):
-        user = User.query.get(get_jwt_identity())
-        if not user:
-            return {'message': 'User not found'}, 404
+        principal = get_current_principal()
 
         document = Document.query.get(id)
         if not document:
@@ -153,10 +174,10 @@ class DocumentResource(Resource):
 
         order = document.order
 
-        if user.role.name == 'manager':
-            if order.manager_id != user.id:
+        if principal.role == 'manager':
+            if order.manager_id != principal.id:
                 return {'message': 'Access denied'}, 403
-        elif document.uploaded_by != user.id:
+        elif document.uploaded_by != principal.id:
             return {'message': 'You can only delete documents you uploaded'}, 403
 
         try:
@@ -165,4 +186,27 @@ class DocumentResource(Resource):
             return {'message': 'Document deleted successfully'}, 200
         except Exception as e:
             db.session.rollback()
-            return {'message': f'Failed to delete document: {str(e)}'}, 500
\ No newline at end of file
+            return {'message': f'Failed to delete document: {str(e)}'}, 500
+
+class DocumentExportResource(Resource):
+    read_replica = True
+
+    @role_required('manager', 'staff', 'vendor')
+    def get(self):
+        principal = get_current_principal()
+
+        parser = reqparse.RequestParser()
+        parser.add_argument('order_id', type=int, location='args')
+        parser.add_argument('file_type', type=str, location='args')
+        add_export_arguments(parser)
+        args = parser.parse_args()
+
+        query = _scoped_documents(principal)
+        if query is not None:
+            if args['order_id']:
+                query = query.filter(Document.order_id == args['order_id'])
+            if args['file_type']:
+                query = query.filter(Document.file_type == args['file_type'])
+            query = query.order_by(Document.id)
+
+        return export_response(query, DOCUMENT_EXPORT_FIELDS, args['format'], 'documents')
@@ -0,0 +1,109 @@
+import json
+import time
+from datetime import timedelta
+from flask import Response, current_app, request
+from flask_jwt_extended import create_access_token, get_jwt, get_jwt_identity, get_jwt_request_location
+from flask_restful import Resource
+from backend.services.events import get_event_broker, visible_to
+from backend.utils.decorators import role_required
+from backend.utils.principal import get_current_principal
+from backend import db
+
+
+def format_event(item):
+    return f"id: {item['id']}\nevent: {item['type']}\ndata: {json.dumps(item['data'])}\n\n"
+
+
+def event_stream(broker, principal, last_id, resync=False, keepalive=15, max_seconds=90, retry_ms=3000):
+    """Yield SSE frames for events after ``last_id`` that ``principal`` may see.
+
+    Ends after ``max_seconds`` so a worker thread is never held forever;
+    EventSource reconnects on its own and resumes from Last-Event-ID.
+    """
+    yield f"retry: {retry_ms}\n\n"
+    if resync:
+        # Events were missed (backlog trimmed or broker restarted); the client should refetch its state
+        yield f"id: {last_id}\nevent: resync\ndata: {{}}\n\n"
+
+    deadline = time.monotonic() + max_seconds
+    skipped = False
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        items = broker.read(last_id, min(keepalive, remaining))
+        if not items:
+            # An id-only frame dispatches nothing but moves the client's Last-Event-ID
+            # past events it was not shown, so a reconnect does not rescan them
+            yield f"id: {last_id}\n\n" if skipped else ": keepalive\n\n"
+            skipped = False
+            continue
+        for item in items:
+            last_id = item['id']
+            if visible_to(item, principal):
+                skipped = False
+                yield format_event(item)
+            else:
+                skipped = True
+
+
+# Claim marking the short-lived tokens that may be passed in the /api/events URL
+STREAM_SCOPE = 'events'
+
+
+class EventStreamTokenResource(Resource):
+    """Issue a short-lived token for ``GET /api/events?jwt=``.
+
+    URLs end up in proxy and access logs, so the long-lived login token is
+    never accepted there; this one expires quickly and only opens streams.
+    """
+
+    @role_required('manager', 'staff', 'vendor')
+    def post(self):
+        expires_in = current_app.config.get('EVENTS_TOKEN_EXPIRES', 60)
+        token = create_access_token(
+            identity=get_jwt_identity(),
+            expires_delta=timedelta(seconds=expires_in),
+            additional_claims={'scope': STREAM_SCOPE}
+        )
+        return {'token': token, 'expires_in': expires_in}, 200
+
+
+class EventStreamResource(Resource):
+    """Server-Sent Events for order and quote status changes the caller can see.
+
+    EventSource cannot send headers, so a stream token from
+    POST /api/events/token may also be passed as ?jwt=.
+    """
+
+    @role_required('manager', 'staff', 'vendor', locations=['headers', 'query_string'])
+    def get(self):
+        if get_jwt_request_location() == 'query_string' and get_jwt().get('scope') != STREAM_SCOPE:
+            return {'message': 'Use a stream token from POST /api/events/token in the URL'}, 401
+        principal = get_current_principal()
+        broker = get_event_broker()
+        config = current_app.config
+
+        last_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+        resync = False
+        if last_id:
+            try:
+                resync = broker.has_gap(last_id)
+            except ValueError:
+                return {'message': 'Invalid Last-Event-ID'}, 400
+        if not last_id or resync:
+            last_id = broker.last_id()
+
+        # The stream never queries, so give the connection back before it starts
+        db.session.close()
+
+        stream = event_stream(
+            broker, principal, last_id, resync=resync,
+            keepalive=config.get('EVENTS_KEEPALIVE_SECONDS', 15),
+            max_seconds=config.get('EVENTS_MAX_STREAM_SECONDS', 90),
+            retry_ms=config.get('EVENTS_RETRY_MS', 3000)
+        )
+        return Response(stream, mimetype='text/event-stream', headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        })
@@ -1,60 +1,127 @@
+from flask import current_app, request
 from flask_restful import Resource, reqparse
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from backend.models.purchase_order import PurchaseOrder
+from backend.models.purchase_order import CLOSED_ORDER_STATUSES, PurchaseOrder
 from backend.models.order_assignment import OrderAssignment
 from backend.models.user import User
+from backend.models.role import Role
 from backend.models.vendor import Vendor
+from backend.models.manager_stat import apply_stat_deltas
+from backend.utils.conditional import collection_conditional, conditional_response, entity_validators
+from backend.utils.decorators import role_required
+from backend.utils.export import add_export_arguments, export_response
+from backend.utils.pagination import add_keyset_arguments, keyset_paginate, wants_keyset
+from backend.utils.principal import get_current_principal
+from backend.services.search_outbox import queue_bulk_index
 from backend import db
 from datetime import datetime
+import heapq
+from sqlalchemy import case, func
+from sqlalchemy.orm import contains_eager, joinedload
+
+def _assignment_to_dict(a):
+    return {
+        'id': a.id,
+        'order_id': a.order_id,
+        'staff_id': a.staff_id,
+        'status': a.status,
+        'assigned_at': a.assigned_at.isoformat() if a.assigned_at else None,
+        'updated_at': a.updated_at.isoformat() if a.updated_at else None,
+        'order': {
+            'order_number': a.order.order_number,
+            'status': a.order.status
+        }
+    }
+
+ORDER_EXPORT_FIELDS = ['id', 'order_number', 'status', 'manager_id', 'vendor_id', 'created_at', 'updated_at']
+
+def _scoped_orders(principal):
+    """Orders ``principal`` may list, or None when there are none to see."""
+    if principal.role == 'manager':
+        return PurchaseOrder.query.filter_by(manager_id=principal.id)
+    if principal.role == 'staff':
+        return PurchaseOrder.query.join(OrderAssignment).filter(
+            OrderAssignment.staff_id == principal.id
+        )
+    if principal.role == 'vendor' and principal.vendor_id:
+        return PurchaseOrder.query.filter_by(vendor_id=principal.vendor_id)
+    return None
+
+def _scoped_assignments(principal):
+    """Assignments ``principal`` may list, or None when there are none to see.
+
+    _assignment_to_dict reads the order, so it is loaded with the rows.
+    """
+    if principal.role == 'manager':
+        return OrderAssignment.query.join(PurchaseOrder).filter(
+            PurchaseOrder.manager_id == principal.id
+        ).options(contains_eager(OrderAssignment.order))
+    if principal.role == 'staff':
+        return OrderAssignment.query.filter_by(staff_id=principal.id).options(joinedload(OrderAssignment.order))
+    return None
 
 class OrderResource(Resource):
-    @jwt_required()
+    read_replica = True
+
+    @role_required('manager', 'staff', 'vendor')
     def get(self, id=None):
-        user = User.query.get(get_jwt_identity())
-        if not user:
-            return {'message': 'User not found'}, 404
+        principal = get_current_principal()
         
         if id:
             order = PurchaseOrder.query.get(id)
             if not order:
                 return {'message': 'Order not found'}, 404
             
-            if user.role.name == 'vendor':
-                vendor = Vendor.query.filter_by(email=user.email).first()
-                if not vendor or order.vendor_id != vendor.id:
+            if principal.role == 'vendor':
+                if not principal.vendor_id or order.vendor_id != principal.vendor_id:
                     return {'message': 'Access denied'}, 403
-            elif user.role.name == 'staff':
-                if not any(assignment.staff_id == user.id for assignment in order.assignments):
+            elif principal.role == 'staff':
+                if not any(assignment.staff_id == principal.id for assignment in order.assignments):
                     return {'message': 'Access denied'}, 403
-            elif user.role.name == 'manager':
-                if order.manager_id != user.id:
+            elif principal.role == 'manager':
+                if order.manager_id != principal.id:
                     return {'message': 'Access denied'}, 403
             
-            return order.to_dict(), 200
+            return conditional_response(entity_validators(order), order.to_dict)
         
         parser = reqparse.RequestParser()
         parser.add_argument('page', type=int, default=1, location='args')
         parser.add_argument('per_page', type=int, default=10, location='args')
         parser.add_argument('status', type=str, location='args')
+        add_keyset_arguments(parser)
         args = parser.parse_args()
 
-        if user.role.name == 'manager':
-            query = PurchaseOrder.query.filter_by(manager_id=user.id)
-        elif user.role.name == 'staff':
-            query = PurchaseOrder.query.join(OrderAssignment).filter(
-                OrderAssignment.staff_id == user.id
-            )
-        elif user.role.name == 'vendor':
-            vendor = Vendor.query.filter_by(email=user.email).first()
-            if not vendor:
-                return {'orders': [], 'total_pages': 0, 'current_page': 1, 'total_orders': 0}, 200
-            query = PurchaseOrder.query.filter_by(vendor_id=vendor.id)
-        else:
+        if principal.role not in ('manager', 'staff', 'vendor'):
             return {'message': 'Invalid role'}, 400
+
+        query = _scoped_orders(principal)
+        if query is None:
+            return {'orders': [], 'total_pages': 0, 'current_page': 1, 'total_orders': 0}, 200
         
         if args['status']:
             query = query.filter_by(status=args['status'])
 
+        headers, not_modified = collection_conditional(query, PurchaseOrder)
+        if not_modified:
+            return '', 304, headers
+
+        if wants_keyset(args):
+            try:
+                page = keyset_paginate(
+                    query, PurchaseOrder.created_at, PurchaseOrder.id,
+                    cursor=args['cursor'], limit=args['limit'], include_total=args['include_total']
+                )
+            except ValueError:
+                return {'message': 'Invalid cursor'}, 400
+
+            response = {
+                'orders': [order.to_dict() for order in page.items],
+                'next_cursor': page.next_cursor,
+                'has_next': page.has_next
+            }
+            if page.total is not None:
+                response['total_orders'] = page.total
+            return response, 200, headers
+
         pagination = query.order_by(PurchaseOrder.created_at.desc()).paginate(
             page=args['page'], 
             per_page=args['per_page'],
@@ -68,13 +135,11 @@ class OrderResource(Resource):
             'total_orders': pagination.total,
             'has_next': pagination.has_next,
             'has_prev': pagination.has_prev
-        }, 200
+        }, 200, headers
 
-    @jwt_required()
+    @role_required('manager', message='Only procurement managers can create orders')
     def post(self):
-        user = User.query.get(get_jwt_identity())
-        if not user or user.role.name != 'manager':
-            return {'message': 'Only procurement managers can create orders'}, 403
+        principal = get_current_principal()
 
         parser = reqparse.RequestParser()
         parser.add_argument('order_number', type=str, required=True, help='Order number is required')
@@ -94,7 +159,7 @@ class OrderResource(Resource):
 
         order = PurchaseOrder(
             order_number=args['order_number'],
-            manager_id=user.id,
+            manager_id=principal.id,
             vendor_id=args['vendor_id'],
             status='pending'
         )
@@ -111,25 +176,22 @@ class OrderResource(Resource):
             db.session.rollback()
             return {'message': f'Failed to create order: {str(e)}'}, 500
 
-    @jwt_required()
+    @role_required('manager', 'staff', 'vendor')
     def patch(self, id):
-        user = User.query.get(get_jwt_identity())
-        if not user:
-            return {'message': 'User not found'}, 404
+        principal = get_current_principal()
 
         order = PurchaseOrder.query.get(id)
         if not order:
             return {'message': 'Order not found'}, 404
 
-        if user.role.name == 'staff':
-            if not any(assignment.staff_id == user.id for assignment in order.assignments):
+        if principal.role == 'staff':
+            if not any(assignment.staff_id == principal.id for assignment in order.assignments):
                 return {'message': 'Not assigned to this order'}, 403
-        elif user.role.name == 'vendor':
-            vendor = Vendor.query.filter_by(email=user.email).first()
-            if not vendor or order.vendor_id != vendor.id:
+        elif principal.role == 'vendor':
+            if not principal.vendor_id or order.vendor_id != principal.vendor_id:
                 return {'message': 'Access denied'}, 403
-        elif user.role.name == 'manager':
-            if order.manager_id != user.id:
+        elif principal.role == 'manager':
+            if order.manager_id != principal.id:
                 return {'message': 'Access denied'}, 403
         else:
             return {'message': 'Unauthorized'}, 403
@@ -156,24 +218,23 @@ class OrderResource(Resource):
             db.session.rollback()
             return {'message': f'Failed to update order: {str(e)}'}, 500
 
-    @jwt_required()
+    @role_required('manager', message='Only procurement managers can delete orders')
     def delete(self, id):
-        user = User.query.get(get_jwt_identity())
-        if not user or user.role.name != 'manager':
-            return {'message': 'Only procurement managers can delete orders'}, 403
+        principal = get_current_principal()
 
         order = PurchaseOrder.query.get(id)
         if not order:
             return {'message': 'Order not found'}, 404
 
-        if order.manager_id != user.id:
+        if order.manager_id != principal.id:
             return {'message': 'Can only delete your own orders'}, 403
 
         if order.status not in ['pending', 'cancelled']:
             return {'message': 'Cannot delete orders that are in progress or completed'}, 400
 
         try:
-            OrderAssignment.query.filter_by(order_id=id).delete()
+            # The assignments cascade with the order; deleting them through the ORM
+            # lets their after_delete listeners record sync tombstones
             db.session.delete(order)
             db.session.commit()
             return {'message': 'Order deleted successfully'}, 200
@@ -182,15 +243,142 @@ class OrderResource(Resource):
             return {'message': f'Failed to delete order: {str(e)}'}, 500
 
 
+class OrderBulkResource(Resource):
+    @role_required('manager', message='Only procurement managers can create orders')
+    def post(self):
+        """Create many orders in one transaction and report a result per item.
+
+        Accepts a JSON array of ``{order_number, vendor_id}`` objects, or
+        ``{"orders": [...]}``. Valid items are created even if others fail.
+        """
+        principal = get_current_principal()
+
+        payload = request.get_json(silent=True)
+        items = payload.get('orders') if isinstance(payload, dict) else payload
+        if not isinstance(items, list) or not items:
+            return {'message': 'Expected a non-empty array of orders'}, 400
+
+        max_items = current_app.config.get('BULK_MAX_ITEMS', 500)
+        if len(items) > max_items:
+            return {'message': f'At most {max_items} orders can be created per request'}, 400
+
+        results = [None] * len(items)
+        seen_numbers = set()
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                results[index] = {'index': index, 'status': 'error', 'message': 'Each order must be an object'}
+                continue
+            order_number = item.get('order_number')
+            vendor_id = item.get('vendor_id')
+            if not isinstance(order_number, str) or not order_number.strip():
+                results[index] = {'index': index, 'status': 'error', 'message': 'Order number is required'}
+            elif not isinstance(vendor_id, int) or isinstance(vendor_id, bool):
+                results[index] = {'index': index, 'status': 'error', 'message': 'Vendor ID is required'}
+            elif order_number in seen_numbers:
+                results[index] = {'index': index, 'status': 'error', 'message': 'Duplicate order number in request'}
+            else:
+                seen_numbers.add(order_number)
+
+        pending = [index for index, result in enumerate(results) if result is None]
+        numbers = [items[index]['order_number'] for index in pending]
+        vendor_ids = {items[index]['vendor_id'] for index in pending}
+
+        existing_numbers = {
+            number for number, in db.session.query(PurchaseOrder.order_number)
+            .filter(PurchaseOrder.order_number.in_(numbers))
+        } if numbers else set()
+        vendors = dict(
+            db.session.query(Vendor.id, Vendor.is_verified).filter(Vendor.id.in_(vendor_ids))
+        ) if vendor_ids else {}
+
+        mappings = []
+        for index in pending:
+            item = items[index]
+            if item['order_number'] in existing_numbers:
+                message = 'Order number already exists'
+            elif item['vendor_id'] not in vendors:
+                message = 'Vendor not found'
+            elif not vendors[item['vendor_id']]:
+                message = 'Cannot create order for unverified vendor'
+            else:
+                mappings.append({
+                    'order_number': item['order_number'],
+                    'manager_id': principal.id,
+                    'vendor_id': item['vendor_id'],
+                    'status': 'pending'
+                })
+                continue
+            results[index] = {'index': index, 'status': 'error', 'message': message}
+
+        if mappings:
+            try:
+                db.session.bulk_insert_mappings(PurchaseOrder, mappings)
+                created = PurchaseOrder.query.filter(
+                    PurchaseOrder.order_number.in_([m['order_number'] for m in mappings])
+                ).all()
+
+                # Bulk inserts skip the mapper events that keep counters and search in sync
+                if current_app.config.get('DASHBOARD_COUNTERS_ENABLED', False):
+                    apply_stat_deltas(db.session.connection(), {
+                        (principal.id, 'orders'): len(created),
+                        (principal.id, 'orders:pending'): len(created)
+                    })
+                queue_bulk_index(created)
+
+                # Serialized before commit expires the loaded rows
+                created_by_number = {order.order_number: order.to_dict() for order in created}
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                return {'message': f'Failed to create orders: {str(e)}'}, 500
+
+            for index in pending:
+                if results[index] is None:
+                    order = created_by_number[items[index]['order_number']]
+                    results[index] = {'index': index, 'status': 'created', 'order': order}
+
+        created_count = len(mappings)
+        if created_count == len(items):
+            status_code = 201
+        elif created_count:
+            status_code = 207
+        else:
+            status_code = 400
+
+        return {
+            'created': created_count,
+            'failed': len(items) - created_count,
+            'results': results
+        }, status_code
+
+class OrderExportResource(Resource):
+    read_replica = True
+
+    @role_required('manager', 'staff', 'vendor')
+    def get(self):
+        principal = get_current_principal()
+
+        parser = reqparse.RequestParser()
+        parser.add_argument('status', type=str, location='args')
+        add_export_arguments(parser)
+        args = parser.parse_args()
+
+        query = _scoped_orders(principal)
+        if query is not None:
+            if args['status']:
+                query = query.filter_by(status=args['status'])
+            query = query.order_by(PurchaseOrder.id)
+
+        return export_response(query, ORDER_EXPORT_FIELDS, args['format'], 'orders')
+
 class OrderVendorResource(Resource):
-    @jwt_required()
+    read_replica = True
+
+    @role_required('vendor', message='Access denied. Vendor role required.')
     def get(self):
-        user = User.query.get(get_jwt_identity())
-        if not user or user.role.name != 'vendor':
-            return {'message': 'Access denied. Vendor role required.'}, 403
+        principal = get_current_principal()
 
-        vendor = Vendor.query.filter_by(email=user.email).first()
-        if not vendor:
+        if not principal.vendor_id:
             return {'message': 'Vendor profile not found'}, 404
 
         parser = reqparse.RequestParser()
@@ -199,11 +387,15 @@ class OrderVendorResource(Resource):
         parser.add_argument('status', type=str, location='args')
         args = parser.parse_args()
 
-        query = PurchaseOrder.query.filter_by(vendor_id=vendor.id)
+        query = PurchaseOrder.query.filter_by(vendor_id=principal.vendor_id)
         
         if args['status']:
             query = query.filter_by(status=args['status'])
 
+        headers, not_modified = collection_conditional(query, PurchaseOrder)
+        if not_modified:
+            return '', 304, headers
+
         pagination = query.order_by(PurchaseOrder.created_at.desc()).paginate(
             page=args['page'], 
             per_page=args['per_page'],
@@ -217,15 +409,15 @@ class OrderVendorResource(Resource):
             'total_orders': pagination.total,
             'has_next': pagination.has_next,
             'has_prev': pagination.has_prev
-        }, 200
+        }, 200, headers
 
 
 class OrderAssignmentResource(Resource):
-    @jwt_required()
+    read_replica = True
+
+    @role_required('manager', message='Only procurement managers can assign orders')
     def post(self):
-        user = User.query.get(get_jwt_identity())
-        if not user or user.role.name != 'manager':
-            return {'message': 'Only procurement managers can assign orders'}, 403
+        principal = get_current_principal()
 
         parser = reqparse.RequestParser()
         parser.add_argument('order_id', type=int, required=True, help='Order ID is required')
@@ -234,7 +426,7 @@ class OrderAssignmentResource(Resource):
         args = parser.parse_args()
 
         order = PurchaseOrder.query.get(args['order_id'])
-        if not order or order.manager_id != user.id:
+        if not order or order.manager_id != principal.id:
             return {'message': 'Order not found or access denied'}, 404
 
         staff = User.query.get(args['staff_id'])
@@ -272,26 +464,38 @@ class OrderAssignmentResource(Resource):
             db.session.rollback()
             return {'message': f'Failed to assign order: {str(e)}'}, 500
         
-    @jwt_required()
+    @role_required('manager', 'staff')
     def get(self):
-        user = User.query.get(get_jwt_identity())
-        if not user:
-            return {'message': 'User not found'}, 404
+        principal = get_current_principal()
 
         parser = reqparse.RequestParser()
         parser.add_argument('page', type=int, default=1, location='args')
         parser.add_argument('per_page', type=int, default=10, location='args')
+        add_keyset_arguments(parser)
         args = parser.parse_args()
 
-        if user.role.name == 'manager':
-            query = OrderAssignment.query.join(PurchaseOrder).filter(
-                PurchaseOrder.manager_id == user.id
-            )
-        elif user.role.name == 'staff':
-            query = OrderAssignment.query.filter_by(staff_id=user.id)
-        else:
+        query = _scoped_assignments(principal)
+        if query is None:
             return {'message': 'Access denied'}, 403
 
+        if wants_keyset(args):
+            try:
+                page = keyset_paginate(
+                    query, OrderAssignment.assigned_at, OrderAssignment.id,
+                    cursor=args['cursor'], limit=args['limit'], include_total=args['include_total']
+                )
+            except ValueError:
+                return {'message': 'Invalid cursor'}, 400
+
+            response = {
+                'assignments': [_assignment_to_dict(a) for a in page.items],
+                'next_cursor': page.next_cursor,
+                'has_next': page.has_next
+            }
+            if page.total is not None:
+                response['total_assignments'] = page.total
+            return response, 200
+
         pagination = query.order_by(OrderAssignment.assigned_at.desc()).paginate(
             page=args['page'], 
             per_page=args['per_page'],
@@ -299,17 +503,7 @@ class OrderAssignmentResource(Resource):
         )
 
         return {
-            'assignments': [{
-                'id': a.id,
-                'order_id': a.order_id,
-                'staff_id': a.staff_id,
-                'status': a.status,
-                'assigned_at': a.assigned_at.isoformat() if a.assigned_at else None,
-                'order': {
-                    'order_number': a.order.order_number,
-                    'status': a.order.status
-                }
-            } for a in pagination.items],
+            'assignments': [_assignment_to_dict(a) for a in pagination.items],
             'total_pages': pagination.pages,
             'current_page': pagination.page,
             'total_assignments': pagination.total,
@@ -317,18 +511,16 @@ class OrderAssignmentResource(Resource):
             'has_prev': pagination.has_prev
         }, 200
 
-    @jwt_required()
+    @role_required('manager', message='Only procurement managers can remove assignments')
     def delete(self, assignment_id):
-        user = User.query.get(get_jwt_identity())
-        if not user or user.role.name != 'manager':
-            return {'message': 'Only procurement managers can remove assignments'}, 403
+        principal = get_current_principal()
 
         assignment = OrderAssignment.query.get(assignment_id)
         if not assignment:
             return {'message': 'Assignment not found'}, 404
 
         order = PurchaseOrder.query.get(assignment.order_id)
-        if not order or order.manager_id != user.id:
+        if not order or order.manager_id != principal.id:
             return {'message': 'Access denied'}, 403
 
         try:
@@ -337,4 +529,131 @@ class OrderAssignmentResource(Resource):
             return {'message': 'Assignment removed successfully'}, 200
         except Exception as e:
             db.session.rollback()
-            return {'message': f'Failed to remove assignment: {str(e)}'}, 500
\ No newline at end of file
+            return {'message': f'Failed to remove assignment: {str(e)}'}, 500
+
+def _id_list(value):
+    if not isinstance(value, list) or not value:
+        return None
+    if not all(isinstance(item, int) and not isinstance(item, bool) for item in value):
+        return None
+    return list(dict.fromkeys(value))
+
+class OrderAssignmentBulkResource(Resource):
+    @role_required('manager', message='Only procurement managers can assign orders')
+    def post(self):
+        """Assign every order in ``order_ids`` to every staff member in ``staff_ids``.
+
+        With ``"balance": true`` each order instead goes to the one listed
+        staff member with the fewest active assignments, counting the ones
+        made earlier in the same request.
+        """
+        principal = get_current_principal()
+
+        payload = request.get_json(silent=True)
+        if not isinstance(payload, dict):
+            return {'message': 'Expected a JSON object with order_ids and staff_ids'}, 400
+        order_ids = _id_list(payload.get('order_ids'))
+        staff_ids = _id_list(payload.get('staff_ids'))
+        if order_ids is None or staff_ids is None:
+            return {'message': 'order_ids and staff_ids must be non-empty arrays of ids'}, 400
+        balance = bool(payload.get('balance'))
+
+        max_items = current_app.config.get('BULK_MAX_ITEMS', 500)
+        pair_count = len(order_ids) if balance else len(order_ids) * len(staff_ids)
+        if pair_count > max_items:
+            return {'message': f'At most {max_items} assignments can be made per request'}, 400
+
+        errors = []
+        owned = dict(
+            db.session.query(PurchaseOrder.id, PurchaseOrder.manager_id).filter(PurchaseOrder.id.in_(order_ids))
+        )
+        valid_orders = [order_id for order_id in order_ids if owned.get(order_id) == principal.id]
+        errors.extend(
+            {'order_id': order_id, 'message': 'Order not found or access denied'}
+            for order_id in order_ids if owned.get(order_id) != principal.id
+        )
+
+        staff_found = {
+            user_id for user_id, in db.session.query(User.id).join(User.role)
+            .filter(User.id.in_(staff_ids), Role.name == 'staff')
+        }
+        valid_staff = [staff_id for staff_id in staff_ids if staff_id in staff_found]
+        errors.extend(
+            {'staff_id': staff_id, 'message': 'Invalid staff member'}
+            for staff_id in staff_ids if staff_id not in staff_found
+        )
+
+        existing = set()
+        if valid_orders and valid_staff:
+            existing = set(db.session.query(OrderAssignment.order_id, OrderAssignment.staff_id).filter(
+                OrderAssignment.order_id.in_(valid_orders),
+                OrderAssignment.staff_id.in_(valid_staff)
+            ))
+
+        skipped = []
+        pairs = []
+        if balance and valid_staff:
+            load = dict.fromkeys(valid_staff, 0)
+            load.update(db.session.query(
+                OrderAssignment.staff_id,
+                func.sum(case((PurchaseOrder.status.notin_(CLOSED_ORDER_STATUSES), 1), else_=0))
+            ).join(PurchaseOrder, OrderAssignment.order_id == PurchaseOrder.id).filter(
+                OrderAssignment.staff_id.in_(valid_staff)
+            ).group_by(OrderAssignment.staff_id))
+
+            # Ties go to the staff member listed first
+            position = {staff_id: i for i, staff_id in enumerate(valid_staff)}
+            heap = [(load[staff_id] or 0, position[staff_id], staff_id) for staff_id in valid_staff]
+            heapq.heapify(heap)
+            for order_id in valid_orders:
+                already = [staff_id for staff_id in valid_staff if (order_id, staff_id) in existing]
+                if already:
+                    skipped.append({'order_id': order_id, 'staff_id': already[0], 'message': 'Order already assigned to this staff member'})
+                    continue
+                current, rank, staff_id = heapq.heappop(heap)
+                pairs.append((order_id, staff_id))
+                heapq.heappush(heap, (current + 1, rank, staff_id))
+        else:
+            for order_id in valid_orders:
+                for staff_id in valid_staff:
+                    if (order_id, staff_id) in existing:
+                        skipped.append({'order_id': order_id, 'staff_id': staff_id, 'message': 'Order already assigned to this staff member'})
+                    else:
+                        pairs.append((order_id, staff_id))
+
+        assigned = []
+        if pairs:
+            try:
+                db.session.bulk_insert_mappings(OrderAssignment, [
+                    {'order_id': order_id, 'staff_id': staff_id, 'status': 'assigned'} for order_id, staff_id in pairs
+                ])
+                wanted = set(pairs)
+                assigned = [
+                    {
+                        'id': assignment.id,
+                        'order_id': assignment.order_id,
+                        'staff_id': assignment.staff_id,
+                        'status': assignment.status,
+                        'assigned_at': assignment.assigned_at.isoformat() if assignment.assigned_at else None
+                    }
+                    for assignment in OrderAssignment.query.filter(
+                        OrderAssignment.order_id.in_({order_id for order_id, _ in pairs}),
+                        OrderAssignment.staff_id.in_({staff_id for _, staff_id in pairs})
+                    ).order_by(OrderAssignment.id)
+                    if (assignment.order_id, assignment.staff_id) in wanted
+                ]
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                return {'message': f'Failed to assign orders: {str(e)}'}, 500
+
+        if assigned:
+            status_code = 207 if errors else 201
+        else:
+            status_code = 400 if errors else 200
+
+        return {
+            'assigned': assigned,
+            'skipped': skipped,
+            'errors': errors
+        }, status_code
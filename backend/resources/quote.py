@@ -1,20 +1,53 @@
+from flask import current_app, request
 from flask_restful import Resource, reqparse
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy.orm import contains_eager, joinedload
 from backend.models.quote import Quote
-from backend.models.user import User
 from backend.models.purchase_order import PurchaseOrder
 from backend.models.vendor import Vendor
 from backend.models.order_assignment import OrderAssignment
+from backend.models.manager_stat import apply_stat_deltas
+from backend.services.events import queue_bulk_status_events
+from backend.services.search_outbox import queue_bulk_index
+from backend.utils.conditional import collection_conditional, conditional_response, entity_validators
+from backend.utils.decorators import role_required
+from backend.utils.export import add_export_arguments, export_response
+from backend.utils.pagination import add_keyset_arguments, keyset_paginate, wants_keyset
+from backend.utils.principal import get_current_principal
 from backend import db
 
+QUOTE_EXPORT_FIELDS = [
+    'id', 'vendor_id', 'order_id', 'price', 'status', 'notes', 'created_at', 'updated_at', 'vendor_name', 'order_status'
+]
+
+def _scoped_quotes(principal):
+    """Quotes ``principal`` may list, or None when there are none to see.
+
+    to_dict reads vendor.name and order.status, so both are joined and
+    loaded with the rows; the list ETag also covers their updated_at.
+    """
+    if principal.role == 'manager':
+        query = Quote.query.join(PurchaseOrder).filter(PurchaseOrder.manager_id == principal.id)
+    elif principal.role == 'vendor' and principal.vendor_id:
+        query = Quote.query.join(PurchaseOrder).filter(Quote.vendor_id == principal.vendor_id)
+    elif principal.role == 'staff':
+        query = Quote.query.join(PurchaseOrder).join(OrderAssignment).filter(
+            OrderAssignment.staff_id == principal.id
+        )
+    else:
+        return None
+
+    return query.join(Vendor, Quote.vendor_id == Vendor.id).options(
+        contains_eager(Quote.order), contains_eager(Quote.vendor)
+    )
+
 class QuoteResource(Resource):
-    @jwt_required()
+    read_replica = True
+
+    @role_required('vendor', message='Only vendors can submit quotes')
     def post(self):
-        user = User.query.get(get_jwt_identity())
-        if not user or user.role.name != 'vendor':
-            return {'message': 'Only vendors can submit quotes'}, 403
+        principal = get_current_principal()
 
-        vendor = Vendor.query.filter_by(email=user.email).first()
+        vendor = Vendor.query.get(principal.vendor_id) if principal.vendor_id else None
         if not vendor:
             return {'message': 'Vendor profile not found'}, 404
         
@@ -62,58 +95,74 @@ class QuoteResource(Resource):
             db.session.rollback()
             return {'message': f'Failed to submit quote: {str(e)}'}, 500
 
-    @jwt_required()
+    @role_required('manager', 'staff', 'vendor')
     def get(self, id=None):
-        user = User.query.get(get_jwt_identity())
-        if not user:
-            return {'message': 'User not found'}, 404
+        principal = get_current_principal()
 
         if id:
-            quote = Quote.query.get(id)
+            quote = Quote.query.options(joinedload(Quote.vendor), joinedload(Quote.order)).get(id)
             if not quote:
                 return {'message': 'Quote not found'}, 404
             
-            if user.role.name == 'vendor':
-                vendor = Vendor.query.filter_by(email=user.email).first()
-                if not vendor or quote.vendor_id != vendor.id:
+            if principal.role == 'vendor':
+                if not principal.vendor_id or quote.vendor_id != principal.vendor_id:
                     return {'message': 'Access denied'}, 403
-            elif user.role.name == 'manager':
-                if quote.order.manager_id != user.id:
+            elif principal.role == 'manager':
+                if quote.order.manager_id != principal.id:
                     return {'message': 'Access denied'}, 403
-            elif user.role.name == 'staff':
-                assigned = any(a.staff_id == user.id for a in quote.order.assignments)
+            elif principal.role == 'staff':
+                assigned = any(a.staff_id == principal.id for a in quote.order.assignments)
                 if not assigned:
                     return {'message': 'Access denied'}, 403
             
-            return quote.to_dict(), 200
+            # to_dict embeds vendor_name and order_status, so changes to those rows count too
+            return conditional_response(entity_validators(quote, quote.vendor, quote.order), quote.to_dict)
 
         parser = reqparse.RequestParser()
         parser.add_argument('page', type=int, default=1, location='args')
         parser.add_argument('per_page', type=int, default=10, location='args')
         parser.add_argument('status', type=str, location='args')
         parser.add_argument('order_id', type=int, location='args')
+        add_keyset_arguments(parser)
         args = parser.parse_args()
 
-        if user.role.name == 'manager':
-            query = Quote.query.join(PurchaseOrder).filter(PurchaseOrder.manager_id == user.id)
-        elif user.role.name == 'vendor':
-            vendor = Vendor.query.filter_by(email=user.email).first()
-            if not vendor:
-                return {'quotes': [], 'total_pages': 0, 'current_page': 1, 'total_quotes': 0}, 200
-            query = Quote.query.filter_by(vendor_id=vendor.id)
-        elif user.role.name == 'staff':
-            query = Quote.query.join(PurchaseOrder).join(OrderAssignment).filter(
-                OrderAssignment.staff_id == user.id
-            )
-        else:
+        if principal.role not in ('manager', 'staff', 'vendor'):
             return {'message': 'Access denied'}, 403
 
+        query = _scoped_quotes(principal)
+        if query is None:
+            return {'quotes': [], 'total_pages': 0, 'current_page': 1, 'total_quotes': 0}, 200
+
         if args['status']:
             query = query.filter(Quote.status == args['status'])
         
         if args['order_id']:
             query = query.filter(Quote.order_id == args['order_id'])
 
+        headers, not_modified = collection_conditional(
+            query, Quote, related=[PurchaseOrder.updated_at, Vendor.updated_at]
+        )
+        if not_modified:
+            return '', 304, headers
+
+        if wants_keyset(args):
+            try:
+                page = keyset_paginate(
+                    query, Quote.created_at, Quote.id,
+                    cursor=args['cursor'], limit=args['limit'], include_total=args['include_total']
+                )
+            except ValueError:
+                return {'message': 'Invalid cursor'}, 400
+
+            response = {
+                'quotes': [quote.to_dict() for quote in page.items],
+                'next_cursor': page.next_cursor,
+                'has_next': page.has_next
+            }
+            if page.total is not None:
+                response['total_quotes'] = page.total
+            return response, 200, headers
+
         pagination = query.order_by(Quote.created_at.desc()).paginate(
             page=args['page'], 
             per_page=args['per_page'],
@@ -127,13 +176,11 @@ class QuoteResource(Resource):
             'total_quotes': pagination.total,
             'has_next': pagination.has_next,
             'has_prev': pagination.has_prev
-        }, 200
+        }, 200, headers
 
-    @jwt_required()
+    @role_required('manager', 'vendor')
     def patch(self, id):
-        user = User.query.get(get_jwt_identity())
-        if not user:
-            return {'message': 'User not found'}, 404
+        principal = get_current_principal()
 
         quote = Quote.query.get(id)
         if not quote:
@@ -145,8 +192,8 @@ class QuoteResource(Resource):
         parser.add_argument('notes', type=str)
         args = parser.parse_args()
 
-        if user.role.name == 'manager':
-            if quote.order.manager_id != user.id:
+        if principal.role == 'manager':
+            if quote.order.manager_id != principal.id:
                 return {'message': 'You can only update quotes for your own orders'}, 403
             
             if args.get('status'):
@@ -160,9 +207,8 @@ class QuoteResource(Resource):
                 if args['status'] == 'accepted' and old_status != 'accepted':
                     quote.order.status = 'ordered'
 
-        elif user.role.name == 'vendor':
-            vendor = Vendor.query.filter_by(email=user.email).first()
-            if not vendor or quote.vendor_id != vendor.id:
+        elif principal.role == 'vendor':
+            if not principal.vendor_id or quote.vendor_id != principal.vendor_id:
                 return {'message': 'You can only update your own quotes'}, 403
             
             if quote.status != 'pending':
@@ -188,25 +234,22 @@ class QuoteResource(Resource):
             db.session.rollback()
             return {'message': f'Failed to update quote: {str(e)}'}, 500
 
-    @jwt_required()
+    @role_required('manager', 'vendor')
     def delete(self, id):
-        user = User.query.get(get_jwt_identity())
-        if not user:
-            return {'message': 'User not found'}, 404
+        principal = get_current_principal()
 
         quote = Quote.query.get(id)
         if not quote:
             return {'message': 'Quote not found'}, 404
 
-        if user.role.name == 'vendor':
-            vendor = Vendor.query.filter_by(email=user.email).first()
-            if not vendor or quote.vendor_id != vendor.id:
+        if principal.role == 'vendor':
+            if not principal.vendor_id or quote.vendor_id != principal.vendor_id:
                 return {'message': 'You can only delete your own quotes'}, 403
             
             if quote.status != 'pending':
                 return {'message': 'Cannot delete quote after it has been reviewed'}, 400
-        elif user.role.name == 'manager':
-            if quote.order.manager_id != user.id:
+        elif principal.role == 'manager':
+            if quote.order.manager_id != principal.id:
                 return {'message': 'Access denied'}, 403
         else:
             return {'message': 'Access denied'}, 403
@@ -217,4 +260,177 @@ class QuoteResource(Resource):
             return {'message': 'Quote deleted successfully'}, 200
         except Exception as e:
             db.session.rollback()
-            return {'message': f'Failed to delete quote: {str(e)}'}, 500
\ No newline at end of file
+            return {'message': f'Failed to delete quote: {str(e)}'}, 500
+
+class QuoteExportResource(Resource):
+    read_replica = True
+
+    @role_required('manager', 'staff', 'vendor')
+    def get(self):
+        principal = get_current_principal()
+
+        parser = reqparse.RequestParser()
+        parser.add_argument('status', type=str, location='args')
+        parser.add_argument('order_id', type=int, location='args')
+        add_export_arguments(parser)
+        args = parser.parse_args()
+
+        query = _scoped_quotes(principal)
+        if query is not None:
+            if args['status']:
+                query = query.filter(Quote.status == args['status'])
+            if args['order_id']:
+                query = query.filter(Quote.order_id == args['order_id'])
+            query = query.order_by(Quote.id)
+
+        return export_response(query, QUOTE_EXPORT_FIELDS, args['format'], 'quotes')
+
+QUOTE_DECISION_STATUSES = ['pending', 'accepted', 'rejected']
+
+class QuoteDecisionResource(Resource):
+    @role_required('manager', message='Only procurement managers can review quotes')
+    def post(self):
+        """Accept or reject many quotes at once.
+
+        Body: ``{"decisions": [{"quote_id": 1, "status": "accepted"}, ...],
+        "reject_competing": false}``. Ownership is checked with one joined
+        query and the changes are applied as set-based UPDATEs in a single
+        transaction. With ``reject_competing`` every other pending quote on
+        an order that gets an accepted quote is rejected as well.
+        """
+        principal = get_current_principal()
+
+        payload = request.get_json(silent=True)
+        decisions = payload.get('decisions') if isinstance(payload, dict) else payload
+        if not isinstance(decisions, list) or not decisions:
+            return {'message': 'Expected a non-empty array of decisions'}, 400
+        reject_competing = bool(payload.get('reject_competing')) if isinstance(payload, dict) else False
+
+        max_items = current_app.config.get('BULK_MAX_ITEMS', 500)
+        if len(decisions) > max_items:
+            return {'message': f'At most {max_items} decisions can be applied per request'}, 400
+
+        results = [None] * len(decisions)
+        seen_ids = set()
+        for index, item in enumerate(decisions):
+            quote_id = item.get('quote_id') if isinstance(item, dict) else None
+            status = item.get('status') if isinstance(item, dict) else None
+            if not isinstance(quote_id, int) or isinstance(quote_id, bool):
+                message = 'Quote ID is required'
+            elif status not in QUOTE_DECISION_STATUSES:
+                message = f'Invalid status. Must be one of: {", ".join(QUOTE_DECISION_STATUSES)}'
+            elif quote_id in seen_ids:
+                message = 'Duplicate quote in request'
+            else:
+                seen_ids.add(quote_id)
+                continue
+            results[index] = {'index': index, 'status': 'error', 'message': message}
+
+        rows = {
+            row.id: row for row in db.session.query(
+                Quote.id, Quote.order_id, Quote.status, PurchaseOrder.manager_id,
+                PurchaseOrder.status.label('order_status')
+            ).join(Quote.order).filter(Quote.id.in_(seen_ids))
+        } if seen_ids else {}
+
+        changes = {}
+        accepted_orders = {}
+        for index, item in enumerate(decisions):
+            if results[index] is not None:
+                continue
+            row = rows.get(item['quote_id'])
+            if row is None:
+                message = 'Quote not found'
+            elif row.manager_id != principal.id:
+                message = 'You can only update quotes for your own orders'
+            elif reject_competing and item['status'] == 'accepted' and row.order_id in accepted_orders:
+                message = 'Another quote for this order is accepted in this request'
+            else:
+                changes[row.id] = item['status']
+                if item['status'] == 'accepted':
+                    accepted_orders[row.order_id] = row.id
+                continue
+            results[index] = {'index': index, 'status': 'error', 'message': message}
+
+        if not changes:
+            return {'updated': 0, 'failed': len(decisions), 'auto_rejected': [], 'results': results}, 400
+
+        # Orders move to 'ordered' when one of their quotes is newly accepted, as in patch
+        ordered_ids = {
+            rows[quote_id].order_id for quote_id, status in changes.items()
+            if status == 'accepted' and rows[quote_id].status != 'accepted'
+        }
+
+        competing = []
+        if reject_competing and accepted_orders:
+            competing = db.session.query(Quote.id, Quote.order_id).filter(
+                Quote.order_id.in_(accepted_orders.keys()),
+                Quote.status == 'pending',
+                Quote.id.notin_(changes.keys())
+            ).all()
+
+        try:
+            by_status = {}
+            for quote_id, status in changes.items():
+                by_status.setdefault(status, []).append(quote_id)
+            for status, quote_ids in by_status.items():
+                Quote.query.filter(Quote.id.in_(quote_ids)).update(
+                    {Quote.status: status}, synchronize_session=False
+                )
+            if competing:
+                Quote.query.filter(Quote.id.in_([quote_id for quote_id, _ in competing])).update(
+                    {Quote.status: 'rejected'}, synchronize_session=False
+                )
+            if ordered_ids:
+                PurchaseOrder.query.filter(PurchaseOrder.id.in_(ordered_ids)).update(
+                    {PurchaseOrder.status: 'ordered'}, synchronize_session=False
+                )
+
+            # Set-based UPDATEs skip the mapper events that keep counters and search in sync
+            if current_app.config.get('DASHBOARD_COUNTERS_ENABLED', False):
+                pending_delta = len(competing) * -1
+                for quote_id, status in changes.items():
+                    pending_delta += (status == 'pending') - (rows[quote_id].status == 'pending')
+                deltas = {(principal.id, 'quotes:pending'): pending_delta}
+                order_statuses = {rows[quote_id].order_id: rows[quote_id].order_status for quote_id in changes}
+                for order_id in ordered_ids:
+                    old_key = (principal.id, f'orders:{order_statuses[order_id]}')
+                    if old_key[1] != 'orders:ordered':
+                        deltas[old_key] = deltas.get(old_key, 0) - 1
+                        deltas[(principal.id, 'orders:ordered')] = deltas.get((principal.id, 'orders:ordered'), 0) + 1
+                apply_stat_deltas(db.session.connection(), deltas)
+
+            changed_ids = list(changes.keys()) + [quote_id for quote_id, _ in competing]
+            quotes = Quote.query.options(joinedload(Quote.vendor), joinedload(Quote.order)).filter(
+                Quote.id.in_(changed_ids)
+            ).populate_existing().all()
+            orders = {quote.order.id: quote.order for quote in quotes if quote.order_id in ordered_ids}
+            queue_bulk_index(quotes + list(orders.values()))
+
+            previous = {(Quote, quote_id): rows[quote_id].status for quote_id in changes}
+            previous.update({(Quote, quote_id): 'pending' for quote_id, _ in competing})
+            previous.update({(PurchaseOrder, rows[quote_id].order_id): rows[quote_id].order_status for quote_id in changes})
+            queue_bulk_status_events(
+                db.session,
+                orders=[order for order in orders.values() if previous[(PurchaseOrder, order.id)] != order.status],
+                quotes=[quote for quote in quotes if previous[(Quote, quote.id)] != quote.status],
+                previous=previous
+            )
+
+            # Serialized before commit expires the loaded rows
+            quote_dicts = {quote.id: quote.to_dict() for quote in quotes}
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            return {'message': f'Failed to update quotes: {str(e)}'}, 500
+
+        for index, item in enumerate(decisions):
+            if results[index] is None:
+                results[index] = {'index': index, 'status': 'updated', 'quote': quote_dicts[item['quote_id']]}
+
+        return {
+            'updated': len(changes),
+            'failed': len(decisions) - len(changes),
+            'auto_rejected': sorted(quote_id for quote_id, _ in competing),
+            'results': results
+        }, 200 if len(changes) == len(decisions) else 207
@@ -1,29 +1,33 @@
-from flask_restful import Resource, reqparse
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask import request
+from flask_restful import Resource, reqparse, inputs
+from flask_jwt_extended import jwt_required
 from backend.models.requirement import Requirement
-from backend.models.user import User
+from backend.utils.principal import get_current_principal
+from backend.services.csv_import import CSVImportError, import_requirements, open_csv_upload
 from backend import db
 
 class RequirementResource(Resource):
+    read_replica = True
+
     @jwt_required()
     def get(self, id=None):
-        user = User.query.get(get_jwt_identity())
-        if not user or user.role.name != 'manager':
+        principal = get_current_principal()
+        if not principal or principal.role != 'manager':
             return {'message': 'Only procurement managers can view requirements'}, 403
 
         if id:
             requirement = Requirement.query.get(id)
-            if not requirement or requirement.manager_id != user.id:
+            if not requirement or requirement.manager_id != principal.id:
                 return {'message': 'Requirement not found or access denied'}, 404
             return requirement.to_dict(), 200
 
-        requirements = Requirement.query.filter_by(manager_id=user.id).all()
+        requirements = Requirement.query.filter_by(manager_id=principal.id).all()
         return {'requirements': [req.to_dict() for req in requirements]}, 200
 
     @jwt_required()
     def post(self):
-        user = User.query.get(get_jwt_identity())
-        if not user or user.role.name != 'manager':
+        principal = get_current_principal()
+        if not principal or principal.role != 'manager':
             return {'message': 'Only procurement managers can create requirements'}, 403
 
         parser = reqparse.RequestParser()
@@ -36,7 +40,7 @@ class RequirementResource(Resource):
             item_name=args['item_name'],
             quantity=args['quantity'],
             specifications=args['specifications'],
-            manager_id=user.id
+            manager_id=principal.id
         )
 
         try:
@@ -49,12 +53,12 @@ class RequirementResource(Resource):
 
     @jwt_required()
     def patch(self, id):
-        user = User.query.get(get_jwt_identity())
-        if not user or user.role.name != 'manager':
+        principal = get_current_principal()
+        if not principal or principal.role != 'manager':
             return {'message': 'Only procurement managers can update requirements'}, 403
 
         requirement = Requirement.query.get(id)
-        if not requirement or requirement.manager_id != user.id:
+        if not requirement or requirement.manager_id != principal.id:
             return {'message': 'Requirement not found or access denied'}, 404
 
         parser = reqparse.RequestParser()
@@ -79,12 +83,12 @@ class RequirementResource(Resource):
 
     @jwt_required()
     def delete(self, id):
-        user = User.query.get(get_jwt_identity())
-        if not user or user.role.name != 'manager':
+        principal = get_current_principal()
+        if not principal or principal.role != 'manager':
             return {'message': 'Only procurement managers can delete requirements'}, 403
 
         requirement = Requirement.query.get(id)
-        if not requirement or requirement.manager_id != user.id:
+        if not requirement or requirement.manager_id != principal.id:
             return {'message': 'Requirement not found or access denied'}, 404
 
         try:
@@ -94,3 +98,21 @@ class RequirementResource(Resource):
         except Exception as e:
             db.session.rollback()
             return {'message': f'Failed to delete requirement: {str(e)}'}, 500
+
+class RequirementImportResource(Resource):
+    @jwt_required()
+    def post(self):
+        principal = get_current_principal()
+        if not principal or principal.role != 'manager':
+            return {'message': 'Only procurement managers can import requirements'}, 403
+
+        parser = reqparse.RequestParser()
+        parser.add_argument('dry_run', type=inputs.boolean, default=False, location='args')
+        args = parser.parse_args()
+
+        try:
+            report = import_requirements(open_csv_upload(request), principal.id, dry_run=args['dry_run'])
+        except (CSVImportError, UnicodeDecodeError) as e:
+            return {'message': f'Invalid CSV file: {str(e)}'}, 400
+
+        return report.to_dict(), 200
@@ -1,14 +1,16 @@
 from flask_restful import Resource
 from backend.models.role import Role
+from backend.utils.response_cache import cached_response
 
 class RoleResource(Resource):
+    read_replica = True
+
     def get(self):
         try:
-            roles = Role.query.all()
-            return {
+            return cached_response('roles', 'all', lambda: {
                 'roles': [
-                    {'id': role.id, 'name': role.name} for role in roles
+                    {'id': role.id, 'name': role.name} for role in Role.query.all()
                 ]
-            }, 200
+            })
         except Exception as e:
             return {'message': f'Error fetching roles: {str(e)}'}, 500
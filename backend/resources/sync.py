@@ -0,0 +1,209 @@
+import base64
+import json
+from datetime import datetime, timedelta
+from flask import current_app
+from flask_restful import Resource, reqparse
+from sqlalchemy import and_, cast, func, or_, select
+from sqlalchemy.orm import aliased
+from backend.models.purchase_order import PurchaseOrder
+from backend.models.quote import Quote
+from backend.models.document import Document
+from backend.models.order_assignment import OrderAssignment
+from backend.models.sync_tombstone import SyncTombstone
+from backend.resources.document import _scoped_documents
+from backend.resources.order import _assignment_to_dict, _scoped_assignments, _scoped_orders
+from backend.resources.quote import _scoped_quotes
+from backend.utils.decorators import role_required
+from backend.utils.pagination import comparable_timestamp
+from backend.utils.principal import get_current_principal
+from backend import db
+
+SYNC_MAX_LIMIT = 1000
+
+# Tombstone object_type -> key of the matching list in the response
+TOMBSTONE_KEYS = {'order': 'orders', 'quote': 'quotes', 'document': 'documents', 'assignment': 'assignments'}
+SYNC_STREAMS = ('orders', 'quotes', 'documents', 'assignments', 'deleted')
+
+
+def encode_sync_token(cursors):
+    """Encode ``{stream: (cursor, seen)}``; both are ``(timestamp, id)`` pairs and ``seen`` may be None."""
+    payload = {}
+    for stream, (cursor, seen) in cursors.items():
+        payload[stream] = [cursor[0].isoformat(), cursor[1]]
+        if seen is not None:
+            payload[stream] += [seen[0].isoformat(), seen[1]]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+
+
+def decode_sync_token(token):
+    """Return ``{stream: (cursor, seen)}`` from an opaque sync token; raises ValueError."""
+    def pair(values):
+        return datetime.fromisoformat(values[0]), int(values[1])
+
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return {
+            stream: (pair(payload[stream][:2]), pair(payload[stream][2:4]) if len(payload[stream]) > 2 else None)
+            for stream in SYNC_STREAMS
+        }
+    except (TypeError, ValueError, KeyError, IndexError, json.JSONDecodeError):
+        raise ValueError('Invalid sync token')
+
+
+def _database_now():
+    # updated_at and deleted_at are filled by the database clock, so the cursors are compared against it too
+    now = func.now()
+    if db.session.get_bind().dialect.name == 'postgresql':
+        now = cast(now, db.DateTime)
+    return db.session.query(now).scalar()
+
+
+def _changes_since(query, sort_column, id_column, cursor, limit):
+    """Up to ``limit + 1`` rows after ``cursor``, oldest change first."""
+    query = query.filter(sort_column.isnot(None))
+    sort_key = comparable_timestamp(query, sort_column)
+    if cursor is not None:
+        sort_value, last_id = cursor
+        sort_value = comparable_timestamp(query, sort_value)
+        query = query.filter(or_(
+            sort_key > sort_value,
+            and_(sort_key == sort_value, id_column > last_id)
+        ))
+    return query.order_by(sort_key, id_column).limit(limit + 1).all()
+
+
+def _next_cursor(rows, sort_attr, cursor, seen, limit, horizon):
+    """``(cursor, seen, has_more)`` to resume from after ``rows``; trims ``rows`` to ``limit``.
+
+    ``seen`` is the furthest row already sent. Pages that only re-read rows
+    up to it, inside the overlap window, do not count as more to fetch.
+    """
+    truncated = len(rows) > limit
+    del rows[limit:]
+    if rows:
+        cursor = (getattr(rows[-1], sort_attr), rows[-1].id)
+        has_more = truncated and (seen is None or cursor > seen)
+        seen = cursor if seen is None else max(seen, cursor)
+        if truncated:
+            return cursor, seen, has_more
+    # Once caught up, never resume later than the overlap window: a transaction that
+    # stamped its rows before this request but committed after it is still picked up
+    if cursor is None or cursor[0] > horizon:
+        cursor = (horizon, 0)
+    return cursor, seen, False
+
+
+def _scoped_tombstones(principal):
+    """Tombstones of rows ``principal`` could see, or None when there are none to see."""
+    query = SyncTombstone.query
+    if principal.role == 'manager':
+        return query.filter(SyncTombstone.manager_id == principal.id)
+    if principal.role == 'vendor' and principal.vendor_id:
+        return query.filter(
+            SyncTombstone.vendor_id == principal.vendor_id,
+            SyncTombstone.object_type != 'assignment'
+        )
+    if principal.role == 'staff':
+        # Orders deleted with their assignments are only reachable through the assignment tombstones
+        removed = aliased(SyncTombstone)
+        assigned_orders = select(OrderAssignment.order_id).where(OrderAssignment.staff_id == principal.id)
+        removed_orders = select(removed.order_id).where(removed.object_type == 'assignment', removed.staff_id == principal.id)
+        return query.filter(or_(
+            SyncTombstone.staff_id == principal.id,
+            and_(
+                SyncTombstone.object_type != 'assignment',
+                or_(SyncTombstone.order_id.in_(assigned_orders), SyncTombstone.order_id.in_(removed_orders))
+            )
+        ))
+    return None
+
+
+def _add_newly_assigned(response, sources, order_ids):
+    """Add the orders behind new staff assignments, with their quotes and documents.
+
+    Those rows became visible without changing themselves, so their own
+    updated_at may be older than the cursor and the streams would skip them.
+    """
+    if not order_ids:
+        return
+    for stream, column in (('orders', PurchaseOrder.id), ('quotes', Quote.order_id), ('documents', Document.order_id)):
+        query, _model, serialize = sources[stream]
+        sent = {item['id'] for item in response[stream]}
+        response[stream].extend(serialize(row) for row in query.filter(column.in_(order_ids)) if row.id not in sent)
+
+
+class SyncResource(Resource):
+    """Changes to the orders, quotes, documents and assignments the caller can see.
+
+    Stays on the primary: a replica lagging behind the watermark would make
+    the client skip changes rather than just see them late.
+    """
+
+    @role_required('manager', 'staff', 'vendor')
+    def get(self):
+        principal = get_current_principal()
+
+        parser = reqparse.RequestParser()
+        parser.add_argument('since', type=str, location='args')
+        parser.add_argument('limit', type=int, location='args')
+        args = parser.parse_args()
+
+        config = current_app.config
+        limit = max(1, min(args['limit'] or config.get('SYNC_PAGE_SIZE', 500), SYNC_MAX_LIMIT))
+
+        now = _database_now()
+        horizon = now - timedelta(seconds=config.get('SYNC_OVERLAP_SECONDS', 5))
+
+        if args['since']:
+            try:
+                cursors = decode_sync_token(args['since'])
+            except ValueError:
+                return {'message': 'Invalid sync token'}, 400
+            retention = timedelta(days=config.get('SYNC_TOMBSTONE_RETENTION_DAYS', 30))
+            if cursors['deleted'][0][0] < now - retention:
+                return {'message': 'Sync token has expired, start again without since'}, 410
+        else:
+            # A full sync sends every visible row; only deletes racing with it matter
+            cursors = {stream: (None, None) for stream in SYNC_STREAMS}
+            cursors['deleted'] = ((horizon, 0), None)
+
+        sources = {
+            'orders': (_scoped_orders(principal), PurchaseOrder, lambda o: o.to_dict()),
+            'quotes': (_scoped_quotes(principal), Quote, lambda q: q.to_dict()),
+            'documents': (_scoped_documents(principal), Document, lambda d: d.to_dict()),
+            'assignments': (_scoped_assignments(principal), OrderAssignment, _assignment_to_dict),
+        }
+
+        response = {}
+        next_cursors = {}
+        has_more = False
+        for stream, (query, model, serialize) in sources.items():
+            cursor, seen = cursors[stream]
+            rows = []
+            if query is not None:
+                rows = _changes_since(query, model.updated_at, model.id, cursor, limit)
+            cursor, seen, more = _next_cursor(rows, 'updated_at', cursor, seen, limit, horizon)
+            next_cursors[stream] = (cursor, seen)
+            has_more = has_more or more
+            response[stream] = [serialize(row) for row in rows]
+
+            if stream == 'assignments' and principal.role == 'staff' and args['since']:
+                _add_newly_assigned(response, sources, {assignment.order_id for assignment in rows})
+
+        deleted = {key: [] for key in TOMBSTONE_KEYS.values()}
+        cursor, seen = cursors['deleted']
+        tombstones = []
+        query = _scoped_tombstones(principal)
+        if query is not None:
+            tombstones = _changes_since(query, SyncTombstone.deleted_at, SyncTombstone.id, cursor, limit)
+        cursor, seen, more = _next_cursor(tombstones, 'deleted_at', cursor, seen, limit, horizon)
+        next_cursors['deleted'] = (cursor, seen)
+        has_more = has_more or more
+        for tombstone in tombstones:
+            deleted[TOMBSTONE_KEYS[tombstone.object_type]].append(tombstone.object_id)
+
+        response['deleted'] = deleted
+        response['next_token'] = encode_sync_token(next_cursors)
+        response['has_more'] = has_more
+        return response, 200
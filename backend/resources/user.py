@@ -1,15 +1,18 @@
 from flask_restful import Resource, reqparse
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 from werkzeug.security import generate_password_hash
 from backend.models.user import User
 from backend.models.role import Role
+from backend.utils.principal import get_current_principal
 from backend import db
 
 class UserResource(Resource):
+    read_replica = True
+
     @jwt_required()
     def get(self, id=None):
-        current_user = User.query.get(get_jwt_identity())
-        if not current_user or current_user.role.name != 'manager':
+        principal = get_current_principal()
+        if not principal or principal.role != 'manager':
             return {'message': 'Unauthorized'}, 403
 
         if id:
@@ -23,8 +26,8 @@ class UserResource(Resource):
 
     @jwt_required()
     def post(self):
-        current_user = User.query.get(get_jwt_identity())
-        if not current_user or current_user.role.name != 'manager':
+        principal = get_current_principal()
+        if not principal or principal.role != 'manager':
             return {'message': 'Unauthorized'}, 403
 
         parser = reqparse.RequestParser()
@@ -57,8 +60,8 @@ class UserResource(Resource):
 
     @jwt_required()
     def patch(self, id):
-        current_user = User.query.get(get_jwt_identity())
-        if not current_user or current_user.role.name != 'manager':
+        principal = get_current_principal()
+        if not principal or principal.role != 'manager':
             return {'message': 'Unauthorized'}, 403
 
         user_to_update = User.query.get(id)
@@ -95,8 +98,8 @@ class UserResource(Resource):
 
     @jwt_required()
     def delete(self, id):
-        current_user = User.query.get(get_jwt_identity())
-        if not current_user or current_user.role.name != 'manager':
+        principal = get_current_principal()
+        if not principal or principal.role != 'manager':
             return {'message': 'Unauthorized'}, 403
 
         user_to_delete = User.query.get(id)
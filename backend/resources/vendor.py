@@ -1,14 +1,20 @@
-from flask_restful import Resource, reqparse
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask import request
+from flask_restful import Resource, reqparse, inputs
+from flask_jwt_extended import jwt_required
 from backend.models.vendor import Vendor
-from backend.models.user import User
+from backend.utils.conditional import conditional_response, entity_validators
+from backend.utils.principal import get_current_principal
+from backend.utils.response_cache import cached_response
+from backend.services.csv_import import CSVImportError, import_vendors, open_csv_upload
 from backend import db
 
 class VendorResource(Resource):
+    read_replica = True
+
     @jwt_required()
     def get(self, id=None):
-        user = User.query.get(get_jwt_identity())
-        if not user:
+        principal = get_current_principal()
+        if not principal:
             return {'message': 'User not found'}, 404
 
         if id:
@@ -16,41 +22,44 @@ class VendorResource(Resource):
             if not vendor:
                 return {'message': 'Vendor not found'}, 404
             
-            if user.role.name == 'vendor':
-                vendor_user = Vendor.query.filter_by(email=user.email).first()
-                if not vendor_user or vendor_user.id != id:
+            if principal.role == 'vendor':
+                if principal.vendor_id != id:
                     return {'message': 'Access denied'}, 403
             
-            return vendor.to_dict(), 200
+            return conditional_response(entity_validators(vendor), vendor.to_dict)
 
         parser = reqparse.RequestParser()
         parser.add_argument('verified', type=lambda x: x.lower() == 'true', location='args')
         parser.add_argument('category_id', type=int, location='args')
         args = parser.parse_args()
 
-        if user.role.name != 'manager':
-            if user.role.name == 'vendor':
-                vendor = Vendor.query.filter_by(email=user.email).first()
+        if principal.role != 'manager':
+            if principal.role == 'vendor':
+                vendor = Vendor.query.get(principal.vendor_id) if principal.vendor_id else None
                 if vendor:
                     return {'vendors': [vendor.to_dict()]}, 200
                 return {'vendors': []}, 200
             return {'message': 'Access denied'}, 403
 
-        query = Vendor.query
-        
-        if args['verified'] is not None:
-            query = query.filter_by(is_verified=args['verified'])
-        
-        if args['category_id']:
-            query = query.filter_by(category_id=args['category_id'])
-        
-        vendors = query.order_by(Vendor.created_at.desc()).all()
-        return {'vendors': [vendor.to_dict() for vendor in vendors]}, 200
+        def build():
+            query = Vendor.query
+            
+            if args['verified'] is not None:
+                query = query.filter_by(is_verified=args['verified'])
+            
+            if args['category_id']:
+                query = query.filter_by(category_id=args['category_id'])
+            
+            vendors = query.order_by(Vendor.created_at.desc()).all()
+            return {'vendors': [vendor.to_dict() for vendor in vendors]}
+
+        # Managers all see the same list, so it is cached per filter combination
+        return cached_response('vendors', f"verified={args['verified']}&category_id={args['category_id']}", build)
 
     @jwt_required()
     def post(self):
-        user = User.query.get(get_jwt_identity())
-        if not user or user.role.name != 'manager':
+        principal = get_current_principal()
+        if not principal or principal.role != 'manager':
             return {'message': 'Only procurement managers can create vendors'}, 403
 
         parser = reqparse.RequestParser()
@@ -89,19 +98,18 @@ class VendorResource(Resource):
 
     @jwt_required()
     def patch(self, id):
-        user = User.query.get(get_jwt_identity())
-        if not user:
+        principal = get_current_principal()
+        if not principal:
             return {'message': 'User not found'}, 404
 
         vendor = Vendor.query.get(id)
         if not vendor:
             return {'message': 'Vendor not found'}, 404
 
-        if user.role.name == 'vendor':
-            vendor_user = Vendor.query.filter_by(email=user.email).first()
-            if not vendor_user or vendor_user.id != id:
+        if principal.role == 'vendor':
+            if principal.vendor_id != id:
                 return {'message': 'Access denied'}, 403
-        elif user.role.name != 'manager':
+        elif principal.role != 'manager':
             return {'message': 'Only managers and vendors can update vendor profiles'}, 403
 
         parser = reqparse.RequestParser()
@@ -115,7 +123,7 @@ class VendorResource(Resource):
         parser.add_argument('is_verified', type=bool)
         args = parser.parse_args()
 
-        if args.get('is_verified') is not None and user.role.name != 'manager':
+        if args.get('is_verified') is not None and principal.role != 'manager':
             return {'message': 'Only managers can verify vendors'}, 403
 
         if args['name']:
@@ -134,7 +142,7 @@ class VendorResource(Resource):
             vendor.contact_person = args['contact_person']
         if args['category_id']:
             vendor.category_id = args['category_id']
-        if args.get('is_verified') is not None and user.role.name == 'manager':
+        if args.get('is_verified') is not None and principal.role == 'manager':
             vendor.is_verified = args['is_verified']
 
         try:
@@ -146,8 +154,8 @@ class VendorResource(Resource):
 
     @jwt_required()
     def delete(self, id):
-        user = User.query.get(get_jwt_identity())
-        if not user or user.role.name != 'manager':
+        principal = get_current_principal()
+        if not principal or principal.role != 'manager':
             return {'message': 'Only procurement managers can delete vendors'}, 403
 
         vendor = Vendor.query.get(id)
@@ -160,4 +168,22 @@ class VendorResource(Resource):
             return {'message': 'Vendor deleted successfully'}, 200
         except Exception as e:
             db.session.rollback()
-            return {'message': f'Failed to delete vendor: {str(e)}'}, 500
\ No newline at end of file
+            return {'message': f'Failed to delete vendor: {str(e)}'}, 500
+
+class VendorImportResource(Resource):
+    @jwt_required()
+    def post(self):
+        principal = get_current_principal()
+        if not principal or principal.role != 'manager':
+            return {'message': 'Only procurement managers can import vendors'}, 403
+
+        parser = reqparse.RequestParser()
+        parser.add_argument('dry_run', type=inputs.boolean, default=False, location='args')
+        args = parser.parse_args()
+
+        try:
+            report = import_vendors(open_csv_upload(request), dry_run=args['dry_run'])
+        except (CSVImportError, UnicodeDecodeError) as e:
+            return {'message': f'Invalid CSV file: {str(e)}'}, 400
+
+        return report.to_dict(), 200
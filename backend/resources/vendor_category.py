@@ -1,10 +1,13 @@
 from flask_restful import Resource, reqparse
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 from backend.models.vendor_category import VendorCategory
-from backend.models.user import User
+from backend.utils.principal import get_current_principal
+from backend.utils.response_cache import cached_response
 from backend import db
 
 class VendorCategoryResource(Resource):
+    read_replica = True
+
     @jwt_required()
     def get(self, id=None):
         if id:
@@ -13,13 +16,14 @@ class VendorCategoryResource(Resource):
                 return {'message': 'Category not found'}, 404
             return category.to_dict(), 200
 
-        categories = VendorCategory.query.all()
-        return {'categories': [cat.to_dict() for cat in categories]}, 200
+        return cached_response('vendor_categories', 'all', lambda: {
+            'categories': [cat.to_dict() for cat in VendorCategory.query.all()]
+        })
 
     @jwt_required()
     def post(self):
-        user = User.query.get(get_jwt_identity())
-        if not user or user.role.name != 'manager':
+        principal = get_current_principal()
+        if not principal or principal.role != 'manager':
             return {'message': 'Only procurement managers can create categories'}, 403
 
         parser = reqparse.RequestParser()
@@ -41,8 +45,8 @@ class VendorCategoryResource(Resource):
 
     @jwt_required()
     def patch(self, id):
-        user = User.query.get(get_jwt_identity())
-        if not user or user.role.name != 'manager':
+        principal = get_current_principal()
+        if not principal or principal.role != 'manager':
             return {'message': 'Only procurement managers can update categories'}, 403
 
         category = VendorCategory.query.get(id)
@@ -67,8 +71,8 @@ class VendorCategoryResource(Resource):
 
     @jwt_required()
     def delete(self, id):
-        user = User.query.get(get_jwt_identity())
-        if not user or user.role.name != 'manager':
+        principal = get_current_principal()
+        if not principal or principal.role != 'manager':
             return {'message': 'Only procurement managers can delete categories'}, 403
 
         category = VendorCategory.query.get(id)
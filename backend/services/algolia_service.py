@@ -16,4 +16,40 @@ class AlgoliaService:
         self.index.partial_update_object(record).wait()
 
     def delete_record(self, object_id):
-                    self.index.delete_object(object_id).wait()
+        self.index.delete_object(object_id).wait()
+
+    def save_objects(self, records):
+        self.index.save_objects(records).wait()
+
+    def delete_objects(self, object_ids):
+        self.index.delete_objects(object_ids).wait()
+
+
+class InMemorySearchIndex:
+    """Stand-in for AlgoliaService that keeps records in a dict.
+
+    Used by the outbox worker when Algolia is not configured and in local
+    testing; ``fail_next`` makes the next N calls raise to exercise retries.
+    """
+
+    def __init__(self):
+        self.records = {}
+        self.calls = []
+        self.fail_next = 0
+
+    def _maybe_fail(self):
+        if self.fail_next:
+            self.fail_next -= 1
+            raise RuntimeError('Simulated index failure')
+
+    def save_objects(self, records):
+        self._maybe_fail()
+        self.calls.append(('save_objects', len(records)))
+        for record in records:
+            self.records[record['objectID']] = record
+
+    def delete_objects(self, object_ids):
+        self._maybe_fail()
+        self.calls.append(('delete_objects', len(object_ids)))
+        for object_id in object_ids:
+            self.records.pop(object_id, None)
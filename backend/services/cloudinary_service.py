@@ -1,7 +1,10 @@
+import logging
 import cloudinary
 import cloudinary.uploader
 from flask import current_app
 
+logger = logging.getLogger(__name__)
+
 class CloudinaryService:
     def __init__(self):
         cloudinary.config(
@@ -19,5 +22,5 @@ class CloudinaryService:
             response = cloudinary.uploader.upload(file_path, **options)
             return response['secure_url']
         except Exception as e:
-            print(f"Error uploading to Cloudinary: {e}")
+            logger.exception("Error uploading %s to Cloudinary", file_path)
             return None
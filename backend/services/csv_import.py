@@ -0,0 +1,234 @@
+import csv
+import io
+from flask import current_app
+from backend import db
+from backend.models.manager_stat import apply_stat_deltas
+from backend.models.requirement import Requirement
+from backend.models.user import User
+from backend.models.vendor import Vendor
+from backend.models.vendor_category import VendorCategory
+from backend.services.search_outbox import bulk_index_enabled, queue_bulk_index
+from backend.utils.principal import bump_token_versions, principal_cache
+from backend.utils.response_cache import queue_invalidation
+
+TRUE_VALUES = {'1', 'true', 'yes', 'y'}
+FALSE_VALUES = {'', '0', 'false', 'no', 'n'}
+
+
+class CSVImportError(Exception):
+    """The file as a whole cannot be imported (e.g. missing columns)."""
+
+
+class ImportReport:
+    def __init__(self, dry_run, max_errors):
+        self.dry_run = dry_run
+        self.max_errors = max_errors
+        self.rows = 0
+        self.imported = 0
+        self.failed = 0
+        self.errors = []
+
+    def error(self, row_number, message):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({'row': row_number, 'message': message})
+
+    def to_dict(self):
+        return {
+            'dry_run': self.dry_run,
+            'rows': self.rows,
+            'imported': self.imported,
+            'failed': self.failed,
+            'errors': sorted(self.errors, key=lambda error: error['row']),
+            'errors_truncated': self.failed > len(self.errors)
+        }
+
+
+def open_csv_upload(request):
+    """Text stream over an uploaded ``file`` field, or the raw request body."""
+    upload = request.files.get('file')
+    stream = upload.stream if upload else request.stream
+    return io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+
+
+def _clean(value):
+    value = (value or '').strip()
+    return value or None
+
+
+def _chunks(reader, required, chunk_size):
+    missing = [column for column in required if column not in (reader.fieldnames or [])]
+    if missing:
+        raise CSVImportError(f'Missing required columns: {", ".join(missing)}')
+
+    chunk = []
+    # Row 1 is the header
+    for row_number, row in enumerate(reader, start=2):
+        chunk.append((row_number, row))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _run(lines, required, chunk_size, dry_run, validate_chunk, insert_chunk, accepted=None):
+    """Validate and insert ``lines`` chunk by chunk.
+
+    ``accepted(mappings)``, if given, is called for each chunk that was
+    committed (or would have been, on a dry run), never for one that failed.
+    """
+    chunk_size = chunk_size or current_app.config.get('IMPORT_CHUNK_SIZE', 1000)
+    report = ImportReport(dry_run, current_app.config.get('IMPORT_MAX_ERRORS', 1000))
+
+    for chunk in _chunks(csv.DictReader(lines), required, chunk_size):
+        report.rows += len(chunk)
+        mappings = validate_chunk(chunk, report)
+        if not mappings:
+            continue
+        if not dry_run:
+            try:
+                insert_chunk(mappings)
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                for mapping in mappings:
+                    report.error(mapping['_row'], f'Failed to import row: {str(e)}')
+                continue
+        report.imported += len(mappings)
+        if accepted:
+            accepted(mappings)
+
+    return report
+
+
+def import_vendors(lines, dry_run=False, chunk_size=None):
+    """Import vendors from CSV ``lines`` in batched transactions.
+
+    Columns: name, email (required), phone, address, company_name,
+    contact_person, category_id, is_verified. Emails must be unique across
+    the file and the table; each chunk is checked with one IN query.
+    """
+    category_ids = {category_id for category_id, in db.session.query(VendorCategory.id)}
+    seen_emails = set()
+
+    def validate_chunk(chunk, report):
+        candidates = []
+        chunk_emails = set()
+        for row_number, row in chunk:
+            name, email = _clean(row.get('name')), _clean(row.get('email'))
+            if not name:
+                report.error(row_number, 'Vendor name is required')
+                continue
+            if not email:
+                report.error(row_number, 'Vendor email is required')
+                continue
+            if email in seen_emails or email in chunk_emails:
+                report.error(row_number, 'Duplicate email in file')
+                continue
+
+            category_id = _clean(row.get('category_id'))
+            if category_id is not None:
+                if not category_id.isdigit() or int(category_id) not in category_ids:
+                    report.error(row_number, f'Unknown category_id {category_id}')
+                    continue
+                category_id = int(category_id)
+
+            is_verified = (row.get('is_verified') or '').strip().lower()
+            if is_verified not in TRUE_VALUES | FALSE_VALUES:
+                report.error(row_number, f'Invalid is_verified value {row.get("is_verified")}')
+                continue
+
+            chunk_emails.add(email)
+            candidates.append({
+                '_row': row_number,
+                'name': name,
+                'email': email,
+                'phone': _clean(row.get('phone')),
+                'address': _clean(row.get('address')),
+                'company_name': _clean(row.get('company_name')),
+                'contact_person': _clean(row.get('contact_person')),
+                'category_id': category_id,
+                'is_verified': is_verified in TRUE_VALUES
+            })
+
+        existing = {
+            email for email, in db.session.query(Vendor.email)
+            .filter(Vendor.email.in_([c['email'] for c in candidates]))
+        } if candidates else set()
+
+        mappings = []
+        for candidate in candidates:
+            if candidate['email'] in existing:
+                report.error(candidate['_row'], 'Vendor with this email already exists')
+            else:
+                mappings.append(candidate)
+        return mappings
+
+    def insert_chunk(mappings):
+        emails = [m['email'] for m in mappings]
+        db.session.bulk_insert_mappings(Vendor, [
+            {key: value for key, value in m.items() if key != '_row'} for m in mappings
+        ])
+
+        # Bulk inserts skip the Vendor listeners, so do their work per chunk
+        if bulk_index_enabled():
+            queue_bulk_index(Vendor.query.filter(Vendor.email.in_(emails)).all())
+        user_ids = [user_id for user_id, in db.session.query(User.id).filter(User.email.in_(emails))]
+        for user_id in user_ids:
+            principal_cache.invalidate(user_id)
+        if user_ids:
+            bump_token_versions(db.session.connection(), User.id.in_(user_ids))
+        queue_invalidation(db.session, 'vendors')
+
+    # Only emails from committed chunks count as taken; a failed chunk's rows may reappear later in the file
+    def accepted(mappings):
+        seen_emails.update(m['email'] for m in mappings)
+
+    return _run(lines, ['name', 'email'], chunk_size, dry_run, validate_chunk, insert_chunk, accepted)
+
+
+def import_requirements(lines, manager_id, dry_run=False, chunk_size=None):
+    """Import requirements owned by ``manager_id`` from CSV ``lines``.
+
+    Columns: item_name, quantity (required), specifications.
+    """
+    def validate_chunk(chunk, report):
+        mappings = []
+        for row_number, row in chunk:
+            item_name = _clean(row.get('item_name'))
+            quantity = _clean(row.get('quantity'))
+            if not item_name:
+                report.error(row_number, 'Item name is required')
+            elif quantity is None:
+                report.error(row_number, 'Quantity is required')
+            elif not quantity.isdigit() or int(quantity) <= 0:
+                report.error(row_number, f'Quantity must be a positive integer, got {quantity}')
+            else:
+                mappings.append({
+                    '_row': row_number,
+                    'item_name': item_name,
+                    'quantity': int(quantity),
+                    'specifications': _clean(row.get('specifications')),
+                    'manager_id': manager_id
+                })
+        return mappings
+
+    def insert_chunk(mappings):
+        index = bulk_index_enabled()
+        if index:
+            # Requirements have no natural key, so the new rows are found by id above the previous maximum
+            previous_max = db.session.query(db.func.max(Requirement.id)).scalar() or 0
+        db.session.bulk_insert_mappings(Requirement, [
+            {key: value for key, value in m.items() if key != '_row'} for m in mappings
+        ])
+
+        # Bulk inserts skip the Requirement listeners, so do their work per chunk
+        if current_app.config.get('DASHBOARD_COUNTERS_ENABLED', False):
+            apply_stat_deltas(db.session.connection(), {(manager_id, 'requirements'): len(mappings)})
+        if index:
+            queue_bulk_index(Requirement.query.filter(
+                Requirement.manager_id == manager_id, Requirement.id > previous_max
+            ).all())
+
+    return _run(lines, ['item_name', 'quantity'], chunk_size, dry_run, validate_chunk, insert_chunk)
@@ -0,0 +1,265 @@
+import json
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from flask import current_app, g, has_app_context, has_request_context, render_template
+from sqlalchemy import and_, event, or_, select
+from sqlalchemy.orm import Session
+
+from backend import db
+from backend.models.email_job import EmailJob, enqueue_emails
+from backend.models.user import User
+from backend.models.vendor import Vendor
+from backend.services.events import ORDER_STATUS_CHANGED, QUOTE_STATUS_CHANGED
+
+# Template name -> subject; the body is templates/email/<name>.html
+EMAIL_TEMPLATES = {
+    'order_status': 'Order {order_number} is now {status}',
+    'quote_accepted': 'Your quote for order #{order_id} was accepted',
+}
+
+
+def render_email(template, context):
+    """``(subject, html)`` for a queued job; raises KeyError for an unknown template."""
+    subject = EMAIL_TEMPLATES[template].format(**context)
+    return subject, render_template(f'email/{template}.html', **context)
+
+
+class SendGridMailer:
+    def __init__(self):
+        from backend.services.email_service import EmailService
+        self.service = EmailService()
+
+    def send(self, to_email, subject, html_content):
+        if not self.service.send_email(to_email, subject, html_content):
+            raise RuntimeError(f'SendGrid did not accept the email to {to_email}')
+
+
+class InMemoryMailSink:
+    """Mailer that keeps messages in a list instead of sending them, for tests and local runs.
+
+    Recipients in ``failing`` raise, to exercise the retry path.
+    """
+
+    def __init__(self, failing=()):
+        self.messages = []
+        self.failing = set(failing)
+        self._lock = threading.Lock()
+
+    def send(self, to_email, subject, html_content):
+        if to_email in self.failing:
+            raise RuntimeError(f'Mailbox {to_email} unavailable')
+        with self._lock:
+            self.messages.append({'to': to_email, 'subject': subject, 'html': html_content})
+
+
+def get_mailer():
+    return SendGridMailer()
+
+
+class EmailWorker:
+    """Sends queued ``email_job`` rows through ``mailer`` on a thread pool.
+
+    Each pass claims up to ``batch_size`` due jobs, renders them, and sends
+    one message per recipient: several notifications for the same address
+    go out as a single digest. Failed jobs are retried with exponential
+    backoff until ``max_attempts``, after which they stay in the table as
+    'failed' for inspection.
+    """
+
+    def __init__(self, mailer, batch_size=None, threads=None, max_attempts=None, backoff=None, backoff_max=None):
+        config = current_app.config
+        self.mailer = mailer
+        self.batch_size = batch_size or config.get('EMAIL_JOB_BATCH_SIZE', 100)
+        self.threads = threads or config.get('EMAIL_JOB_THREADS', 4)
+        self.max_attempts = max_attempts or config.get('EMAIL_JOB_MAX_ATTEMPTS', 8)
+        self.backoff = backoff if backoff is not None else config.get('EMAIL_JOB_BACKOFF', 30.0)
+        self.backoff_max = backoff_max or config.get('EMAIL_JOB_BACKOFF_MAX', 3600.0)
+        self.lock_timeout = config.get('EMAIL_JOB_LOCK_TIMEOUT', 300)
+
+    def _claim(self):
+        """Mark due jobs as 'sending' under a fresh claim token and return them.
+
+        The claim is one UPDATE over a SELECT ... FOR UPDATE SKIP LOCKED, so
+        concurrent workers on PostgreSQL take disjoint rows; SQLite ignores
+        the locking clause and serializes the UPDATE itself. Jobs left in
+        'sending' by a worker that died are reclaimed after lock_timeout.
+        """
+        now = datetime.utcnow()
+        token = uuid.uuid4().hex
+        due = select(EmailJob.id).where(or_(
+            and_(EmailJob.status == 'pending', EmailJob.next_attempt_at <= now),
+            and_(EmailJob.status == 'sending', EmailJob.locked_at < now - timedelta(seconds=self.lock_timeout))
+        )).order_by(EmailJob.id).limit(self.batch_size).with_for_update(skip_locked=True)
+        claimed = EmailJob.query.filter(EmailJob.id.in_(due)).update(
+            {EmailJob.status: 'sending', EmailJob.claim_token: token, EmailJob.locked_at: now},
+            synchronize_session=False
+        )
+        db.session.commit()
+        if not claimed:
+            return []
+        return EmailJob.query.filter_by(claim_token=token).order_by(EmailJob.id).all()
+
+    def _retry_delay(self, attempts):
+        delay = min(self.backoff * (2 ** (attempts - 1)), self.backoff_max)
+        return delay + random.uniform(0, delay / 10)
+
+    def _fail(self, job, error, permanent=False):
+        job.attempts += 1
+        job.last_error = str(error)[:1000]
+        job.claim_token = None
+        job.locked_at = None
+        if permanent or job.attempts >= self.max_attempts:
+            job.status = 'failed'
+            current_app.logger.error(
+                "Gave up on %s email to %s after %s attempts: %s", job.template, job.recipient, job.attempts, job.last_error
+            )
+            return 'failed'
+        job.status = 'pending'
+        job.next_attempt_at = datetime.utcnow() + timedelta(seconds=self._retry_delay(job.attempts))
+        return 'retried'
+
+    def _compose(self, rendered):
+        if len(rendered) == 1:
+            return rendered[0]
+        subject = f'{len(rendered)} updates from VendorSync'
+        return subject, render_template('email/digest.html', messages=rendered)
+
+    def _send(self, app, recipient, subject, html):
+        # Pool threads have no app context of their own, and the mailer logs through it
+        with app.app_context():
+            self.mailer.send(recipient, subject, html)
+
+    def drain_once(self):
+        """Process one batch; returns counts of sent, retried and abandoned jobs and emails sent."""
+        stats = {'sent': 0, 'emails': 0, 'retried': 0, 'failed': 0}
+        jobs = self._claim()
+        if not jobs:
+            return stats
+
+        # Rendering needs the app context, so it happens here rather than in the pool
+        by_recipient = {}
+        for job in jobs:
+            try:
+                rendered = render_email(job.template, json.loads(job.context or '{}'))
+            except Exception as e:
+                stats[self._fail(job, e, permanent=True)] += 1
+                continue
+            by_recipient.setdefault(job.recipient, []).append((job, rendered))
+
+        app = current_app._get_current_object()
+        with ThreadPoolExecutor(max_workers=max(1, min(self.threads, len(by_recipient)))) as pool:
+            futures = {
+                recipient: pool.submit(self._send, app, recipient, *self._compose([rendered for _, rendered in items]))
+                for recipient, items in by_recipient.items()
+            }
+
+        sent_ids = []
+        for recipient, future in futures.items():
+            error = future.exception()
+            if error is None:
+                sent_ids.extend(job.id for job, _ in by_recipient[recipient])
+                stats['emails'] += 1
+                continue
+            for job, _ in by_recipient[recipient]:
+                stats[self._fail(job, error)] += 1
+
+        if sent_ids:
+            EmailJob.query.filter(EmailJob.id.in_(sent_ids)).delete(synchronize_session=False)
+            stats['sent'] += len(sent_ids)
+        db.session.commit()
+        return stats
+
+    def drain(self):
+        """Send until no due jobs remain; returns the summed counts."""
+        totals = {'sent': 0, 'emails': 0, 'retried': 0, 'failed': 0}
+        while True:
+            stats = self.drain_once()
+            for key, value in stats.items():
+                totals[key] += value
+            if not any(stats.values()):
+                return totals
+
+    def run(self, poll_interval=None, should_stop=None):
+        """Poll for due jobs until ``should_stop()`` returns true."""
+        poll_interval = poll_interval or current_app.config.get('EMAIL_JOB_POLL_INTERVAL', 2.0)
+        while not (should_stop and should_stop()):
+            try:
+                stats = self.drain_once()
+            except Exception:
+                db.session.rollback()
+                current_app.logger.exception("Email job pass failed")
+                stats = None
+            if not stats or not any(stats.values()):
+                time.sleep(poll_interval)
+
+
+# Notifications: the status events collected for /api/events are turned
+# into email jobs just before the transaction commits, so a job exists
+# exactly when the change it reports does.
+
+def _notification(item):
+    """``(template, recipients)`` for a status event; recipients are ('user'|'vendor', id) pairs."""
+    data, scope = item['data'], item['scope']
+    if item['type'] == ORDER_STATUS_CHANGED:
+        recipients = [('user', scope['manager_id']), ('vendor', scope['vendor_id'])]
+        return 'order_status', recipients + [('user', staff_id) for staff_id in scope['staff_ids']]
+    if item['type'] == QUOTE_STATUS_CHANGED and data['status'] == 'accepted':
+        return 'quote_accepted', [('vendor', scope['vendor_id'])]
+    return None, []
+
+
+def _acting_recipients():
+    # Nobody is emailed about a change they made themselves
+    principal = g.get('principal') if has_request_context() else None
+    if principal is None:
+        return set()
+    acting = {('user', principal.id)}
+    if principal.role == 'vendor' and principal.vendor_id:
+        acting.add(('vendor', principal.vendor_id))
+    return acting
+
+
+def notification_jobs(connection, items):
+    """``(recipient, template, context)`` jobs for the status events in ``items``."""
+    acting = _acting_recipients()
+    wanted = []
+    for item in items:
+        template, recipients = _notification(item)
+        recipients = [r for r in dict.fromkeys(recipients) if r[1] is not None and r not in acting]
+        if template and recipients:
+            wanted.append((template, item['data'], recipients))
+    if not wanted:
+        return []
+
+    user_ids = {id for _, _, recipients in wanted for kind, id in recipients if kind == 'user'}
+    vendor_ids = {id for _, _, recipients in wanted for kind, id in recipients if kind == 'vendor'}
+    emails = {}
+    if user_ids:
+        emails.update(
+            (('user', id), email) for id, email in connection.execute(select(User.id, User.email).where(User.id.in_(user_ids)))
+        )
+    if vendor_ids:
+        emails.update(
+            (('vendor', id), email) for id, email in connection.execute(select(Vendor.id, Vendor.email).where(Vendor.id.in_(vendor_ids)))
+        )
+
+    return [
+        (emails[recipient], template, data)
+        for template, data, recipients in wanted for recipient in recipients if emails.get(recipient)
+    ]
+
+
+@event.listens_for(Session, 'before_commit')
+def queue_notification_emails(session):
+    if not has_app_context() or not current_app.config.get('EMAIL_NOTIFICATIONS_ENABLED', False):
+        return
+    # Status events are collected during flush; make sure the last one has run
+    session.flush()
+    items = session.info.get('pending_events')
+    if items:
+        connection = session.connection()
+        enqueue_emails(connection, notification_jobs(connection, items))
@@ -1,7 +1,11 @@
+import logging
 import os
 from sendgrid import SendGridAPIClient
 from sendgrid.helpers.mail import Mail
 from flask import current_app
+from backend.utils.log import log_payload
+
+logger = logging.getLogger(__name__)
 
 class EmailService:
     def __init__(self):
@@ -16,10 +20,9 @@ class EmailService:
         )
         try:
             response = self.sg.send(message)
-            print(f"SendGrid Status Code: {response.status_code}")
-            print(f"SendGrid Body: {response.body}")
-            print(f"SendGrid Headers: {response.headers}")
+            logger.info("SendGrid returned %s for email to %s", response.status_code, to_email)
+            log_payload(logger, "SendGrid response", {'body': response.body, 'headers': response.headers})
             return response.status_code in [200, 202]
         except Exception as e:
-            print(f"Error sending email: {e}")
+            logger.exception("Error sending email to %s", to_email)
             return False
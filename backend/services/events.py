@@ -0,0 +1,264 @@
+import json
+import re
+import threading
+from collections import deque
+from flask import current_app, has_app_context
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from backend.models.purchase_order import PurchaseOrder
+from backend.models.quote import Quote
+from backend.models.order_assignment import OrderAssignment
+
+ORDER_STATUS_CHANGED = 'order.status_changed'
+QUOTE_STATUS_CHANGED = 'quote.status_changed'
+
+
+class InMemoryEventBroker:
+    """Process-local broker keeping the last ``backlog`` events for Last-Event-ID resume.
+
+    Subscribers only see events committed by their own worker process; use
+    the Redis broker when the API runs in more than one.
+    """
+
+    def __init__(self, backlog=1000):
+        self._events = deque(maxlen=backlog)
+        self._last_id = 0
+        self._changed = threading.Condition()
+
+    def _parse_id(self, event_id):
+        if not str(event_id).isdigit():
+            raise ValueError('Invalid event id')
+        return int(event_id)
+
+    def publish(self, events):
+        with self._changed:
+            for item in events:
+                self._last_id += 1
+                self._events.append(dict(item, id=str(self._last_id)))
+            self._changed.notify_all()
+
+    def last_id(self):
+        with self._changed:
+            return str(self._last_id)
+
+    def has_gap(self, event_id):
+        """True when events after ``event_id`` were dropped, or it was issued before a restart."""
+        after = self._parse_id(event_id)
+        with self._changed:
+            oldest = int(self._events[0]['id']) if self._events else self._last_id + 1
+            return after > self._last_id or after < oldest - 1
+
+    def read(self, event_id, timeout):
+        """Events after ``event_id``, waiting up to ``timeout`` seconds for the first one."""
+        after = self._parse_id(event_id)
+        with self._changed:
+            if self._last_id <= after:
+                self._changed.wait(timeout)
+            if not self._events or self._last_id <= after:
+                return []
+            # Ids are consecutive, so the position of the first new event is known
+            start = max(after - int(self._events[0]['id']) + 1, 0)
+            return [self._events[index] for index in range(start, len(self._events))]
+
+
+class RedisEventBroker:
+    """Broker shared by all workers through a capped Redis stream.
+
+    Stream entry ids double as SSE event ids, so a client can resume
+    against any worker.
+    """
+
+    STREAM_ID = re.compile(r'^\d+-\d+$')
+
+    def __init__(self, url, key='vendorsync:events', backlog=1000):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("EVENTS_BROKER=redis needs the 'redis' package installed")
+        self._redis = redis.Redis.from_url(url, decode_responses=True)
+        self.key = key
+        self.backlog = backlog
+
+    def _parse_id(self, event_id):
+        if not self.STREAM_ID.match(str(event_id)):
+            raise ValueError('Invalid event id')
+        return tuple(int(part) for part in event_id.split('-'))
+
+    def publish(self, events):
+        pipe = self._redis.pipeline(transaction=False)
+        for item in events:
+            pipe.xadd(self.key, {'event': json.dumps(item)}, maxlen=self.backlog, approximate=True)
+        pipe.execute()
+
+    def last_id(self):
+        entries = self._redis.xrevrange(self.key, count=1)
+        return entries[0][0] if entries else '0-0'
+
+    def has_gap(self, event_id):
+        after = self._parse_id(event_id)
+        oldest = self._redis.xrange(self.key, count=1)
+        if not oldest:
+            return after != (0, 0)
+        return after < self._parse_id(oldest[0][0]) or after > self._parse_id(self.last_id())
+
+    def read(self, event_id, timeout):
+        self._parse_id(event_id)
+        # BLOCK 0 would wait forever
+        result = self._redis.xread({self.key: event_id}, count=100, block=max(int(timeout * 1000), 1))
+        return [
+            dict(json.loads(fields['event']), id=entry_id)
+            for _, entries in result or [] for entry_id, fields in entries
+        ]
+
+
+def create_event_broker(config):
+    backlog = config.get('EVENTS_BACKLOG', 1000)
+    if config.get('EVENTS_BROKER', 'memory') == 'redis':
+        return RedisEventBroker(config['EVENTS_REDIS_URL'], backlog=backlog)
+    return InMemoryEventBroker(backlog)
+
+
+def init_events(app):
+    app.extensions['event_broker'] = create_event_broker(app.config)
+
+
+def get_event_broker():
+    return current_app.extensions.get('event_broker')
+
+
+def visible_to(item, principal):
+    """Mirror of the OrderResource.get checks, decided from the scope captured at write time."""
+    scope = item['scope']
+    if principal.role == 'manager':
+        return scope['manager_id'] == principal.id
+    if principal.role == 'vendor':
+        return principal.vendor_id is not None and scope['vendor_id'] == principal.vendor_id
+    if principal.role == 'staff':
+        return principal.id in scope['staff_ids']
+    return False
+
+
+# Capture: events are built during flush, while the order's owners and
+# assignments can still be read on the flush connection, and published
+# once the transaction commits.
+
+def queue_events(session, *items):
+    session.info.setdefault('pending_events', []).extend(items)
+
+
+def _order_staff_ids(connection, order_id, order=None):
+    assignments = order.__dict__.get('assignments') if order is not None else None
+    if assignments is not None:
+        return sorted({assignment.staff_id for assignment in assignments})
+    return sorted(connection.execute(
+        select(OrderAssignment.staff_id).where(OrderAssignment.order_id == order_id)
+    ).scalars())
+
+
+def order_status_event(order, previous_status, staff_ids):
+    return {
+        'type': ORDER_STATUS_CHANGED,
+        'data': {
+            'order_id': order.id,
+            'order_number': order.order_number,
+            'status': order.status,
+            'previous_status': previous_status
+        },
+        'scope': {'manager_id': order.manager_id, 'vendor_id': order.vendor_id, 'staff_ids': staff_ids}
+    }
+
+
+def quote_status_event(quote, previous_status, manager_id, staff_ids):
+    return {
+        'type': QUOTE_STATUS_CHANGED,
+        'data': {
+            'quote_id': quote.id,
+            'order_id': quote.order_id,
+            'vendor_id': quote.vendor_id,
+            'status': quote.status,
+            'previous_status': previous_status
+        },
+        'scope': {'manager_id': manager_id, 'vendor_id': quote.vendor_id, 'staff_ids': staff_ids}
+    }
+
+
+def _previous_status(target):
+    history = inspect(target).attrs.status.history
+    if not history.has_changes():
+        return None, False
+    return (history.deleted[0] if history.deleted else None), True
+
+
+@event.listens_for(PurchaseOrder, 'after_update')
+def queue_order_status_event(mapper, connection, target):
+    previous, changed = _previous_status(target)
+    session = Session.object_session(target)
+    if changed and session is not None:
+        queue_events(session, order_status_event(target, previous, _order_staff_ids(connection, target.id, target)))
+
+
+@event.listens_for(Quote, 'after_update')
+def queue_quote_status_event(mapper, connection, target):
+    previous, changed = _previous_status(target)
+    session = Session.object_session(target)
+    if not changed or session is None:
+        return
+    # Read loaded relationships from __dict__; lazy loading inside a flush is not safe
+    order = target.__dict__.get('order')
+    if order is not None:
+        manager_id = order.manager_id
+    else:
+        manager_id = connection.execute(
+            select(PurchaseOrder.manager_id).where(PurchaseOrder.id == target.order_id)
+        ).scalar()
+    queue_events(session, quote_status_event(
+        target, previous, manager_id, _order_staff_ids(connection, target.order_id, order)
+    ))
+
+
+def queue_bulk_status_events(session, orders=(), quotes=(), previous=None):
+    """Queue status events for rows changed by set-based UPDATEs, which skip the listeners above.
+
+    ``previous`` maps ``(model, id)`` to the status before the update. Each
+    quote must have its order loaded.
+    """
+    previous = previous or {}
+    order_ids = {order.id for order in orders} | {quote.order_id for quote in quotes}
+    staff = {}
+    if order_ids:
+        for order_id, staff_id in session.query(OrderAssignment.order_id, OrderAssignment.staff_id).filter(
+            OrderAssignment.order_id.in_(order_ids)
+        ):
+            staff.setdefault(order_id, []).append(staff_id)
+
+    items = [
+        order_status_event(order, previous.get((PurchaseOrder, order.id)), sorted(staff.get(order.id, [])))
+        for order in orders
+    ] + [
+        quote_status_event(
+            quote, previous.get((Quote, quote.id)), quote.order.manager_id, sorted(staff.get(quote.order_id, []))
+        )
+        for quote in quotes
+    ]
+    queue_events(session, *items)
+
+
+@event.listens_for(Session, 'after_commit')
+def publish_pending_events(session):
+    items = session.info.pop('pending_events', None)
+    if not items or not has_app_context():
+        return
+    broker = get_event_broker()
+    if broker is None:
+        return
+    try:
+        broker.publish(items)
+    except Exception:
+        # The write is already committed; a lost notification only delays clients until they refetch
+        current_app.logger.exception("Failed to publish %d events", len(items))
+
+
+@event.listens_for(Session, 'after_rollback')
+def discard_pending_events(session):
+    session.info.pop('pending_events', None)
@@ -0,0 +1,174 @@
+import json
+import random
+import time
+from datetime import datetime, timedelta
+from flask import current_app
+from backend import db
+from backend.models.purchase_order import PurchaseOrder
+from backend.models.quote import Quote
+from backend.models.search_outbox import SearchOutbox, enqueue_search_saves
+from backend.models.vendor import Vendor
+
+
+def get_outbox_index():
+    from backend.services.algolia_service import AlgoliaService
+    return AlgoliaService()
+
+
+class OutboxWorker:
+    """Drains ``search_outbox`` into an index exposing save_objects/delete_objects.
+
+    Each pass claims up to ``batch_size`` due rows, keeps only the newest
+    change per object and sends one save_objects and one delete_objects
+    call. Failed rows are retried with exponential backoff until
+    ``max_attempts``, after which they stay in the table for inspection.
+    """
+
+    def __init__(self, index, batch_size=None, max_attempts=None, backoff=None, backoff_max=None):
+        config = current_app.config
+        self.index = index
+        self.batch_size = batch_size or config.get('SEARCH_OUTBOX_BATCH_SIZE', 500)
+        self.max_attempts = max_attempts or config.get('SEARCH_OUTBOX_MAX_ATTEMPTS', 10)
+        self.backoff = backoff if backoff is not None else config.get('SEARCH_OUTBOX_BACKOFF', 2.0)
+        self.backoff_max = backoff_max or config.get('SEARCH_OUTBOX_BACKOFF_MAX', 300.0)
+
+    def _claim(self):
+        query = (
+            SearchOutbox.query
+            .filter(
+                SearchOutbox.next_attempt_at <= datetime.utcnow(),
+                SearchOutbox.attempts < self.max_attempts
+            )
+            .order_by(SearchOutbox.id)
+            .limit(self.batch_size)
+        )
+        if db.engine.dialect.name == 'postgresql':
+            # Lets several workers drain the table without sending the same rows
+            query = query.with_for_update(skip_locked=True)
+        return query.all()
+
+    def _retry_delay(self, attempts):
+        delay = min(self.backoff * (2 ** (attempts - 1)), self.backoff_max)
+        return delay + random.uniform(0, delay / 10)
+
+    def _add_quote_relations(self, records):
+        # Quotes are queued from their columns alone (see Quote.search_record); the vendor
+        # name and order status are filled in here with one query per batch
+        quotes = {record['id']: record for record in records if record.get('type') == 'quote'}
+        if not quotes:
+            return
+        rows = db.session.query(Quote.id, Vendor.name, PurchaseOrder.status).join(Quote.vendor).join(
+            Quote.order
+        ).filter(Quote.id.in_(quotes.keys()))
+        for quote_id, vendor_name, order_status in rows:
+            quotes[quote_id].update(vendor_name=vendor_name, order_status=order_status)
+
+    def _send(self, action, entries):
+        if action == 'save':
+            records = [json.loads(entry.payload) for entry in entries]
+            self._add_quote_relations(records)
+            self.index.save_objects(records)
+        else:
+            self.index.delete_objects([entry.object_id for entry in entries])
+
+    def drain_once(self):
+        """Process one batch; returns counts of sent, retried and abandoned changes."""
+        stats = {'saved': 0, 'deleted': 0, 'retried': 0, 'failed': 0}
+        entries = self._claim()
+        if not entries:
+            db.session.commit()
+            return stats
+
+        max_id = entries[-1].id
+        latest = {}
+        for entry in entries:
+            latest[entry.object_id] = entry
+
+        for action in ('save', 'delete'):
+            group = [entry for entry in latest.values() if entry.action == action]
+            if not group:
+                continue
+
+            object_ids = [entry.object_id for entry in group]
+            try:
+                self._send(action, group)
+            except Exception as e:
+                for entry in entries:
+                    if entry.object_id not in object_ids:
+                        continue
+                    entry.attempts += 1
+                    entry.last_error = str(e)[:1000]
+                    entry.next_attempt_at = datetime.utcnow() + timedelta(seconds=self._retry_delay(entry.attempts))
+                    if entry.attempts >= self.max_attempts:
+                        stats['failed'] += 1
+                        current_app.logger.error(
+                            "Search outbox gave up on %s %s after %s attempts: %s",
+                            entry.action, entry.object_id, entry.attempts, entry.last_error
+                        )
+                    else:
+                        stats['retried'] += 1
+                continue
+
+            # Older changes to the same objects, including ones waiting on a retry, are now stale
+            SearchOutbox.query.filter(
+                SearchOutbox.object_id.in_(object_ids),
+                SearchOutbox.id <= max_id
+            ).delete(synchronize_session=False)
+            stats['saved' if action == 'save' else 'deleted'] += len(group)
+
+        db.session.commit()
+        return stats
+
+    def drain(self):
+        """Drain until no due rows remain; returns the summed counts."""
+        totals = {'saved': 0, 'deleted': 0, 'retried': 0, 'failed': 0}
+        while True:
+            stats = self.drain_once()
+            for key, value in stats.items():
+                totals[key] += value
+            if not stats['saved'] and not stats['deleted']:
+                return totals
+
+    def run(self, poll_interval=None, should_stop=None):
+        """Poll the outbox until ``should_stop()`` returns true."""
+        poll_interval = poll_interval or current_app.config.get('SEARCH_OUTBOX_POLL_INTERVAL', 1.0)
+        while not (should_stop and should_stop()):
+            try:
+                stats = self.drain_once()
+            except Exception:
+                db.session.rollback()
+                current_app.logger.exception("Search outbox pass failed")
+                stats = None
+            if not stats or not (stats['saved'] or stats['deleted']):
+                time.sleep(poll_interval)
+
+
+def bulk_index_enabled():
+    """Whether bulk writers need to load the rows they wrote for queue_bulk_index."""
+    config = current_app.config
+    return config.get('ALGOLIA_ENABLED', False) or config.get('SEARCH_BACKEND') == 'local'
+
+
+def queue_bulk_index(objects):
+    """Emit index changes for rows written with bulk statements.
+
+    bulk_insert_mappings and set-based UPDATEs skip the mapper events that
+    normally fill the outbox and the local search queue, so bulk endpoints
+    call this once per batch instead.
+    """
+    from backend.services import search_service
+
+    if not objects:
+        return
+
+    if current_app.config.get('ALGOLIA_ENABLED', False):
+        by_type = {}
+        for obj in objects:
+            record = obj.search_record() if isinstance(obj, Quote) else obj.to_dict()
+            by_type.setdefault(search_service.search_type_for(obj), []).append(record)
+        connection = db.session.connection()
+        for search_type, records in by_type.items():
+            enqueue_search_saves(connection, search_type, records)
+
+    for obj in objects:
+        search_service.queue_index(obj)
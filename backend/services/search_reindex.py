@@ -0,0 +1,106 @@
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy.orm import joinedload
+from backend.models.search_outbox import search_record
+from backend.services.search_service import searchable_models
+
+REINDEX_TYPES = ['vendor', 'order', 'quote', 'requirement']
+PUSH_ATTEMPTS = 3
+
+
+def load_checkpoint(path):
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_checkpoint(path, checkpoint):
+    if not path:
+        return
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, path)
+
+
+def iter_record_batches(type_name, after_id=0, batch_size=1000):
+    """Yield ``(last_id, records)`` in id order, streaming rows ``batch_size`` at a time."""
+    model = searchable_models()[type_name]
+    query = model.query.filter(model.id > after_id).order_by(model.id)
+    if type_name == 'quote':
+        # Quote.to_dict reads vendor.name and order.status
+        query = query.options(joinedload(model.vendor), joinedload(model.order))
+    query = query.execution_options(stream_results=True).yield_per(batch_size)
+
+    batch = []
+    for obj in query:
+        batch.append(search_record(type_name, obj.to_dict()))
+        if len(batch) >= batch_size:
+            yield batch[-1]['id'], batch
+            batch = []
+    if batch:
+        yield batch[-1]['id'], batch
+
+
+def _push(index, records):
+    for attempt in range(1, PUSH_ATTEMPTS + 1):
+        try:
+            index.save_objects(records)
+            return len(records)
+        except Exception:
+            if attempt == PUSH_ATTEMPTS:
+                raise
+            time.sleep(2 ** attempt)
+
+
+def reindex(index, types=None, batch_size=1000, workers=4, after_id=None, checkpoint_path=None, progress=None):
+    """Push every searchable row to ``index`` and return ``{type: records_sent}``.
+
+    Batches are sent over a pool of ``workers`` threads with at most two
+    batches per worker in flight, so memory stays bounded by the batch size.
+    The checkpoint records, per type, the highest id below which every batch
+    has been accepted; a later run with the same checkpoint file picks up
+    from there. ``after_id`` overrides the checkpoint for a single type.
+    ``progress(type_name, sent, last_id, elapsed)`` is called as batches are
+    accepted, with ``elapsed`` the seconds spent on that type so far.
+    """
+    types = types or REINDEX_TYPES
+    checkpoint = load_checkpoint(checkpoint_path)
+    sent = {}
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for type_name in types:
+            state = checkpoint.get(type_name, {})
+            if state.get('done') and after_id is None:
+                continue
+
+            start_id = after_id if after_id is not None else state.get('last_id', 0)
+            sent[type_name] = 0
+            in_flight = deque()
+            type_started = time.monotonic()
+
+            def settle(block):
+                while in_flight and (block or in_flight[0][0].done()):
+                    future, last_id = in_flight.popleft()
+                    sent[type_name] += future.result()
+                    checkpoint[type_name] = {'last_id': last_id}
+                    save_checkpoint(checkpoint_path, checkpoint)
+                    if progress:
+                        progress(type_name, sent[type_name], last_id, time.monotonic() - type_started)
+                    block = len(in_flight) >= workers * 2
+
+            for last_id, records in iter_record_batches(type_name, start_id, batch_size):
+                in_flight.append((pool.submit(_push, index, records), last_id))
+                settle(len(in_flight) >= workers * 2)
+
+            while in_flight:
+                settle(True)
+
+            checkpoint[type_name] = {'last_id': checkpoint.get(type_name, {}).get('last_id', start_id), 'done': True}
+            save_checkpoint(checkpoint_path, checkpoint)
+
+    return sent
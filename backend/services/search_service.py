@@ -0,0 +1,395 @@
+import abc
+import math
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+
+from flask import current_app
+from sqlalchemy import event, func, or_
+from sqlalchemy.orm import Session, object_session
+
+from backend import db
+from backend.utils.db_routing import use_primary
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+MAX_PREFIX_EXPANSIONS = 50
+PREFIX_MATCH_WEIGHT = 0.8
+# Short enum columns: every value shares the same few trigrams, so an index buys nothing
+TRIGRAM_SKIP_FIELDS = {'status'}
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower()) if text else []
+
+
+def searchable_models():
+    from backend.models.vendor import Vendor
+    from backend.models.purchase_order import PurchaseOrder
+    from backend.models.quote import Quote
+    from backend.models.requirement import Requirement
+    return {'vendor': Vendor, 'order': PurchaseOrder, 'quote': Quote, 'requirement': Requirement}
+
+
+def search_type_for(obj):
+    for type_name, model in searchable_models().items():
+        if isinstance(obj, model):
+            return type_name
+    return None
+
+
+def search_document(type_name, obj):
+    """Return ``(tokens, payload)`` for ``obj``, or None if it is not searchable."""
+    # Only verified vendors are exposed through search
+    if type_name == 'vendor' and not obj.is_verified:
+        return None
+    tokens = []
+    for field in searchable_models()[type_name].__searchable__:
+        tokens.extend(tokenize(getattr(obj, field, None)))
+    return tokens, search_result(type_name, obj)
+
+
+def search_result(type_name, obj):
+    """The payload returned by /api/search for a single record."""
+    if type_name == 'vendor':
+        return {
+            'id': obj.id,
+            'type': 'vendor',
+            'name': obj.name,
+            'email': obj.email,
+            'description': f'Vendor • {obj.email}'
+        }
+    if type_name == 'order':
+        return {
+            'id': obj.id,
+            'type': 'order',
+            'name': f'Order #{obj.id}',
+            'status': obj.status,
+            'description': f'Order • {obj.status}'
+        }
+    if type_name == 'quote':
+        price = float(obj.price) if obj.price else 0
+        return {
+            'id': obj.id,
+            'type': 'quote',
+            'name': f'Quote #{obj.id}',
+            'price': price,
+            'status': obj.status,
+            'description': f'Quote • ${price} • {obj.status}'
+        }
+    return {
+        'id': obj.id,
+        'type': 'requirement',
+        'name': obj.item_name,
+        'quantity': obj.quantity,
+        'description': f'Requirement • {obj.item_name}'
+    }
+
+
+class SearchBackend(abc.ABC):
+    """Interface shared by the search backends behind /api/search."""
+
+    @abc.abstractmethod
+    def search(self, query, types=None, limit=20, offset=0):
+        """Return ``(total, results)`` for ``query``."""
+
+    def index(self, type_name, id, document):
+        pass
+
+    def remove(self, type_name, id):
+        pass
+
+
+class DatabaseSearchBackend(SearchBackend):
+    """Substring matching with ILIKE directly against the tables."""
+
+    def _queries(self, query):
+        models = searchable_models()
+        pattern = f'%{query}%'
+        Vendor, PurchaseOrder = models['vendor'], models['order']
+        Quote, Requirement = models['quote'], models['requirement']
+        return {
+            'vendor': Vendor.query.filter(
+                (Vendor.name.ilike(pattern)) | (Vendor.email.ilike(pattern))
+            ).filter_by(is_verified=True).order_by(Vendor.id),
+            'order': PurchaseOrder.query.filter(
+                PurchaseOrder.order_number.ilike(pattern)
+            ).order_by(PurchaseOrder.id),
+            'quote': Quote.query.filter(Quote.notes.ilike(pattern)).order_by(Quote.id),
+            'requirement': Requirement.query.filter(
+                (Requirement.item_name.ilike(pattern)) | (Requirement.specifications.ilike(pattern))
+            ).order_by(Requirement.id)
+        }
+
+    def search(self, query, types=None, limit=20, offset=0):
+        total = 0
+        results = []
+        for type_name, type_query in self._queries(query).items():
+            if types and type_name not in types:
+                continue
+            count = type_query.order_by(None).count()
+            skip = max(0, offset - total)
+            take = limit - len(results)
+            if take > 0 and skip < count:
+                results.extend(search_result(type_name, obj) for obj in type_query.offset(skip).limit(take))
+            total += count
+        return total, results
+
+
+class TrigramSearchBackend(DatabaseSearchBackend):
+    """PostgreSQL search over the free-text ``__searchable__`` columns.
+
+    The ILIKE filters are served by the pg_trgm GIN indexes created in
+    migration 7b2e4f1c9a63, and matches are ranked by trigram similarity.
+    """
+
+    def _queries(self, query):
+        pattern = f'%{query}%'
+        queries = {}
+        for type_name, model in searchable_models().items():
+            columns = [getattr(model, field) for field in model.__searchable__ if field not in TRIGRAM_SKIP_FIELDS]
+            rank = func.greatest(*[func.similarity(column, query) for column in columns])
+            type_query = model.query.filter(or_(*[column.ilike(pattern) for column in columns]))
+            if type_name == 'vendor':
+                type_query = type_query.filter_by(is_verified=True)
+            queries[type_name] = type_query.order_by(rank.desc(), model.id)
+        return queries
+
+
+class LocalSearchIndex(SearchBackend):
+    """In-process inverted index over the models' ``__searchable__`` fields.
+
+    Ranking is BM25; the last query term (and any term with no exact hit)
+    also matches indexed terms it is a prefix of. Every query term must
+    match. The index is built lazily from the database on first use and
+    rebuilt once it is older than SEARCH_INDEX_MAX_AGE seconds, which bounds
+    staleness from writes made by other worker processes.
+
+    Rebuilds read the database into a separate index and swap it in under
+    the lock, so searches keep using the old one meanwhile. Changes
+    committed during a rebuild are journaled and replayed onto the new
+    index before the swap.
+    """
+
+    k1 = 1.2
+    b = 0.75
+
+    STATE = ('_postings', '_doc_terms', '_doc_lengths', '_documents', '_total_length', '_sorted_terms')
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._rebuild_lock = threading.Lock()
+        self._journal = None
+        self._reset()
+
+    def _reset(self):
+        self._postings = defaultdict(dict)
+        self._doc_terms = {}
+        self._doc_lengths = {}
+        self._documents = {}
+        self._total_length = 0
+        self._sorted_terms = None
+        self.built_at = None
+
+    # Index maintenance
+
+    def index(self, type_name, id, document):
+        with self._lock:
+            if self._journal is not None:
+                self._journal.append((type_name, id, document))
+            if self.built_at is None:
+                return
+            key = (type_name, id)
+            self._remove_locked(key)
+            if document is not None:
+                self._add_locked(key, *document)
+
+    def remove(self, type_name, id):
+        self.index(type_name, id, None)
+
+    def _add_locked(self, key, tokens, payload):
+        frequencies = defaultdict(int)
+        for token in tokens:
+            frequencies[token] += 1
+        for token, tf in frequencies.items():
+            if token not in self._postings:
+                self._sorted_terms = None
+            self._postings[token][key] = tf
+        self._doc_terms[key] = tuple(frequencies)
+        self._doc_lengths[key] = len(tokens)
+        self._documents[key] = payload
+        self._total_length += len(tokens)
+
+    def _remove_locked(self, key):
+        terms = self._doc_terms.pop(key, None)
+        if terms is None:
+            return
+        for token in terms:
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.pop(key, None)
+                if not postings:
+                    del self._postings[token]
+                    self._sorted_terms = None
+        self._total_length -= self._doc_lengths.pop(key, 0)
+        self._documents.pop(key, None)
+
+    def rebuild(self, batch_size=1000):
+        with self._rebuild_lock:
+            return self._rebuild(batch_size)
+
+    def _rebuild(self, batch_size=1000):
+        fresh = LocalSearchIndex()
+        with self._lock:
+            self._journal = []
+        try:
+            # A lagging replica would drop writes whose index changes were already applied
+            with use_primary():
+                for type_name, model in searchable_models().items():
+                    for obj in model.query.order_by(model.id).yield_per(batch_size):
+                        document = search_document(type_name, obj)
+                        if document is not None:
+                            fresh._add_locked((type_name, obj.id), *document)
+
+            with self._lock:
+                for type_name, id, document in self._journal:
+                    fresh._remove_locked((type_name, id))
+                    if document is not None:
+                        fresh._add_locked((type_name, id), *document)
+                for name in self.STATE:
+                    setattr(self, name, getattr(fresh, name))
+                self.built_at = time.monotonic()
+                return len(self._documents)
+        finally:
+            with self._lock:
+                self._journal = None
+
+    def ensure_built(self):
+        if self.built_at is None:
+            # Nothing to serve yet, so every caller waits for the first build
+            with self._rebuild_lock:
+                if self.built_at is None:
+                    self._rebuild()
+            return
+
+        max_age = current_app.config.get('SEARCH_INDEX_MAX_AGE', 0)
+        if max_age <= 0 or time.monotonic() - self.built_at <= max_age:
+            return
+        # One caller refreshes; the rest keep searching the current index
+        if self._rebuild_lock.acquire(blocking=False):
+            try:
+                if time.monotonic() - self.built_at > max_age:
+                    self._rebuild()
+            finally:
+                self._rebuild_lock.release()
+
+    # Querying
+
+    def _expand(self, term, allow_prefix):
+        expansions = {}
+        if term in self._postings:
+            expansions[term] = 1.0
+        if allow_prefix or not expansions:
+            if self._sorted_terms is None:
+                self._sorted_terms = sorted(self._postings)
+            start = bisect_left(self._sorted_terms, term)
+            for candidate in self._sorted_terms[start:start + MAX_PREFIX_EXPANSIONS + 1]:
+                if not candidate.startswith(term):
+                    break
+                expansions.setdefault(candidate, PREFIX_MATCH_WEIGHT)
+        return expansions
+
+    def search(self, query, types=None, limit=20, offset=0):
+        terms = tokenize(query)
+        if not terms:
+            return 0, []
+
+        self.ensure_built()
+        with self._lock:
+            doc_count = len(self._documents)
+            if not doc_count:
+                return 0, []
+            avg_length = self._total_length / doc_count
+
+            scores = None
+            for position, term in enumerate(terms):
+                term_scores = defaultdict(float)
+                for candidate, weight in self._expand(term, position == len(terms) - 1).items():
+                    postings = self._postings[candidate]
+                    idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                    for key, tf in postings.items():
+                        if types and key[0] not in types:
+                            continue
+                        norm = tf + self.k1 * (1 - self.b + self.b * self._doc_lengths[key] / avg_length)
+                        score = weight * idf * tf * (self.k1 + 1) / norm
+                        if score > term_scores[key]:
+                            term_scores[key] = score
+                if scores is None:
+                    scores = dict(term_scores)
+                else:
+                    scores = {key: scores[key] + score for key, score in term_scores.items() if key in scores}
+                if not scores:
+                    return 0, []
+
+            ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+            results = []
+            for key, score in ranked[offset:offset + limit]:
+                result = dict(self._documents[key])
+                result['score'] = round(score, 4)
+                results.append(result)
+            return len(ranked), results
+
+
+local_search_index = LocalSearchIndex()
+database_search_backend = DatabaseSearchBackend()
+trigram_search_backend = TrigramSearchBackend()
+
+
+def get_search_backend():
+    if current_app.config.get('SEARCH_BACKEND', 'database') == 'local':
+        return local_search_index
+    if db.engine.dialect.name == 'postgresql' and current_app.config.get('SEARCH_TRIGRAM_ENABLED', True):
+        return trigram_search_backend
+    return database_search_backend
+
+# Index freshness: changes are collected per session during flush and only
+# applied to the backend once the transaction commits.
+
+def _tracking_changes():
+    return current_app.config.get('SEARCH_BACKEND', 'database') == 'local'
+
+def queue_index(target):
+    if not _tracking_changes():
+        return
+    type_name = search_type_for(target)
+    if type_name is not None:
+        _queue(target, type_name, search_document(type_name, target))
+
+def queue_remove(target):
+    if not _tracking_changes():
+        return
+    type_name = search_type_for(target)
+    if type_name is not None:
+        _queue(target, type_name, None)
+
+def _queue(target, type_name, document):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault('search_changes', {})[(type_name, target.id)] = document
+
+@event.listens_for(Session, 'after_commit')
+def apply_search_changes(session):
+    changes = session.info.pop('search_changes', None)
+    if not changes:
+        return
+    backend = get_search_backend()
+    for (type_name, id), document in changes.items():
+        if document is None:
+            backend.remove(type_name, id)
+        else:
+            backend.index(type_name, id, document)
+
+@event.listens_for(Session, 'after_rollback')
+def discard_search_changes(session):
+    session.info.pop('search_changes', None)
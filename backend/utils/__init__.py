@@ -0,0 +1,3 @@
+"""Backend utilities package."""
+
+__all__ = []
@@ -0,0 +1,81 @@
+import hashlib
+import json
+from datetime import timezone
+from flask import current_app, request
+from sqlalchemy import func
+from werkzeug.http import http_date
+
+
+def make_etag(value):
+    payload = json.dumps(value, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def _modified_at(obj):
+    return getattr(obj, 'updated_at', None) or getattr(obj, 'created_at', None)
+
+
+def entity_validators(*objects):
+    """``(etag, last_modified)`` for a response built from ``objects``.
+
+    The first object is the entity itself; pass any related rows its
+    to_dict embeds so changes to them also change the ETag.
+    """
+    parts = [[type(obj).__name__, obj.id, _modified_at(obj)] for obj in objects if obj is not None]
+    modified = [_modified_at(obj) for obj in objects if obj is not None and _modified_at(obj)]
+    return make_etag(parts), max(modified) if modified else None
+
+
+def collection_validators(query, model, related=()):
+    """``(etag, last_modified)`` for a list endpoint from one count/max(updated_at) query.
+
+    Any insert, update or delete among the rows ``query`` selects changes
+    the count or the latest timestamp. The request path and query string
+    are part of the ETag, so every page and filter revalidates separately.
+    ``related`` are updated_at columns of rows the list embeds; ``query``
+    must already join their tables.
+    """
+    count, *timestamps = query.order_by(None).with_entities(
+        func.count(model.id), func.max(model.updated_at), *[func.max(column) for column in related]
+    ).one()
+    present = [timestamp for timestamp in timestamps if timestamp is not None]
+    return make_etag([request.full_path, count, *timestamps]), max(present) if present else None
+
+
+def validator_headers(etag, last_modified=None):
+    headers = {'ETag': f'"{etag}"', 'Cache-Control': 'private, no-cache'}
+    if last_modified is not None:
+        headers['Last-Modified'] = http_date(last_modified.replace(tzinfo=timezone.utc))
+    return headers
+
+
+def is_not_modified(etag, last_modified=None):
+    """Evaluate If-None-Match, or If-Modified-Since when no ETags were sent."""
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    since = request.if_modified_since
+    if since is None or last_modified is None:
+        return False
+    # HTTP dates have whole-second precision
+    return last_modified.replace(tzinfo=timezone.utc, microsecond=0) <= since
+
+
+def conditional_response(validators, build):
+    """Return a 304 when the client's copy is current, otherwise ``build()``.
+
+    ``build`` only runs for a 200, so serialization is skipped entirely for
+    clients that already have the representation.
+    """
+    etag, last_modified = validators
+    headers = validator_headers(etag, last_modified)
+    if is_not_modified(etag, last_modified):
+        return '', 304, headers
+    return build(), 200, headers
+
+
+def collection_conditional(query, model, related=()):
+    """``(headers, not_modified)`` for a list endpoint; no headers when COLLECTION_ETAGS_ENABLED is off."""
+    if not current_app.config.get('COLLECTION_ETAGS_ENABLED', True):
+        return {}, False
+    validators = collection_validators(query, model, related)
+    return validator_headers(*validators), is_not_modified(*validators)
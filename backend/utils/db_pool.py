@@ -0,0 +1,173 @@
+import threading
+import time
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import QueuePool
+
+METRIC_PREFIX = 'vendorsync_db_pool'
+# Upper bounds in seconds for the checkout wait histogram
+CHECKOUT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class PoolMetrics:
+    """Connection checkout wait times per pool, as Prometheus histograms."""
+
+    def __init__(self, buckets=CHECKOUT_BUCKETS):
+        self.buckets = buckets
+        self._pools = {}
+        self._lock = threading.Lock()
+
+    def observe(self, pool, seconds, timed_out=False):
+        name = pool_name(pool)
+        with self._lock:
+            stats = self._pools.get(name)
+            if stats is None:
+                stats = self._pools[name] = {
+                    'pool': pool, 'buckets': [0] * len(self.buckets), 'count': 0, 'sum': 0.0, 'timeouts': 0
+                }
+            stats['pool'] = pool
+            stats['count'] += 1
+            stats['sum'] += seconds
+            if timed_out:
+                stats['timeouts'] += 1
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    stats['buckets'][i] += 1
+                    break
+
+    def reset(self):
+        with self._lock:
+            self._pools = {}
+
+    def snapshot(self):
+        with self._lock:
+            return {name: dict(stats, buckets=list(stats['buckets'])) for name, stats in self._pools.items()}
+
+    def render_prometheus(self):
+        snapshot = self.snapshot()
+        lines = [
+            f"# HELP {METRIC_PREFIX}_checkout_wait_seconds Time spent waiting for a pooled connection.",
+            f"# TYPE {METRIC_PREFIX}_checkout_wait_seconds histogram",
+        ]
+        for name, stats in sorted(snapshot.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, stats['buckets']):
+                cumulative += count
+                lines.append(f'{METRIC_PREFIX}_checkout_wait_seconds_bucket{{pool="{name}",le="{bound}"}} {cumulative}')
+            lines.append(f'{METRIC_PREFIX}_checkout_wait_seconds_bucket{{pool="{name}",le="+Inf"}} {stats["count"]}')
+            lines.append(f'{METRIC_PREFIX}_checkout_wait_seconds_sum{{pool="{name}"}} {stats["sum"]:.6f}')
+            lines.append(f'{METRIC_PREFIX}_checkout_wait_seconds_count{{pool="{name}"}} {stats["count"]}')
+
+        lines.append(f"# HELP {METRIC_PREFIX}_checkout_timeouts_total Checkouts that gave up after pool_timeout.")
+        lines.append(f"# TYPE {METRIC_PREFIX}_checkout_timeouts_total counter")
+        for name, stats in sorted(snapshot.items()):
+            lines.append(f'{METRIC_PREFIX}_checkout_timeouts_total{{pool="{name}"}} {stats["timeouts"]}')
+
+        for metric, help_text, attribute in (
+            ('size', 'Configured pool size.', 'size'),
+            ('checked_out', 'Connections currently in use.', 'checkedout'),
+            ('overflow', 'Connections open beyond pool_size.', 'overflow'),
+        ):
+            lines.append(f"# HELP {METRIC_PREFIX}_{metric} {help_text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{metric} gauge")
+            for name, stats in sorted(snapshot.items()):
+                lines.append(f'{METRIC_PREFIX}_{metric}{{pool="{name}"}} {getattr(stats["pool"], attribute)()}')
+
+        return '\n'.join(lines) + '\n'
+
+
+pool_metrics = PoolMetrics()
+
+
+def pool_name(pool):
+    return pool._orig_logging_name or 'default'
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection.
+
+    The wait covers the time blocked on a full pool plus opening a new
+    connection when one is created, which is what a request actually sees.
+    """
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            pool_metrics.observe(self, time.perf_counter() - start, timed_out=True)
+            raise
+        pool_metrics.observe(self, time.perf_counter() - start)
+        return connection
+
+
+def engine_options(config, uri=None, name=None):
+    """SQLAlchemy engine options for ``uri`` built from the DB_* settings.
+
+    Anything already in SQLALCHEMY_ENGINE_OPTIONS wins, so a deployment can
+    still pass raw create_engine arguments. SQLite keeps SQLAlchemy's own
+    pool, since its connections are local and not shareable across threads.
+    """
+    url = make_url(uri or config['SQLALCHEMY_DATABASE_URI'])
+    options = {
+        'pool_pre_ping': config.get('DB_POOL_PRE_PING', True),
+        'pool_recycle': config.get('DB_POOL_RECYCLE', 1800),
+    }
+    if name:
+        options['pool_logging_name'] = name
+
+    if url.get_backend_name() != 'sqlite':
+        options.update({
+            'poolclass': TimedQueuePool,
+            'pool_size': config.get('DB_POOL_SIZE', 5),
+            'max_overflow': config.get('DB_MAX_OVERFLOW', 10),
+            'pool_timeout': config.get('DB_POOL_TIMEOUT', 30),
+        })
+
+    if url.get_backend_name() == 'postgresql':
+        connect_args = {}
+        timeout = config.get('DB_STATEMENT_TIMEOUT_MS', 0)
+        pgbouncer = config.get('DB_PGBOUNCER', False)
+        if timeout and not pgbouncer:
+            connect_args['options'] = f'-c statement_timeout={int(timeout)}'
+        if pgbouncer and url.get_driver_name() == 'psycopg':
+            # psycopg 3 prepares repeated statements server-side, which breaks under transaction pooling
+            connect_args['prepare_threshold'] = None
+        if connect_args:
+            options['connect_args'] = connect_args
+
+    options.update(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    return options
+
+
+_pgbouncer_timeout_ms = None
+
+
+def _set_local_statement_timeout(conn):
+    if _pgbouncer_timeout_ms and conn.dialect.name == 'postgresql':
+        conn.exec_driver_sql(f'SET LOCAL statement_timeout = {_pgbouncer_timeout_ms}')
+
+
+def init_db_pool(app):
+    """Fill SQLALCHEMY_ENGINE_OPTIONS and create replica engines; call before db.init_app.
+
+    PgBouncer in transaction mode hands each transaction a different server
+    connection and rejects startup options, so in DB_PGBOUNCER mode the
+    statement timeout is set with SET LOCAL at the start of every
+    transaction instead of once per connection.
+    """
+    global _pgbouncer_timeout_ms
+
+    # Replicas get the same pool settings. They are plain engines rather than
+    # SQLALCHEMY_BINDS, which would give every app a metadata per replica.
+    app.extensions['db_replicas'] = [
+        create_engine(url, **engine_options(app.config, url, name=f'replica_{number}'))
+        for number, url in enumerate(app.config.get('DB_REPLICA_URLS', []), start=1)
+    ]
+
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config, name='primary')
+
+    if app.config.get('DB_PGBOUNCER', False) and app.config.get('DB_STATEMENT_TIMEOUT_MS', 0):
+        _pgbouncer_timeout_ms = int(app.config['DB_STATEMENT_TIMEOUT_MS'])
+        if not event.contains(Engine, 'begin', _set_local_statement_timeout):
+            event.listen(Engine, 'begin', _set_local_statement_timeout)
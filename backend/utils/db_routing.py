@@ -0,0 +1,145 @@
+import random
+import threading
+import time
+from contextlib import contextmanager
+from flask import current_app, g, has_request_context, request
+from flask_jwt_extended import get_jwt_identity
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+
+READ_METHODS = ('GET', 'HEAD')
+
+
+class RecentWriters:
+    """Identities that committed a write within the read-your-writes window.
+
+    Process-local, like the principal cache: a write handled by one worker
+    only pins that worker's reads to the primary.
+    """
+
+    def __init__(self):
+        self._until = {}
+        self._lock = threading.Lock()
+
+    def mark(self, identity, seconds):
+        now = time.monotonic()
+        with self._lock:
+            self._until[identity] = now + seconds
+            if len(self._until) > 10000:
+                self._until = {key: until for key, until in self._until.items() if until > now}
+
+    def is_recent(self, identity):
+        with self._lock:
+            until = self._until.get(identity)
+        return until is not None and until > time.monotonic()
+
+    def clear(self):
+        with self._lock:
+            self._until = {}
+
+
+recent_writers = RecentWriters()
+
+
+def _current_identity():
+    principal = g.get('principal')
+    if principal is not None:
+        return str(principal.id)
+    try:
+        identity = get_jwt_identity()
+    except RuntimeError:
+        return None
+    return str(identity) if identity is not None else None
+
+
+def _pin_primary():
+    g._db_pinned_primary = True
+    g._db_wrote = True
+
+
+def _replica_for_request(mapper, clause, flushing):
+    """Engine of the replica serving this request, or None for the primary."""
+    if not has_request_context() or not g.get('_db_read_replica') or g.get('_db_pinned_primary'):
+        return None
+
+    # Writes, locking reads and raw session.connection() calls stay on the primary, and so does
+    # everything after them in the same request
+    if flushing or (mapper is None and clause is None) or getattr(clause, 'is_dml', False) \
+            or getattr(clause, '_for_update_arg', None) is not None:
+        _pin_primary()
+        return None
+
+    if '_db_replica' not in g:
+        identity = _current_identity()
+        if identity is not None and recent_writers.is_recent(identity):
+            g._db_replica = None
+        else:
+            g._db_replica = random.choice(current_app.extensions['db_replicas'])
+    return g._db_replica
+
+
+class RoutingSession(Session):
+    """Session that sends reads from replica-enabled GET handlers to a replica engine."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            replica = _replica_for_request(mapper, clause, self._flushing)
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def remember_writer(session):
+    if not has_request_context() or not current_app.extensions.get('db_replicas'):
+        return
+    if request.method in READ_METHODS and not g.get('_db_wrote'):
+        return
+    identity = _current_identity()
+    if identity is not None:
+        recent_writers.mark(identity, current_app.config.get('DB_REPLICA_READ_YOUR_WRITES_SECONDS', 5))
+
+
+@contextmanager
+def use_primary():
+    """Run the enclosed queries on the primary even in a replica-routed request."""
+    if not has_request_context():
+        yield
+        return
+    previous = g.get('_db_read_replica', False)
+    g._db_read_replica = False
+    try:
+        yield
+    finally:
+        g._db_read_replica = previous
+
+
+def _endpoint_reads_replica(app, endpoint):
+    if endpoint in app.config.get('DB_REPLICA_EXCLUDE', []):
+        return False
+    if endpoint in app.config.get('DB_REPLICA_ENDPOINTS', []):
+        return True
+    view_class = getattr(app.view_functions.get(endpoint), 'view_class', None)
+    return bool(getattr(view_class, 'read_replica', False))
+
+
+def init_replica_routing(app):
+    """Route GET/HEAD requests of replica-enabled resources to the replica engines.
+
+    Resources opt in with ``read_replica = True``; DB_REPLICA_ENDPOINTS and
+    DB_REPLICA_EXCLUDE override that per endpoint name. Does nothing unless
+    DB_REPLICA_URLS configured at least one replica.
+    """
+    if not app.extensions.get('db_replicas'):
+        return
+
+    routable = {}
+
+    @app.before_request
+    def route_reads_to_replica():
+        if request.method not in READ_METHODS or request.endpoint is None:
+            return
+        if request.endpoint not in routable:
+            routable[request.endpoint] = _endpoint_reads_replica(app, request.endpoint)
+        if routable[request.endpoint]:
+            g._db_read_replica = True
@@ -0,0 +1,28 @@
+from functools import wraps
+
+from flask_jwt_extended import jwt_required
+
+from backend.utils.principal import get_current_principal
+
+
+def role_required(*roles, message='Access denied', locations=None):
+    """Require a valid JWT whose principal holds one of ``roles``.
+
+    Authorization reads the request principal, so with JWT_IDENTITY_CLAIMS
+    enabled the role gate is decided from the token without a query.
+    ``locations`` overrides JWT_TOKEN_LOCATION for this endpoint only.
+    """
+    def wrapper(fn):
+        @wraps(fn)
+        @jwt_required(locations=locations)
+        def decorator(*args, **kwargs):
+            principal = get_current_principal()
+            if not principal:
+                return {'message': 'User not found'}, 404
+            if not principal.is_active:
+                return {'message': 'Account is inactive. Please contact administrator.'}, 403
+            if roles and principal.role not in roles:
+                return {'message': message}, 403
+            return fn(*args, **kwargs)
+        return decorator
+    return wrapper
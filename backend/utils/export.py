@@ -0,0 +1,59 @@
+import csv
+import io
+import json
+from flask import Response, current_app, stream_with_context
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson'
+}
+
+
+def add_export_arguments(parser):
+    parser.add_argument('format', type=str, default='csv', choices=list(EXPORT_FORMATS), location='args',
+                        help='Format must be one of: ' + ', '.join(EXPORT_FORMATS))
+
+
+def export_response(query, fields, export_format, name):
+    """Stream ``query`` as CSV or NDJSON without loading it into memory.
+
+    Rows are fetched ``EXPORT_BATCH_SIZE`` at a time with ``yield_per``
+    (a server-side cursor on PostgreSQL) and serialized with ``to_dict``,
+    keeping only ``fields``. The CSV header goes out before the query runs.
+    """
+    batch_size = current_app.config.get('EXPORT_BATCH_SIZE', 1000)
+
+    def generate():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer) if export_format == 'csv' else None
+        if writer:
+            writer.writerow(fields)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+        if query is None:
+            return
+
+        pending = 0
+        for obj in query.execution_options(stream_results=True).yield_per(batch_size):
+            record = obj.to_dict()
+            if writer:
+                writer.writerow([record.get(field) for field in fields])
+            else:
+                buffer.write(json.dumps({field: record.get(field) for field in fields}, default=str))
+                buffer.write('\n')
+
+            pending += 1
+            if pending == batch_size:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+                pending = 0
+
+        if pending:
+            yield buffer.getvalue()
+
+    response = Response(stream_with_context(generate()), mimetype=EXPORT_FORMATS[export_format])
+    response.headers['Content-Disposition'] = f'attachment; filename={name}.{export_format}'
+    return response
@@ -0,0 +1,107 @@
+import atexit
+import json
+import logging
+import queue
+import random
+import sys
+import uuid
+from logging.handlers import QueueHandler, QueueListener
+from flask import g, has_request_context, request
+from flask.logging import default_handler
+
+TEXT_FORMAT = '%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s'
+
+_listener = None
+_queue_handler = None
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamps records with the current request id.
+
+    Attached to the queue handler so it runs on the logging thread that has
+    the request context, not on the listener thread.
+    """
+
+    def filter(self, record):
+        record.request_id = g.get('request_id', '-') if has_request_context() else '-'
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'request_id': getattr(record, 'request_id', '-'),
+            'message': record.getMessage()
+        }
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def _stop_listener():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def configure_logging(app):
+    """Route the ``backend`` logger tree through a QueueHandler.
+
+    Request threads only enqueue records; a QueueListener thread formats
+    them and writes to stderr. Safe to call once per app.
+    """
+    global _listener, _queue_handler
+
+    logger = logging.getLogger('backend')
+    logger.setLevel(app.config.get('LOG_LEVEL', 'INFO').upper())
+
+    if _queue_handler is None:
+        log_queue = queue.SimpleQueue()
+        _queue_handler = QueueHandler(log_queue)
+        _queue_handler.addFilter(RequestIdFilter())
+
+        stream_handler = logging.StreamHandler(sys.stderr)
+        if app.config.get('LOG_FORMAT', 'text') == 'json':
+            stream_handler.setFormatter(JsonFormatter())
+        else:
+            stream_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+        _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_stop_listener)
+
+    if _queue_handler not in logger.handlers:
+        logger.addHandler(_queue_handler)
+    # app.logger is this logger; Flask's handler would write synchronously
+    logger.removeHandler(default_handler)
+    logger.propagate = False
+
+    header = app.config.get('LOG_REQUEST_ID_HEADER', 'X-Request-ID')
+
+    @app.before_request
+    def assign_request_id():
+        g.request_id = request.headers.get(header) or uuid.uuid4().hex
+
+    @app.after_request
+    def echo_request_id(response):
+        response.headers[header] = g.get('request_id', '')
+        return response
+
+
+def log_payload(logger, message, payload, sample_rate=None):
+    """Log ``payload`` at DEBUG for a sampled fraction of calls.
+
+    The payload is only formatted when the record is actually emitted, so at
+    INFO this costs one level check.
+    """
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    if sample_rate is None:
+        from flask import current_app
+        sample_rate = current_app.config.get('LOG_PAYLOAD_SAMPLE_RATE', 0.01)
+    if random.random() < sample_rate:
+        logger.debug("%s: %s", message, payload)
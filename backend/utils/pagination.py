@@ -0,0 +1,85 @@
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import and_, func, or_
+
+MAX_PAGE_SIZE = 100
+
+
+class KeysetPage:
+    def __init__(self, items, next_cursor, total=None):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.has_next = next_cursor is not None
+        self.total = total
+
+
+def encode_cursor(sort_value, id):
+    payload = json.dumps([sort_value.isoformat() if sort_value else None, id])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Return ``(sort_value, id)`` from an opaque cursor; raises ValueError."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        sort_value, id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return (datetime.fromisoformat(sort_value) if sort_value else None), int(id)
+    except (TypeError, ValueError, json.JSONDecodeError):
+        raise ValueError('Invalid cursor')
+
+
+def comparable_timestamp(query, expression):
+    """``expression`` in a form that compares by instant on ``query``'s database.
+
+    SQLite keeps timestamps as text, CURRENT_TIMESTAMP without the fraction a
+    bound datetime carries, so equal instants only compare equal as julian days.
+    """
+    if query.session.get_bind().dialect.name == 'sqlite':
+        return func.julianday(expression)
+    return expression
+
+
+def wants_keyset(args):
+    return args.get('cursor') is not None or args.get('limit') is not None
+
+
+def keyset_paginate(query, sort_column, id_column, cursor=None, limit=None, include_total=False):
+    """Page ``query`` newest-first by ``(sort_column, id_column)``.
+
+    Unlike ``.paginate()`` this never issues an OFFSET, and only runs the
+    COUNT when ``include_total`` is set.
+    """
+    limit = max(1, min(limit or 10, MAX_PAGE_SIZE))
+    total = query.order_by(None).count() if include_total else None
+
+    sort_key = comparable_timestamp(query, sort_column)
+    if cursor:
+        sort_value, last_id = decode_cursor(cursor)
+        if sort_value is None:
+            query = query.filter(sort_column.is_(None), id_column < last_id)
+        else:
+            sort_value = comparable_timestamp(query, sort_value)
+            query = query.filter(or_(
+                sort_key < sort_value,
+                and_(sort_key == sort_value, id_column < last_id),
+                sort_column.is_(None)
+            ))
+
+    # NULL sort keys come last on every database (PostgreSQL puts them first under DESC)
+    rows = query.order_by(sort_key.desc().nullslast(), id_column.desc()).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+
+    return KeysetPage(rows, next_cursor, total)
+
+
+def add_keyset_arguments(parser):
+    parser.add_argument('cursor', type=str, location='args')
+    parser.add_argument('limit', type=int, location='args')
+    parser.add_argument('include_total', type=lambda x: x.lower() == 'true', default=False, location='args')
@@ -0,0 +1,241 @@
+import threading
+import time
+
+from flask import current_app, g
+from flask_jwt_extended import get_jwt, get_jwt_identity
+from sqlalchemy import and_, event, inspect, select
+
+from backend import db
+from backend.models.user import User
+from backend.models.role import Role
+from backend.models.vendor import Vendor
+
+
+class Principal:
+    """The authenticated caller, resolved once per request.
+
+    Holds only plain values (no ORM instances) so it can be cached across
+    requests or rebuilt from token claims without touching the session.
+    """
+
+    __slots__ = ('id', 'role', 'vendor_id', 'is_active', 'token_version')
+
+    def __init__(self, id, role, vendor_id=None, is_active=True, token_version=0):
+        self.id = id
+        self.role = role
+        self.vendor_id = vendor_id
+        self.is_active = is_active
+        self.token_version = token_version
+
+    def to_claims(self):
+        return {
+            'role': self.role,
+            'vendor_id': self.vendor_id,
+            'is_active': self.is_active,
+            'tv': self.token_version,
+            'ver': time.time()
+        }
+
+    def __repr__(self):
+        return f"<Principal user_id={self.id} role={self.role} vendor_id={self.vendor_id}>"
+
+
+class PrincipalCache:
+    """Process-local TTL cache of resolved principals keyed by user id.
+
+    Also remembers when each user (or everyone) was last invalidated so
+    identity claims minted before a role or vendor change can be refused
+    immediately in this process. Other processes rely on User.token_version,
+    whose last checked value is kept per user for JWT_CLAIMS_MAX_AGE.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._versions = {}
+        self._invalidated_at = {}
+        self._all_invalidated_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            principal, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[user_id]
+                return None
+            return principal
+
+    def set(self, user_id, principal, ttl):
+        with self._lock:
+            self._entries[user_id] = (principal, time.monotonic() + ttl)
+
+    def invalidate(self, user_id=None):
+        now = time.time()
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+                self._versions.clear()
+                self._invalidated_at.clear()
+                self._all_invalidated_at = now
+            else:
+                self._entries.pop(user_id, None)
+                self._versions.pop(user_id, None)
+                self._invalidated_at[user_id] = now
+
+    def discard(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def get_version(self, user_id, max_age):
+        """The token_version read for ``user_id`` less than ``max_age`` seconds ago, or None."""
+        with self._lock:
+            entry = self._versions.get(user_id)
+        if entry is None or entry[1] <= time.monotonic() - max_age:
+            return None
+        return entry[0]
+
+    def set_version(self, user_id, version):
+        with self._lock:
+            self._versions[user_id] = (version, time.monotonic())
+
+    def is_current(self, user_id, version):
+        with self._lock:
+            invalidated_at = max(self._all_invalidated_at, self._invalidated_at.get(user_id, 0.0))
+        return version > invalidated_at
+
+
+principal_cache = PrincipalCache()
+
+
+def load_principal(user_id):
+    """Resolve user, role name and vendor profile in a single joined query."""
+    row = db.session.query(
+        User.id, User.is_active, User.token_version, Role.name, Vendor.id
+    ).join(
+        Role, User.role_id == Role.id
+    ).outerjoin(
+        Vendor, and_(Vendor.email == User.email, Role.name == 'vendor')
+    ).filter(
+        User.id == user_id
+    ).first()
+
+    if not row:
+        return None
+
+    id, is_active, token_version, role_name, vendor_id = row
+    return Principal(id, role_name, vendor_id, is_active is not False, token_version or 0)
+
+
+def identity_claims(identity):
+    """Claims embedded in access tokens when JWT_IDENTITY_CLAIMS is on."""
+    try:
+        principal = load_principal(int(identity))
+    except (TypeError, ValueError):
+        return {}
+    return principal.to_claims() if principal else {}
+
+
+def _principal_from_claims(user_id):
+    claims = get_jwt()
+    if 'role' not in claims or 'ver' not in claims:
+        return None
+
+    version = claims['ver']
+    if not principal_cache.is_current(user_id, version):
+        return None
+
+    # Fresh claims are trusted as-is. Past JWT_CLAIMS_MAX_AGE they stay usable only while the
+    # user's token_version matches, which every worker sees, unlike the in-process invalidations.
+    # The version read is reused for JWT_CLAIMS_MAX_AGE, so each worker queries it at most that often per user
+    max_age = current_app.config.get('JWT_CLAIMS_MAX_AGE', 60)
+    if time.time() - version >= max_age:
+        current = principal_cache.get_version(user_id, max_age)
+        if current is None:
+            current = db.session.query(User.token_version).filter(User.id == user_id).scalar()
+            if current is not None:
+                principal_cache.set_version(user_id, current)
+        if current is None or current != claims.get('tv'):
+            # Changed in another process, so the cached principal is stale as well
+            principal_cache.discard(user_id)
+            return None
+
+    return Principal(user_id, claims['role'], claims.get('vendor_id'), claims.get('is_active', True), claims.get('tv', 0))
+
+
+def get_current_principal():
+    """Return the principal for the current JWT identity, or None.
+
+    With JWT_IDENTITY_CLAIMS enabled a fresh token is trusted as-is; otherwise
+    the result comes from the process-local cache (PRINCIPAL_CACHE_TTL) or a
+    single query. Either way it is memoised on ``flask.g`` for the request.
+    """
+    if 'principal' in g:
+        return g.principal
+
+    identity = get_jwt_identity()
+    try:
+        user_id = int(identity)
+    except (TypeError, ValueError):
+        g.principal = None
+        return None
+
+    principal = None
+    if current_app.config.get('JWT_IDENTITY_CLAIMS', False):
+        principal = _principal_from_claims(user_id)
+
+    ttl = current_app.config.get('PRINCIPAL_CACHE_TTL', 0)
+    if principal is None and ttl > 0:
+        principal = principal_cache.get(user_id)
+
+    if principal is None:
+        principal = load_principal(user_id)
+        if principal is not None and ttl > 0:
+            principal_cache.set(user_id, principal, ttl)
+
+    g.principal = principal
+    return principal
+
+# Cache invalidation callbacks
+
+PRINCIPAL_COLUMNS = ('role_id', 'is_active', 'email')
+
+
+@event.listens_for(User, 'before_update')
+def bump_user_token_version(mapper, connection, target):
+    state = inspect(target)
+    if any(state.attrs[name].history.has_changes() for name in PRINCIPAL_COLUMNS):
+        target.token_version = (target.token_version or 0) + 1
+
+
+def bump_token_versions(connection, condition):
+    # Revokes identity claims in every worker for the users matching ``condition``
+    connection.execute(User.__table__.update().where(condition).values(token_version=User.__table__.c.token_version + 1))
+
+
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def invalidate_user_principal(mapper, connection, target):
+    principal_cache.invalidate(target.id)
+
+@event.listens_for(Vendor, 'after_insert')
+@event.listens_for(Vendor, 'after_update')
+@event.listens_for(Vendor, 'after_delete')
+def invalidate_vendor_principal(mapper, connection, target):
+    # Vendor profiles are matched to users by email, including the old
+    # address when the email itself is being changed.
+    emails = {target.email} | set(inspect(target).attrs.email.history.deleted or ())
+    user_ids = connection.execute(
+        select(User.id).where(User.email.in_(emails))
+    ).scalars().all()
+    for user_id in user_ids:
+        principal_cache.invalidate(user_id)
+    if user_ids:
+        bump_token_versions(connection, User.id.in_(user_ids))
+
+@event.listens_for(Role, 'after_update')
+@event.listens_for(Role, 'after_delete')
+def invalidate_all_principals(mapper, connection, target):
+    principal_cache.invalidate()
+    bump_token_versions(connection, User.role_id == target.id)
@@ -0,0 +1,43 @@
+from contextlib import contextmanager
+from sqlalchemy import event
+
+
+class QueryCounter:
+    """Records every SQL statement executed on ``engine`` while active."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+    def __enter__(self):
+        event.listen(self.engine, 'before_cursor_execute', self._record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, 'before_cursor_execute', self._record)
+        return False
+
+
+def count_queries(engine=None):
+    """``with count_queries() as counter: ...`` then read ``counter.count``."""
+    if engine is None:
+        from backend import db
+        engine = db.engine
+    return QueryCounter(engine)
+
+
+@contextmanager
+def assert_max_queries(limit, engine=None):
+    """Fail if the block runs more than ``limit`` statements."""
+    with count_queries(engine) as counter:
+        yield counter
+    if counter.count > limit:
+        listing = '\n'.join(counter.statements)
+        raise AssertionError(f"Expected at most {limit} queries, got {counter.count}:\n{listing}")
@@ -0,0 +1,184 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from backend.models.role import Role
+from backend.models.vendor import Vendor
+from backend.models.vendor_category import VendorCategory
+from backend.utils.conditional import is_not_modified, make_etag, validator_headers
+from backend.utils.db_routing import use_primary
+
+# Cached namespaces dropped when rows of these models are committed
+MODEL_NAMESPACES = {
+    Role: ('roles',),
+    VendorCategory: ('vendor_categories',),
+    Vendor: ('vendors',),
+}
+
+
+class LocalCacheBackend:
+    """Process-local LRU cache with per-entry TTL.
+
+    Invalidation only reaches the worker that committed the write; other
+    gunicorn workers serve their copy until it expires. Use the shared
+    backend when that matters.
+    """
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_version(self, namespace):
+        with self._lock:
+            return self._versions.get(namespace, 0)
+
+    def bump_version(self, namespace):
+        with self._lock:
+            self._versions[namespace] = self._versions.get(namespace, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+
+
+class RedisCacheBackend:
+    """Cache shared by all workers through Redis.
+
+    Namespace versions are Redis counters, so a commit in any worker
+    invalidates the entries every other worker would read.
+    """
+
+    def __init__(self, url, prefix='vendorsync:cache:'):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("RESPONSE_CACHE_BACKEND=redis needs the 'redis' package installed")
+        self._redis = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key):
+        value = self._redis.get(self.prefix + key)
+        return json.loads(value) if value is not None else None
+
+    def set(self, key, value, ttl):
+        self._redis.set(self.prefix + key, json.dumps(value), ex=max(int(ttl), 1))
+
+    def get_version(self, namespace):
+        return int(self._redis.get(f'{self.prefix}version:{namespace}') or 0)
+
+    def bump_version(self, namespace):
+        self._redis.incr(f'{self.prefix}version:{namespace}')
+
+    def clear(self):
+        for key in self._redis.scan_iter(match=self.prefix + '*'):
+            self._redis.delete(key)
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_cache_backend():
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                config = current_app.config
+                if config.get('RESPONSE_CACHE_BACKEND', 'local') == 'redis':
+                    _backend = RedisCacheBackend(config['RESPONSE_CACHE_URL'])
+                else:
+                    _backend = LocalCacheBackend(config.get('RESPONSE_CACHE_MAX_ENTRIES', 1024))
+    return _backend
+
+
+def cached_response(namespace, variant, build):
+    """Serve ``build()`` through the response cache with ETag revalidation.
+
+    Call after authorization: the cached body is shared by everyone allowed
+    to reach the call. Returns a Flask-RESTful (body, status, headers) tuple;
+    a matching If-None-Match gets an empty 304.
+    """
+    config = current_app.config
+    if config.get('RESPONSE_CACHE_ENABLED', False):
+        backend = get_cache_backend()
+        key = f'{namespace}:{backend.get_version(namespace)}:{variant}'
+        entry = backend.get(key)
+        if entry is None:
+            # Replicas may lag behind the commit that invalidated this namespace
+            with use_primary():
+                body = build()
+            entry = {'etag': make_etag(body), 'body': body}
+            backend.set(key, entry, config.get('RESPONSE_CACHE_TTL', 300))
+    else:
+        body = build()
+        entry = {'etag': make_etag(body), 'body': body}
+
+    headers = validator_headers(entry['etag'])
+    if is_not_modified(entry['etag']):
+        return '', 304, headers
+    return entry['body'], 200, headers
+
+
+def invalidate(*namespaces):
+    if not current_app.config.get('RESPONSE_CACHE_ENABLED', False):
+        return
+    backend = get_cache_backend()
+    for namespace in namespaces:
+        backend.bump_version(namespace)
+
+
+# Invalidation: namespaces touched during flush are dropped once the
+# transaction commits, so readers never cache a write that rolls back.
+
+def queue_invalidation(session, *namespaces):
+    """Drop ``namespaces`` when ``session`` commits; for writes that skip mapper events."""
+    session.info.setdefault('cache_invalidations', set()).update(namespaces)
+
+
+def _queue_model_invalidation(mapper, connection, target):
+    session = Session.object_session(target)
+    if session is not None:
+        queue_invalidation(session, *MODEL_NAMESPACES[mapper.class_])
+
+
+for _model in MODEL_NAMESPACES:
+    for _event_name in ('after_insert', 'after_update', 'after_delete'):
+        event.listen(_model, _event_name, _queue_model_invalidation)
+
+
+@event.listens_for(Session, 'after_commit')
+def apply_cache_invalidations(session):
+    namespaces = session.info.pop('cache_invalidations', None)
+    if namespaces:
+        invalidate(*namespaces)
+
+
+@event.listens_for(Session, 'after_rollback')
+def discard_cache_invalidations(session):
+    session.info.pop('cache_invalidations', None)
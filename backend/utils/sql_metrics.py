@@ -0,0 +1,233 @@
+import hashlib
+import heapq
+import hmac
+import re
+import threading
+import time
+from collections import Counter
+from flask import Response, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+METRIC_PREFIX = 'vendorsync_db'
+STATEMENT_LABEL_LENGTH = 200
+# Upper bounds for the per-request histograms
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+DB_SECONDS_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b|%\(\w+\)s|:\w+|\$\d+|\?")
+_IN_LIST_RE = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+_TABLE_RE = re.compile(r'\b(?:FROM|INTO|UPDATE)\s+"?(\w+)', re.IGNORECASE)
+
+
+def statement_fingerprint(statement):
+    """``(fingerprint, summary)`` for a SQL statement.
+
+    Literals and bind placeholders are replaced and IN lists collapsed, so
+    the same query shape always gets the same short hash whatever its
+    parameters. The summary is the verb and first table, e.g.
+    ``SELECT purchase_order``; neither carries row data into metric labels.
+    """
+    normalized = _IN_LIST_RE.sub('(?)', _LITERAL_RE.sub('?', ' '.join(statement.split())))
+    fingerprint = hashlib.sha1(normalized.encode()).hexdigest()[:12]
+    verb = normalized.split(' ', 1)[0].upper() if normalized else ''
+    table = _TABLE_RE.search(normalized)
+    return fingerprint, f"{verb} {table.group(1)}" if table else verb
+
+
+def _observe(buckets, bounds, value):
+    for i, bound in enumerate(bounds):
+        if value <= bound:
+            buckets[i] += 1
+            break
+
+
+class EndpointStats:
+    __slots__ = ('requests', 'queries', 'seconds', 'max_queries', 'n_plus_one', 'query_buckets', 'seconds_buckets',
+                 'slowest')
+
+    def __init__(self):
+        self.requests = 0
+        self.queries = 0
+        self.seconds = 0.0
+        self.max_queries = 0
+        self.n_plus_one = 0
+        self.query_buckets = [0] * len(QUERY_COUNT_BUCKETS)
+        self.seconds_buckets = [0] * len(DB_SECONDS_BUCKETS)
+        # fingerprint -> (slowest time seen, summary), trimmed to the N slowest statements
+        self.slowest = {}
+
+
+class SqlMetrics:
+    """Per-endpoint database statistics collected from cursor events."""
+
+    def __init__(self, slow_statements=5, n_plus_one_threshold=10):
+        self.slow_statements = slow_statements
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, method, profile):
+        """Fold one request's profile in; returns statements repeated past the N+1 threshold."""
+        repeated = [
+            (statement, count) for statement, count in profile['statements'].items()
+            if count > self.n_plus_one_threshold
+        ]
+
+        with self._lock:
+            stats = self._stats.get((endpoint, method))
+            if stats is None:
+                stats = self._stats[(endpoint, method)] = EndpointStats()
+
+            stats.requests += 1
+            stats.queries += profile['count']
+            stats.seconds += profile['seconds']
+            stats.max_queries = max(stats.max_queries, profile['count'])
+            _observe(stats.query_buckets, QUERY_COUNT_BUCKETS, profile['count'])
+            _observe(stats.seconds_buckets, DB_SECONDS_BUCKETS, profile['seconds'])
+            if repeated:
+                stats.n_plus_one += 1
+
+            for seconds, statement in profile['slowest']:
+                fingerprint, summary = statement_fingerprint(statement)
+                if seconds > stats.slowest.get(fingerprint, (0, None))[0]:
+                    stats.slowest[fingerprint] = (seconds, summary)
+            if len(stats.slowest) > self.slow_statements:
+                keep = heapq.nlargest(self.slow_statements, stats.slowest.items(), key=lambda item: item[1][0])
+                stats.slowest = dict(keep)
+
+        return repeated
+
+    def reset(self):
+        with self._lock:
+            self._stats = {}
+
+    def snapshot(self):
+        with self._lock:
+            return {key: (stats.requests, stats.queries, stats.seconds, stats.max_queries,
+                          stats.n_plus_one,
+                          sorted(((seconds, fingerprint, summary)
+                                  for fingerprint, (seconds, summary) in stats.slowest.items()), reverse=True),
+                          list(stats.query_buckets), list(stats.seconds_buckets))
+                    for key, stats in self._stats.items()}
+
+    def render_prometheus(self):
+        snapshot = self.snapshot()
+        lines = []
+
+        def family(name, kind, help_text, index):
+            lines.append(f"# HELP {METRIC_PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{name} {kind}")
+            for (endpoint, method), values in sorted(snapshot.items()):
+                lines.append(f"{METRIC_PREFIX}_{name}{{{_labels(endpoint=endpoint, method=method)}}} {values[index]}")
+
+        def histogram(name, help_text, bounds, buckets_index, sum_index):
+            lines.append(f"# HELP {METRIC_PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{name} histogram")
+            for (endpoint, method), values in sorted(snapshot.items()):
+                labels = _labels(endpoint=endpoint, method=method)
+                cumulative = 0
+                for bound, count in zip(bounds, values[buckets_index]):
+                    cumulative += count
+                    lines.append(f'{METRIC_PREFIX}_{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'{METRIC_PREFIX}_{name}_bucket{{{labels},le="+Inf"}} {values[0]}')
+                lines.append(f'{METRIC_PREFIX}_{name}_sum{{{labels}}} {values[sum_index]}')
+                lines.append(f'{METRIC_PREFIX}_{name}_count{{{labels}}} {values[0]}')
+
+        histogram('queries_per_request', 'SQL statements executed per request.', QUERY_COUNT_BUCKETS, 6, 1)
+        histogram('seconds_per_request', 'Time spent executing SQL statements per request.', DB_SECONDS_BUCKETS, 7, 2)
+        family('max_queries_per_request', 'gauge', 'Most statements executed by a single request.', 3)
+        family('n_plus_one_requests_total', 'counter', 'Requests that repeated one statement past the N+1 threshold.', 4)
+
+        lines.append(f"# HELP {METRIC_PREFIX}_slow_statement_seconds Slowest statements seen per endpoint and method, "
+                     "by fingerprint.")
+        lines.append(f"# TYPE {METRIC_PREFIX}_slow_statement_seconds gauge")
+        for (endpoint, method), values in sorted(snapshot.items()):
+            for rank, (seconds, fingerprint, summary) in enumerate(values[5], start=1):
+                labels = _labels(endpoint=endpoint, method=method, rank=rank, fingerprint=fingerprint, statement=summary)
+                lines.append(f"{METRIC_PREFIX}_slow_statement_seconds{{{labels}}} {seconds:.6f}")
+
+        return '\n'.join(lines) + '\n'
+
+
+def _labels(**labels):
+    def escape(value):
+        return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', ' ')
+    return ','.join(f'{key}="{escape(value)}"' for key, value in labels.items())
+
+
+sql_metrics = SqlMetrics()
+_listeners_installed = False
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context() and '_sql_profile' in g:
+        conn.info.setdefault('_sql_metrics_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if not (has_request_context() and '_sql_profile' in g):
+        return
+    starts = conn.info.get('_sql_metrics_start')
+    if not starts:
+        return
+
+    elapsed = time.perf_counter() - starts.pop()
+    profile = g._sql_profile
+    profile['count'] += 1
+    profile['seconds'] += elapsed
+    profile['statements'][statement] += 1
+
+    slowest = profile['slowest']
+    if len(slowest) < sql_metrics.slow_statements:
+        heapq.heappush(slowest, (elapsed, statement))
+    elif elapsed > slowest[0][0]:
+        heapq.heapreplace(slowest, (elapsed, statement))
+
+
+def init_sql_metrics(app):
+    """Profile SQL per request and serve the totals at /api/_metrics.
+
+    Only called when SQL_METRICS_ENABLED is set; the cursor listeners are
+    attached to every Engine so replica or secondary engines are covered too.
+    """
+    global _listeners_installed
+
+    token = app.config.get('SQL_METRICS_TOKEN')
+    if not token:
+        raise RuntimeError('SQL_METRICS_ENABLED needs SQL_METRICS_TOKEN set; /api/_metrics is never served unauthenticated')
+
+    sql_metrics.slow_statements = app.config.get('SQL_METRICS_SLOW_STATEMENTS', 5)
+    sql_metrics.n_plus_one_threshold = app.config.get('SQL_METRICS_N_PLUS_ONE_THRESHOLD', 10)
+
+    if not _listeners_installed:
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+        _listeners_installed = True
+
+    @app.before_request
+    def start_sql_profile():
+        if request.endpoint != 'sql_metrics_endpoint':
+            g._sql_profile = {'count': 0, 'seconds': 0.0, 'statements': Counter(), 'slowest': []}
+
+    @app.teardown_request
+    def finish_sql_profile(exc):
+        profile = g.pop('_sql_profile', None)
+        if profile is None or request.endpoint is None:
+            return
+
+        repeated = sql_metrics.record(request.endpoint, request.method, profile)
+        for statement, count in repeated:
+            app.logger.warning(
+                "Possible N+1 in %s %s: statement %s ran %s times: %s",
+                request.method, request.endpoint, statement_fingerprint(statement)[0], count,
+                statement[:STATEMENT_LABEL_LENGTH]
+            )
+
+    @app.route('/api/_metrics', endpoint='sql_metrics_endpoint')
+    def metrics():
+        if not hmac.compare_digest(request.headers.get('Authorization', '').encode(), f'Bearer {token}'.encode()):
+            return Response('Unauthorized\n', status=401, mimetype='text/plain')
+        from backend.utils.db_pool import pool_metrics
+        body = sql_metrics.render_prometheus() + pool_metrics.render_prometheus()
+        return Response(body, mimetype='text/plain; version=0.0.4')
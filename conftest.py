@@ -0,0 +1,50 @@
+import pytest
+
+from backend import create_app, db
+from backend.config import Config
+
+
+def _make_app(database_url, seed=False, **config):
+    # Config is read when create_app runs, so overrides only need to last that long
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(Config, 'SQLALCHEMY_DATABASE_URI', database_url)
+        for key, value in config.items():
+            mp.setattr(Config, key, value)
+        app = create_app()
+    app.config['TESTING'] = True
+    if seed:
+        with app.app_context():
+            db.create_all()
+            from backend.db_seed import seed_all
+            seed_all()
+            db.session.remove()
+    return app
+
+
+def _login(client, email):
+    response = client.post('/api/login', json={'email': email, 'password': 'password123'})
+    return {'Authorization': f"Bearer {response.get_json()['token']}"}
+
+
+@pytest.fixture(scope='session')
+def make_app():
+    """``make_app(database_url, seed=False, **config)`` with Config attributes overridden."""
+    return _make_app
+
+
+@pytest.fixture
+def app_config():
+    """Config overrides for ``app``; test modules override this fixture."""
+    return {}
+
+
+@pytest.fixture
+def app(tmp_path, app_config):
+    """An app on a seeded SQLite file of its own."""
+    return _make_app(f"sqlite:///{tmp_path / 'test.db'}", seed=True, **app_config)
+
+
+@pytest.fixture
+def login():
+    """``login(client, email)`` returns Authorization headers for a seeded user."""
+    return _login
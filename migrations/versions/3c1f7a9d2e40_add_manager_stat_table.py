@@ -0,0 +1,30 @@
+"""Add manager_stat table for materialized dashboard counters
+
+Revision ID: 3c1f7a9d2e40
+Revises: b590bff6a25f
+Create Date: 2026-10-18 09:12:44.503118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c1f7a9d2e40'
+down_revision = 'b590bff6a25f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('manager_stat',
+    sa.Column('manager_id', sa.Integer(), nullable=False),
+    sa.Column('key', sa.String(length=64), nullable=False),
+    sa.Column('value', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['manager_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('manager_id', 'key')
+    )
+
+
+def downgrade():
+    op.drop_table('manager_stat')
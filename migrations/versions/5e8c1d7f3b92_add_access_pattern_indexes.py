@@ -0,0 +1,69 @@
+"""Add composite indexes for role-scoped lists and unique assignment/quote pairs
+
+Revision ID: 5e8c1d7f3b92
+Revises: 9a4d6c2b8e15
+Create Date: 2026-10-18 15:41:09.318842
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e8c1d7f3b92'
+down_revision = '9a4d6c2b8e15'
+branch_labels = None
+depends_on = None
+
+# (name, table, columns). Lists page by (created_at, id) DESC; B-tree indexes
+# are scanned backwards for that, so ascending columns serve both directions.
+INDEXES = [
+    ('ix_purchase_order_manager_created', 'purchase_order', ['manager_id', 'created_at', 'id']),
+    ('ix_purchase_order_manager_status', 'purchase_order', ['manager_id', 'status']),
+    ('ix_purchase_order_vendor_created', 'purchase_order', ['vendor_id', 'created_at', 'id']),
+    ('ix_purchase_order_vendor_status', 'purchase_order', ['vendor_id', 'status']),
+    ('ix_quote_vendor_created', 'quote', ['vendor_id', 'created_at', 'id']),
+    ('ix_quote_vendor_status', 'quote', ['vendor_id', 'status']),
+    ('ix_document_order_created', 'document', ['order_id', 'created_at', 'id']),
+    ('ix_order_assignment_staff_assigned', 'order_assignment', ['staff_id', 'assigned_at', 'id']),
+    ('ix_requirement_manager_created', 'requirement', ['manager_id', 'created_at', 'id']),
+]
+
+
+def upgrade():
+    bind = op.get_bind()
+
+    # Repeated assignments of the same staff member to an order carry no extra
+    # information, so keep the earliest one
+    bind.execute(sa.text(
+        'DELETE FROM order_assignment WHERE id NOT IN '
+        '(SELECT MIN(id) FROM order_assignment GROUP BY order_id, staff_id)'
+    ))
+
+    # Duplicate quotes may differ in price or status, so they are left for a person to resolve
+    duplicates = bind.execute(sa.text(
+        'SELECT order_id, vendor_id FROM quote GROUP BY order_id, vendor_id HAVING COUNT(*) > 1'
+    )).fetchall()
+    if duplicates:
+        pairs = ', '.join(f'(order {order_id}, vendor {vendor_id})' for order_id, vendor_id in duplicates[:20])
+        raise RuntimeError(f'Remove duplicate quotes before upgrading: {pairs}')
+
+    with op.batch_alter_table('order_assignment', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_order_assignment_order_staff', ['order_id', 'staff_id'])
+
+    with op.batch_alter_table('quote', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_quote_order_vendor', ['order_id', 'vendor_id'])
+
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    for name, table, columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
+
+    with op.batch_alter_table('quote', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_quote_order_vendor', type_='unique')
+
+    with op.batch_alter_table('order_assignment', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_order_assignment_order_staff', type_='unique')
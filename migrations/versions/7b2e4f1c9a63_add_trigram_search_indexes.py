@@ -0,0 +1,51 @@
+"""Add pg_trgm GIN indexes over searchable columns
+
+Revision ID: 7b2e4f1c9a63
+Revises: 3c1f7a9d2e40
+Create Date: 2026-10-18 10:02:17.264901
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7b2e4f1c9a63'
+down_revision = '3c1f7a9d2e40'
+branch_labels = None
+depends_on = None
+
+# The free-text __searchable__ columns of Vendor, PurchaseOrder, Quote and Requirement;
+# status columns are left out (see TRIGRAM_SKIP_FIELDS in search_service)
+SEARCH_COLUMNS = [
+    ('vendor', 'name'),
+    ('vendor', 'email'),
+    ('vendor', 'company_name'),
+    ('vendor', 'contact_person'),
+    ('purchase_order', 'order_number'),
+    ('quote', 'notes'),
+    ('requirement', 'item_name'),
+    ('requirement', 'specifications'),
+]
+
+
+def upgrade():
+    # Trigram indexes are PostgreSQL-only; other dialects keep plain ILIKE scans
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for table, column in SEARCH_COLUMNS:
+        op.create_index(
+            f'ix_{table}_{column}_trgm', table, [column],
+            postgresql_using='gin',
+            postgresql_ops={column: 'gin_trgm_ops'}
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for table, column in reversed(SEARCH_COLUMNS):
+        op.drop_index(f'ix_{table}_{column}_trgm', table_name=table)
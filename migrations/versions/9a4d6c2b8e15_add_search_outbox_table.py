@@ -0,0 +1,39 @@
+"""Add search_outbox table for queued Algolia index changes
+
+Revision ID: 9a4d6c2b8e15
+Revises: 7b2e4f1c9a63
+Create Date: 2026-10-18 13:05:21.774310
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a4d6c2b8e15'
+down_revision = '7b2e4f1c9a63'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('search_outbox',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('object_id', sa.String(length=64), nullable=False),
+    sa.Column('action', sa.String(length=10), nullable=False),
+    sa.Column('payload', sa.Text(), nullable=True),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('search_outbox', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_search_outbox_next_attempt_at'), ['next_attempt_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('search_outbox', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_search_outbox_next_attempt_at'))
+
+    op.drop_table('search_outbox')
@@ -0,0 +1,68 @@
+"""Add updated_at to documents and assignments, and the sync_tombstone table
+
+Revision ID: c4f2a8e61d07
+Revises: 5e8c1d7f3b92
+Create Date: 2026-10-18 17:12:40.512093
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4f2a8e61d07'
+down_revision = '5e8c1d7f3b92'
+branch_labels = None
+depends_on = None
+
+# (table, column existing rows take their updated_at from)
+UPDATED_AT = [
+    ('document', 'created_at'),
+    ('order_assignment', 'assigned_at'),
+]
+
+INDEXES = [
+    ('ix_purchase_order_manager_updated', 'purchase_order', ['manager_id', 'updated_at', 'id']),
+    ('ix_purchase_order_vendor_updated', 'purchase_order', ['vendor_id', 'updated_at', 'id']),
+    ('ix_quote_vendor_updated', 'quote', ['vendor_id', 'updated_at', 'id']),
+]
+
+
+def upgrade():
+    for table, source in UPDATED_AT:
+        op.add_column(table, sa.Column('updated_at', sa.DateTime(), nullable=True))
+        op.execute(f'UPDATE {table} SET updated_at = COALESCE({source}, CURRENT_TIMESTAMP)')
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.alter_column('updated_at', existing_type=sa.DateTime(), server_default=sa.func.now())
+
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+    op.create_table('sync_tombstone',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('object_type', sa.String(length=20), nullable=False),
+    sa.Column('object_id', sa.Integer(), nullable=False),
+    sa.Column('order_id', sa.Integer(), nullable=True),
+    sa.Column('manager_id', sa.Integer(), nullable=True),
+    sa.Column('vendor_id', sa.Integer(), nullable=True),
+    sa.Column('staff_id', sa.Integer(), nullable=True),
+    sa.Column('deleted_at', sa.DateTime(), server_default=sa.func.now(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('sync_tombstone', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_sync_tombstone_deleted_at'), ['deleted_at'], unique=False)
+        batch_op.create_index('ix_sync_tombstone_manager_deleted', ['manager_id', 'deleted_at', 'id'], unique=False)
+        batch_op.create_index('ix_sync_tombstone_vendor_deleted', ['vendor_id', 'deleted_at', 'id'], unique=False)
+        batch_op.create_index('ix_sync_tombstone_staff_deleted', ['staff_id', 'deleted_at', 'id'], unique=False)
+        batch_op.create_index('ix_sync_tombstone_order', ['order_id'], unique=False)
+
+
+def downgrade():
+    op.drop_table('sync_tombstone')
+
+    for name, table, columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
+
+    for table, _ in reversed(UPDATED_AT):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_column('updated_at')
@@ -0,0 +1,44 @@
+"""Add email_job table for queued notification emails
+
+Revision ID: e7a9b3c5d214
+Revises: c4f2a8e61d07
+Create Date: 2026-10-18 19:36:02.145718
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7a9b3c5d214'
+down_revision = 'c4f2a8e61d07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('email_job',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('recipient', sa.String(length=255), nullable=False),
+    sa.Column('template', sa.String(length=50), nullable=False),
+    sa.Column('context', sa.Text(), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('claim_token', sa.String(length=32), nullable=True),
+    sa.Column('locked_at', sa.DateTime(), nullable=True),
+    sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('email_job', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_email_job_claim_token'), ['claim_token'], unique=False)
+        batch_op.create_index('ix_email_job_status_next_attempt', ['status', 'next_attempt_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('email_job', schema=None) as batch_op:
+        batch_op.drop_index('ix_email_job_status_next_attempt')
+        batch_op.drop_index(batch_op.f('ix_email_job_claim_token'))
+
+    op.drop_table('email_job')
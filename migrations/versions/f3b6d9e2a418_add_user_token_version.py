@@ -0,0 +1,26 @@
+"""Add user.token_version so identity claims can be revoked across workers
+
+Revision ID: f3b6d9e2a418
+Revises: e7a9b3c5d214
+Create Date: 2026-10-18 21:04:51.602731
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3b6d9e2a418'
+down_revision = 'e7a9b3c5d214'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('token_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_column('token_version')
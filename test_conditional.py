@@ -0,0 +1,37 @@
+import pytest
+
+from backend import db
+from backend.models import PurchaseOrder, Quote, Vendor
+
+
+def _bump(app, model, **values):
+    # Seconds-resolution CURRENT_TIMESTAMP on SQLite: set updated_at explicitly so the change is visible
+    with app.app_context():
+        row = model.query.filter_by(**values.pop('where')).first()
+        for key, value in values.items():
+            setattr(row, key, value)
+        row.updated_at = db.func.datetime('now', '+1 hour')
+        db.session.commit()
+
+
+@pytest.mark.parametrize('email', ['manager@example.com', 'vendor@example.com'])
+def test_quote_list_etag_follows_embedded_order_and_vendor(app, email, login):
+    client = app.test_client()
+    headers = login(client, email)
+    with app.app_context():
+        quote = Quote.query.join(Vendor).filter(Vendor.email == 'vendor@example.com').first()
+        order_id, vendor_id = quote.order_id, quote.vendor_id
+
+    first = client.get('/api/quotes', headers=headers)
+    etag = first.headers['ETag']
+    assert client.get('/api/quotes', headers=dict(headers, **{'If-None-Match': etag})).status_code == 304
+
+    _bump(app, PurchaseOrder, where={'id': order_id}, status='ordered')
+    second = client.get('/api/quotes', headers=dict(headers, **{'If-None-Match': etag}))
+    assert second.status_code == 200
+    assert second.headers['ETag'] != etag
+
+    _bump(app, Vendor, where={'id': vendor_id}, name='Renamed Vendor')
+    third = client.get('/api/quotes', headers=dict(headers, **{'If-None-Match': second.headers['ETag']}))
+    assert third.status_code == 200
+    assert 'Renamed Vendor' in {quote['vendor_name'] for quote in third.get_json()['quotes']}
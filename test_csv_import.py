@@ -0,0 +1,67 @@
+from flask_jwt_extended import verify_jwt_in_request
+
+from backend import db
+from backend.models import Role, User, Vendor
+from backend.services.csv_import import import_vendors
+from backend.utils import principal
+from backend.utils.principal import PrincipalCache, get_current_principal
+
+
+def test_rows_from_a_failed_chunk_can_be_retried_later_in_the_file(app, monkeypatch):
+    lines = [
+        'name,email',
+        'Acme,acme@example.com',
+        'Bolt Co,bolt@example.com',
+        'Acme again,acme@example.com',
+        'Bolt Co,bolt@example.com',
+    ]
+    real_bulk_insert = db.session.bulk_insert_mappings
+    calls = []
+
+    def bulk_insert_mappings(*args, **kwargs):
+        calls.append(args)
+        if len(calls) == 1:
+            raise RuntimeError('connection reset')
+        return real_bulk_insert(*args, **kwargs)
+
+    with app.app_context():
+        monkeypatch.setattr(db.session, 'bulk_insert_mappings', bulk_insert_mappings)
+        report = import_vendors(lines, chunk_size=2).to_dict()
+
+        assert report['imported'] == 2
+        assert [error['row'] for error in report['errors']] == [2, 3]
+        assert Vendor.query.filter_by(email='acme@example.com').one().name == 'Acme again'
+
+
+def test_duplicates_within_and_across_chunks(app):
+    lines = ['name,email', 'A,dup@example.com', 'B,dup@example.com', 'C,dup@example.com']
+    with app.app_context():
+        report = import_vendors(lines, chunk_size=2, dry_run=True).to_dict()
+    assert report['imported'] == 1
+    assert [(error['row'], error['message']) for error in report['errors']] == [
+        (3, 'Duplicate email in file'), (4, 'Duplicate email in file')
+    ]
+
+
+def test_imported_vendor_revokes_claims_in_other_workers(app, login, monkeypatch):
+    app.config['JWT_IDENTITY_CLAIMS'] = True
+    # Every token is old enough to be checked against token_version
+    app.config['JWT_CLAIMS_MAX_AGE'] = 0
+    with app.app_context():
+        user = User(email='newvendor@example.com', first_name='New', last_name='Vendor',
+                    role_id=Role.query.filter_by(name='vendor').first().id)
+        user.set_password('password123')
+        db.session.add(user)
+        db.session.commit()
+    client = app.test_client()
+    headers = login(client, 'newvendor@example.com')
+
+    with app.app_context():
+        assert import_vendors(['name,email', 'New Vendor,newvendor@example.com']).to_dict()['imported'] == 1
+        vendor_id = Vendor.query.filter_by(email='newvendor@example.com').one().id
+
+    # Another worker never saw this process's in-memory invalidation
+    monkeypatch.setattr(principal, 'principal_cache', PrincipalCache())
+    with app.test_request_context('/api/quotes', headers=headers):
+        verify_jwt_in_request()
+        assert get_current_principal().vendor_id == vendor_id
@@ -0,0 +1,84 @@
+from datetime import datetime
+
+import pytest
+
+from backend import db
+from backend.models import EmailJob, PurchaseOrder, Quote, Vendor
+from backend.services.email_jobs import EmailWorker, InMemoryMailSink
+
+
+@pytest.fixture
+def app_config():
+    return {'EMAIL_NOTIFICATIONS_ENABLED': True}
+
+
+def _accept_pending_quote(app, login):
+    client = app.test_client()
+    with app.app_context():
+        quote = Quote.query.filter_by(status='pending').first()
+        quote_id, vendor_email = quote.id, quote.vendor.email
+    response = client.patch(f'/api/quotes/{quote_id}', headers=login(client, 'manager@example.com'),
+                            json={'status': 'accepted'})
+    assert response.status_code == 200, response.get_json()
+    return vendor_email
+
+
+def test_quote_acceptance_is_batched_per_recipient(app, login):
+    vendor_email = _accept_pending_quote(app, login)
+
+    with app.app_context():
+        # The vendor hears about the quote and the order moving to 'ordered'; the manager made the change
+        jobs = EmailJob.query.all()
+        assert {(job.recipient, job.template) for job in jobs} == {
+            (vendor_email, 'quote_accepted'), (vendor_email, 'order_status')
+        }
+
+        sink = InMemoryMailSink()
+        stats = EmailWorker(sink, threads=2).drain()
+        assert stats == {'sent': 2, 'emails': 1, 'retried': 0, 'failed': 0}
+        [message] = sink.messages
+        assert message['to'] == vendor_email
+        assert message['subject'] == '2 updates from VendorSync'
+        assert EmailJob.query.count() == 0
+
+
+def test_failed_sends_back_off_and_give_up(app, login):
+    vendor_email = _accept_pending_quote(app, login)
+
+    with app.app_context():
+        worker = EmailWorker(InMemoryMailSink(failing=[vendor_email]), max_attempts=2, backoff=60)
+        assert worker.drain() == {'sent': 0, 'emails': 0, 'retried': 2, 'failed': 0}
+        jobs = EmailJob.query.all()
+        assert all(job.status == 'pending' and job.attempts == 1 for job in jobs)
+        assert all(job.next_attempt_at > datetime.utcnow() for job in jobs)
+
+        # Not due yet, so nothing is claimed
+        assert worker.drain()['retried'] == 0
+
+        EmailJob.query.update({EmailJob.next_attempt_at: datetime.utcnow()})
+        db.session.commit()
+        assert worker.drain()['failed'] == 2
+        assert {job.status for job in EmailJob.query.all()} == {'failed'}
+
+
+def test_nothing_is_queued_when_disabled(app, login):
+    app.config['EMAIL_NOTIFICATIONS_ENABLED'] = False
+    _accept_pending_quote(app, login)
+    with app.app_context():
+        assert EmailJob.query.count() == 0
+
+
+def test_order_status_change_emails_everyone_else(app, login):
+    client = app.test_client()
+    with app.app_context():
+        vendor = Vendor.query.filter_by(email='vendor@example.com').first()
+        order_id = PurchaseOrder.query.filter_by(vendor_id=vendor.id, status='pending').first().id
+
+    response = client.patch(f'/api/orders/{order_id}', headers=login(client, 'vendor@example.com'),
+                            json={'status': 'cancelled'})
+    assert response.status_code == 200, response.get_json()
+
+    with app.app_context():
+        assert [(job.recipient, job.template) for job in EmailJob.query.all()] == [
+            ('manager@example.com', 'order_status')
+        ]
@@ -0,0 +1,107 @@
+import json
+
+import pytest
+
+from backend import db
+
+
+@pytest.fixture
+def app_config():
+    # Short streams: each request replays what the broker holds and then ends
+    return {'EVENTS_KEEPALIVE_SECONDS': 0.05, 'EVENTS_MAX_STREAM_SECONDS': 0.2}
+
+
+def _events(client, headers, last_event_id='0'):
+    response = client.get('/api/events', headers=dict(headers, **{'Last-Event-ID': last_event_id}))
+    assert response.status_code == 200, response.get_data(as_text=True)
+    events = []
+    for frame in response.get_data(as_text=True).split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in frame.splitlines() if ': ' in line and not line.startswith(':'))
+        if 'event' in fields:
+            events.append({'id': fields['id'], 'type': fields['event'], 'data': json.loads(fields['data'])})
+    return events
+
+
+def _order_for(app, vendor_email):
+    from backend.models import PurchaseOrder, Vendor
+    with app.app_context():
+        vendor_id = Vendor.query.filter_by(email=vendor_email).first().id
+        return PurchaseOrder.query.filter_by(vendor_id=vendor_id, status='pending').first().id
+
+
+def test_order_status_change_reaches_scoped_subscribers(app, login):
+    client = app.test_client()
+    manager = login(client, 'manager@example.com')
+    order_id = _order_for(app, 'vendor@example.com')
+
+    response = client.patch(f'/api/orders/{order_id}', headers=manager, json={'status': 'cancelled'})
+    assert response.status_code == 200, response.get_json()
+
+    [event] = _events(client, login(client, 'vendor@example.com'))
+    assert event['type'] == 'order.status_changed'
+    assert event['data']['order_id'] == order_id
+    assert (event['data']['previous_status'], event['data']['status']) == ('pending', 'cancelled')
+    assert len(_events(client, manager)) == 1
+    # The staff member is not assigned to this order
+    assert _events(client, login(client, 'staff@example.com')) == []
+
+
+def test_bulk_quote_decisions_publish_events(app, login):
+    from backend.models import Quote
+    client = app.test_client()
+    manager = login(client, 'manager@example.com')
+    with app.app_context():
+        quote = Quote.query.filter_by(status='pending').first()
+        quote_id, order_id = quote.id, quote.order_id
+
+    response = client.post('/api/quotes/decisions', headers=manager, json={
+        'decisions': [{'quote_id': quote_id, 'status': 'accepted'}]
+    })
+    assert response.status_code == 200, response.get_json()
+
+    events = {(event['type'], event['data'].get('quote_id', event['data']['order_id'])) for event in _events(client, manager)}
+    assert ('quote.status_changed', quote_id) in events
+    assert ('order.status_changed', order_id) in events
+
+
+def test_rolled_back_changes_are_not_published(app):
+    from backend.models import PurchaseOrder
+    with app.app_context():
+        order = PurchaseOrder.query.first()
+        order.status = 'completed'
+        db.session.flush()
+        db.session.rollback()
+        assert app.extensions['event_broker'].last_id() == '0'
+
+
+def test_resume_from_last_event_id(app, login):
+    client = app.test_client()
+    manager = login(client, 'manager@example.com')
+    order_id = _order_for(app, 'vendor@example.com')
+    for status in ('ordered', 'delivered'):
+        client.patch(f'/api/orders/{order_id}', headers=manager, json={'status': status})
+
+    first, second = _events(client, manager)
+    assert [event['id'] for event in _events(client, manager, first['id'])] == [second['id']]
+
+    # Ids from before a restart cannot be resumed; the client is told to refetch
+    [resync] = _events(client, manager, '99')
+    assert resync['type'] == 'resync'
+    assert client.get('/api/events', headers=dict(manager, **{'Last-Event-ID': 'nope'})).status_code == 400
+
+
+def test_only_stream_tokens_are_accepted_in_the_url(app, login):
+    client = app.test_client()
+    manager = login(client, 'manager@example.com')
+    login_token = manager['Authorization'].split()[1]
+    assert client.get('/api/events', query_string={'jwt': login_token}).status_code == 401
+
+    response = client.post('/api/events/token', headers=manager)
+    assert response.status_code == 200
+    stream_token = response.get_json()['token']
+    assert client.get('/api/events', query_string={'jwt': stream_token}).status_code == 200
+
+    # A leaked stream token opens streams and nothing else
+    stream_headers = {'Authorization': f'Bearer {stream_token}'}
+    assert client.get('/api/orders', headers=stream_headers).status_code == 401
+    assert client.post('/api/events/token', headers=stream_headers).status_code == 401
@@ -0,0 +1,52 @@
+import pytest
+
+from backend import db
+from backend.models import ManagerStat, PurchaseOrder, Quote, Requirement, Role, User
+from backend.models.manager_stat import rebuild_manager_stats
+
+
+@pytest.fixture
+def app_config():
+    return {'DASHBOARD_COUNTERS_ENABLED': True}
+
+
+@pytest.fixture
+def app(app):
+    with app.app_context():
+        rebuild_manager_stats()
+        db.session.remove()
+    return app
+
+
+def _all_counts():
+    return {(stat.manager_id, stat.key): stat.value for stat in ManagerStat.query.all() if stat.value}
+
+
+def test_counters_follow_ownership_changes(app):
+    with app.app_context():
+        manager = User.query.filter_by(email='manager@example.com').first()
+        other = User(email='manager2@example.com', password_hash='x', first_name='Second', last_name='Manager',
+                     role_id=Role.query.filter_by(name='manager').first().id)
+        db.session.add(other)
+        db.session.commit()
+
+        order = PurchaseOrder.query.filter_by(manager_id=manager.id).join(Quote.order).filter(
+            Quote.status == 'pending'
+        ).first()
+        order.manager_id = other.id
+        Requirement.query.filter_by(manager_id=manager.id).first().manager_id = other.id
+        db.session.commit()
+
+        # Move a pending quote back onto one of the first manager's orders
+        quote = Quote.query.filter_by(order_id=order.id, status='pending').first()
+        quoted = db.session.query(Quote.order_id).filter(Quote.vendor_id == quote.vendor_id)
+        quote.order_id = PurchaseOrder.query.filter(
+            PurchaseOrder.manager_id == manager.id, PurchaseOrder.id.notin_(quoted)
+        ).first().id
+        db.session.commit()
+
+        maintained = _all_counts()
+        assert maintained[(other.id, 'orders')] == 1
+        assert maintained[(other.id, 'requirements')] == 1
+        rebuild_manager_stats()
+        assert maintained == _all_counts()
@@ -0,0 +1,41 @@
+from backend import db
+from backend.models import PurchaseOrder, User, Vendor
+
+
+def _walk(client, headers, url):
+    ids, cursor = [], None
+    while True:
+        response = client.get(url, headers=headers, query_string={'limit': 2, **({'cursor': cursor} if cursor else {})})
+        assert response.status_code == 200, response.get_json()
+        body = response.get_json()
+        ids.extend(order['id'] for order in body['orders'])
+        cursor = body['next_cursor']
+        if not cursor:
+            return ids
+        assert len(ids) < 100
+
+
+def test_orders_created_in_the_same_second_page_through_once(app, login):
+    with app.app_context():
+        manager = User.query.filter_by(email='manager@example.com').first()
+        vendor = Vendor.query.first()
+        orders = [PurchaseOrder(order_number=f'PO-SAME-{i}', status='pending', manager_id=manager.id, vendor_id=vendor.id)
+                  for i in range(4)]
+        db.session.add_all(orders)
+        db.session.flush()
+        # Stored the way the CURRENT_TIMESTAMP default stores it: text without a fraction
+        PurchaseOrder.query.filter(PurchaseOrder.id.in_([order.id for order in orders])).update(
+            {PurchaseOrder.created_at: db.func.datetime('now', '+1 hour')}, synchronize_session=False
+        )
+        db.session.add(PurchaseOrder(order_number='PO-NO-DATE', status='pending', manager_id=manager.id, vendor_id=vendor.id,
+                                     created_at=None))
+        db.session.commit()
+        # Newest first, NULL created_at last
+        expected = [order.id for order in PurchaseOrder.query.filter_by(manager_id=manager.id).order_by(
+            PurchaseOrder.created_at.is_(None), PurchaseOrder.created_at.desc(), PurchaseOrder.id.desc()
+        )]
+
+    client = app.test_client()
+    ids = _walk(client, login(client, 'manager@example.com'), '/api/orders')
+    assert ids == expected
+    assert ids[:4] == sorted((order.id for order in orders), reverse=True)
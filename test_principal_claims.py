@@ -0,0 +1,95 @@
+import time
+
+import pytest
+
+from backend import db
+from backend.utils import principal
+from backend.utils.principal import principal_cache
+from backend.utils.query_counter import count_queries
+
+
+class _Clock:
+    def __init__(self):
+        self.offset = 0
+
+    def time(self):
+        return time.time() + self.offset
+
+    def monotonic(self):
+        return time.monotonic() + self.offset
+
+
+@pytest.fixture
+def app_config():
+    return {'JWT_IDENTITY_CLAIMS': True}
+
+
+@pytest.fixture(autouse=True)
+def clear_principal_cache():
+    principal_cache.invalidate()
+
+
+def _deactivate_elsewhere(app, email):
+    # Another worker's write: the row changes and token_version is bumped,
+    # but this process's principal cache never hears about it
+    from backend.models import User
+    with app.app_context():
+        db.session.execute(
+            User.__table__.update().where(User.email == email).values(
+                is_active=False, token_version=User.__table__.c.token_version + 1
+            )
+        )
+        db.session.commit()
+
+
+def test_stale_claims_are_refused_after_max_age(app, login):
+    app.config['JWT_CLAIMS_MAX_AGE'] = 0
+    client = app.test_client()
+    manager = login(client, 'manager@example.com')
+    assert client.get('/api/orders', headers=manager).status_code == 200
+
+    _deactivate_elsewhere(app, 'manager@example.com')
+    assert client.get('/api/orders', headers=manager).status_code == 403
+
+
+def test_fresh_claims_skip_the_version_check(app, login):
+    app.config['JWT_CLAIMS_MAX_AGE'] = 3600
+    client = app.test_client()
+    manager = login(client, 'manager@example.com')
+
+    _deactivate_elsewhere(app, 'manager@example.com')
+    assert client.get('/api/orders', headers=manager).status_code == 200
+
+
+def test_old_claims_check_token_version_once_per_max_age(app, login, monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(principal, 'time', clock)
+    app.config['JWT_CLAIMS_MAX_AGE'] = 60
+    client = app.test_client()
+    manager = login(client, 'manager@example.com')
+    clock.offset = 120
+
+    def version_queries():
+        with app.app_context():
+            with count_queries() as counter:
+                assert client.get('/api/orders', headers=manager).status_code == 200
+        return sum(statement.startswith('SELECT user.token_version') for statement in counter.statements)
+
+    assert version_queries() == 1
+    assert version_queries() == 0
+
+    # Another worker's change is honoured once the checked version is older than JWT_CLAIMS_MAX_AGE
+    _deactivate_elsewhere(app, 'manager@example.com')
+    assert client.get('/api/orders', headers=manager).status_code == 200
+    clock.offset += 61
+    assert client.get('/api/orders', headers=manager).status_code == 403
+
+
+def test_role_change_bumps_token_version(app):
+    from backend.models import Role, User
+    with app.app_context():
+        user = User.query.filter_by(email='staff@example.com').first()
+        before = user.token_version
+        user.role_id = Role.query.filter_by(name='manager').first().id
+        db.session.commit()
+        assert user.token_version == before + 1
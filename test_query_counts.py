@@ -0,0 +1,94 @@
+import pytest
+
+from backend import db
+from backend.utils.query_counter import count_queries
+
+
+def _add_quotes(count):
+    """Add ``count`` orders, each quoted by the seeded vendor and by a vendor of its own."""
+    from backend.models import PurchaseOrder, Quote, User, Vendor
+
+    manager = User.query.filter_by(email='manager@example.com').first()
+    seeded_vendor = Vendor.query.filter_by(email='vendor@example.com').first()
+    start = PurchaseOrder.query.count()
+    for i in range(start, start + count):
+        vendor = Vendor(name=f'Query Count Vendor {i}', email=f'qc-vendor-{i}@example.com')
+        order = PurchaseOrder(order_number=f'PO-NPLUS1-{i}', status='pending', manager_id=manager.id, vendor_id=seeded_vendor.id)
+        db.session.add_all([vendor, order])
+        db.session.flush()
+        db.session.add(Quote(vendor_id=seeded_vendor.id, order_id=order.id, price=10, status='pending'))
+        db.session.add(Quote(vendor_id=vendor.id, order_id=order.id, price=12, status='pending'))
+    db.session.commit()
+
+
+def _list_query_count(app, client, headers, url):
+    with app.app_context():
+        with count_queries() as counter:
+            response = client.get(url, headers=headers)
+    assert response.status_code == 200, response.get_json()
+    return counter.count, len(response.get_json()['quotes'])
+
+
+@pytest.mark.parametrize('email', ['manager@example.com', 'vendor@example.com'])
+@pytest.mark.parametrize('url', ['/api/quotes?per_page=100', '/api/quotes?limit=100'])
+def test_quote_list_query_count_does_not_grow_with_rows(app, email, url, login):
+    client = app.test_client()
+    headers = login(client, email)
+
+    before, rows_before = _list_query_count(app, client, headers, url)
+    with app.app_context():
+        _add_quotes(15)
+    after, rows_after = _list_query_count(app, client, headers, url)
+
+    assert rows_after > rows_before
+    assert after == before
+
+
+def test_quote_patch_indexes_without_loading_relations(app, login):
+    from backend.models import Quote, User
+
+    app.config['ALGOLIA_ENABLED'] = True
+    client = app.test_client()
+    headers = login(client, 'manager@example.com')
+    with app.app_context():
+        manager = User.query.filter_by(email='manager@example.com').first()
+        quote_id = Quote.query.join(Quote.order).filter_by(manager_id=manager.id).filter(
+            Quote.status == 'pending'
+        ).first().id
+        with count_queries() as counter:
+            response = client.patch(f'/api/quotes/{quote_id}', headers=headers, json={'status': 'rejected'})
+    assert response.status_code == 200, response.get_json()
+
+    statements = counter.statements
+    queued = [i for i, statement in enumerate(statements) if statement.startswith('INSERT INTO search_outbox')]
+    assert queued
+    # The vendor is only read for the response, after the flush has queued the index change
+    assert all(i > max(queued) for i, statement in enumerate(statements) if statement.startswith('SELECT vendor.'))
+
+
+def _decision_query_count(app, client, headers, quote_ids):
+    with app.app_context():
+        with count_queries() as counter:
+            response = client.post('/api/quotes/decisions', headers=headers, json={
+                'decisions': [{'quote_id': quote_id, 'status': 'rejected'} for quote_id in quote_ids]
+            })
+    assert response.status_code == 200, response.get_json()
+    return counter.count
+
+
+def test_quote_decisions_query_count_does_not_grow_with_quotes(app, login):
+    from backend.models import Quote, User
+
+    app.config['ALGOLIA_ENABLED'] = True
+    client = app.test_client()
+    headers = login(client, 'manager@example.com')
+    with app.app_context():
+        _add_quotes(6)
+        manager = User.query.filter_by(email='manager@example.com').first()
+        quote_ids = [quote.id for quote in Quote.query.join(Quote.order).filter_by(manager_id=manager.id).filter(
+            Quote.status == 'pending'
+        )]
+    assert len(quote_ids) >= 6
+
+    assert _decision_query_count(app, client, headers, quote_ids[:1]) == \
+        _decision_query_count(app, client, headers, quote_ids[1:6])
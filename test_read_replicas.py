@@ -0,0 +1,75 @@
+import shutil
+
+import pytest
+
+from backend import db
+from backend.utils.db_routing import recent_writers
+
+
+@pytest.fixture(scope='module')
+def databases(make_app, tmp_path_factory):
+    directory = tmp_path_factory.mktemp('replicas')
+    primary, replica = directory / 'primary.db', directory / 'replica.db'
+    make_app(f'sqlite:///{primary}', seed=True)
+    # The replica starts as a snapshot of the seeded primary; later writes never reach it
+    shutil.copyfile(primary, replica)
+    return primary, replica
+
+
+def _replicated_app(make_app, databases, **config):
+    primary, replica = databases
+    return make_app(f'sqlite:///{primary}', DB_REPLICA_URLS=[f'sqlite:///{replica}'], **config)
+
+
+@pytest.fixture
+def app(make_app, databases):
+    return _replicated_app(make_app, databases)
+
+
+@pytest.fixture(autouse=True)
+def clear_recent_writers():
+    recent_writers.clear()
+    yield
+    recent_writers.clear()
+
+
+def _requirement_names(client, headers):
+    response = client.get('/api/requirements', headers=headers)
+    assert response.status_code == 200, response.get_json()
+    return {requirement['item_name'] for requirement in response.get_json()['requirements']}
+
+
+def test_get_handlers_read_from_replica(app, login):
+    from backend.models import Requirement, User
+
+    client = app.test_client()
+    headers = login(client, 'manager@example.com')
+    with app.app_context():
+        manager = User.query.filter_by(email='manager@example.com').first()
+        db.session.add(Requirement(item_name='Primary only', quantity=1, manager_id=manager.id))
+        db.session.commit()
+
+    assert 'Primary only' not in _requirement_names(client, headers)
+
+
+def test_reads_after_own_write_stay_on_primary(app, login):
+    client = app.test_client()
+    manager = login(client, 'manager@example.com')
+
+    response = client.post('/api/requirements', headers=manager, json={'item_name': 'Just written', 'quantity': 3})
+    assert response.status_code == 201, response.get_json()
+    assert 'Just written' in _requirement_names(client, manager)
+
+    # Once the window has passed the replica serves the reads again
+    recent_writers.clear()
+    assert 'Just written' not in _requirement_names(client, manager)
+
+
+def test_excluded_endpoint_reads_from_primary(make_app, databases, login):
+    app = _replicated_app(make_app, databases, DB_REPLICA_EXCLUDE=['requirementresource'])
+    client = app.test_client()
+    manager = login(client, 'manager@example.com')
+    client.post('/api/requirements', headers=manager, json={'item_name': 'Excluded read', 'quantity': 1})
+    recent_writers.clear()
+
+    assert 'Excluded read' in _requirement_names(client, manager)
@@ -0,0 +1,43 @@
+import pytest
+
+from backend.services import search_service
+from backend.services.search_service import LocalSearchIndex
+
+
+@pytest.fixture
+def app_config():
+    return {'SEARCH_BACKEND': 'local'}
+
+
+def test_changes_committed_during_a_rebuild_survive_the_swap(app, monkeypatch):
+    index = LocalSearchIndex()
+    real_search_document = search_service.search_document
+    late = {'id': 999, 'type': 'vendor', 'name': 'Zebra Supplies'}
+
+    def search_document(type_name, obj):
+        # Another request commits while the rebuild is still reading rows
+        if type_name == 'vendor' and not index._journal:
+            index.index('vendor', 999, (['zebra', 'supplies'], late))
+        return real_search_document(type_name, obj)
+
+    monkeypatch.setattr(search_service, 'search_document', search_document)
+    with app.app_context():
+        index.rebuild()
+        total, results = index.search('zebra')
+    assert total == 1
+    assert results[0]['name'] == 'Zebra Supplies'
+    assert index._journal is None
+
+
+def test_stale_index_is_replaced_not_cleared(app):
+    index = LocalSearchIndex()
+    with app.app_context():
+        index.ensure_built()
+        documents = index._documents
+        assert documents
+        app.config['SEARCH_INDEX_MAX_AGE'] = 1
+        index.built_at -= 2
+        index.ensure_built()
+    # The old structures are left intact for any search still holding them
+    assert index._documents is not documents
+    assert index._documents == documents
@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta
+
+from backend import db
+from backend.models import Document, OrderAssignment, PurchaseOrder, Quote, User
+from backend.resources.sync import SYNC_STREAMS, encode_sync_token
+
+
+def _sync(client, headers, since=None, limit=None):
+    params = {key: value for key, value in (('since', since), ('limit', limit)) if value is not None}
+    response = client.get('/api/sync', headers=headers, query_string=params)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+def test_order_delete_reaches_each_role_in_scope(app, login):
+    client = app.test_client()
+    # PO-2025-002 belongs to vendor2 and is assigned to staff@example.com
+    with app.app_context():
+        order = PurchaseOrder.query.filter_by(order_number='PO-2025-002').first()
+        order.status = 'pending'
+        db.session.commit()
+        order_id = order.id
+        assignment_ids = [assignment.id for assignment in order.assignments]
+        quote_ids = [quote.id for quote in order.quotes]
+    assert assignment_ids and quote_ids
+
+    emails = ['manager@example.com', 'vendor2@example.com', 'staff@example.com', 'vendor@example.com', 'staff2@example.com']
+    headers = {email: login(client, email) for email in emails}
+    tokens = {email: _sync(client, headers[email])['next_token'] for email in emails}
+
+    manager = headers['manager@example.com']
+    assert client.delete(f'/api/orders/{order_id}', headers=manager).status_code == 200
+
+    deleted = {email: _sync(client, headers[email], tokens[email])['deleted'] for email in emails}
+    assert deleted['manager@example.com']['orders'] == [order_id]
+    assert sorted(deleted['manager@example.com']['quotes']) == sorted(quote_ids)
+    assert deleted['manager@example.com']['assignments'] == assignment_ids
+
+    assert deleted['vendor2@example.com']['orders'] == [order_id]
+    assert deleted['vendor2@example.com']['assignments'] == []
+
+    assert deleted['staff@example.com']['orders'] == [order_id]
+    assert deleted['staff@example.com']['assignments'] == assignment_ids
+
+    # Neither the other vendor nor the other staff member could see this order
+    for email in ('vendor@example.com', 'staff2@example.com'):
+        assert all(ids == [] for ids in deleted[email].values()), email
+
+
+def test_has_more_pages_through_every_row(app, login):
+    client = app.test_client()
+    manager = login(client, 'manager@example.com')
+    with app.app_context():
+        expected = {order.id for order in PurchaseOrder.query.filter(PurchaseOrder.manager_id.isnot(None))}
+
+    seen, since, pages = set(), None, 0
+    while True:
+        page = _sync(client, manager, since, limit=1)
+        assert len(page['orders']) <= 1
+        seen.update(order['id'] for order in page['orders'])
+        since, pages = page['next_token'], pages + 1
+        if not page['has_more']:
+            break
+        assert pages < 50
+    assert seen == expected
+    assert pages > 1
+
+    # Every row is still inside the overlap window; re-reading it must not start paging again
+    again = _sync(client, manager, since, limit=1)
+    assert again['has_more'] is False
+
+
+def test_malformed_token_is_rejected(app, login):
+    client = app.test_client()
+    response = client.get('/api/sync', headers=login(client, 'manager@example.com'), query_string={'since': 'not-a-token'})
+    assert response.status_code == 400
+
+
+def test_token_older_than_tombstone_retention_has_expired(app, login):
+    client = app.test_client()
+    stale = datetime.utcnow() - timedelta(days=app.config['SYNC_TOMBSTONE_RETENTION_DAYS'] + 1)
+    token = encode_sync_token({stream: ((stale, 0), None) for stream in SYNC_STREAMS})
+    response = client.get('/api/sync', headers=login(client, 'manager@example.com'), query_string={'since': token})
+    assert response.status_code == 410
+
+
+def test_new_assignment_brings_the_older_order_with_it(app, login):
+    client = app.test_client()
+    with app.app_context():
+        order = PurchaseOrder.query.filter_by(order_number='PO-2025-002').first()
+        order_id, quote_ids = order.id, sorted(quote.id for quote in order.quotes)
+        staff_id = User.query.filter_by(email='staff2@example.com').first().id
+        db.session.add(Document(order_id=order_id, file_url='/files/spec.pdf', file_type='pdf', uploaded_by=order.manager_id))
+        db.session.commit()
+        # Nothing about the order itself changes again, long before the staff member's last sync
+        for model, column in ((PurchaseOrder, PurchaseOrder.id), (Quote, Quote.order_id), (Document, Document.order_id)):
+            model.query.filter(column == order_id).update(
+                {model.updated_at: db.func.datetime('now', '-1 day')}, synchronize_session=False
+            )
+        db.session.commit()
+        document_ids = [document.id for document in Document.query.filter_by(order_id=order_id)]
+
+    staff = login(client, 'staff2@example.com')
+    since = _sync(client, staff)['next_token']
+
+    with app.app_context():
+        db.session.add(OrderAssignment(order_id=order_id, staff_id=staff_id))
+        db.session.commit()
+
+    # Rows inside the overlap window may come along again, so only check what must be there
+    page = _sync(client, staff, since)
+    assert order_id in [assignment['order_id'] for assignment in page['assignments']]
+    assert order_id in [order['id'] for order in page['orders']]
+    assert set(quote_ids) <= {quote['id'] for quote in page['quotes']}
+    assert set(document_ids) <= {document['id'] for document in page['documents']}